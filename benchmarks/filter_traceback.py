@@ -0,0 +1,74 @@
+"""Measure the time spent filtering traceback entries.
+
+Usage: python benchmarks/filter_traceback.py [--tracebacks 10000]
+
+The corpus is made of 50-frame tracebacks mixing test files, pytest and pluggy
+internals and generated code, similar to the tracebacks of failing fixtures.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+from _pytest._code.code import _PLUGGY_DIR, _PYTEST_DIR
+
+from pytest_broadcaster._internal._utils import filter_traceback
+
+PROJECT_DIR = Path("/home/user/project")
+
+
+def make_corpus() -> list[str]:
+    """Create a 50-frame traceback."""
+    frames = [
+        (_PLUGGY_DIR / "_callers.py").as_posix(),
+        (_PLUGGY_DIR / "_hooks.py").as_posix(),
+        (_PYTEST_DIR / "runner.py").as_posix(),
+        (_PYTEST_DIR / "python.py").as_posix(),
+        (_PYTEST_DIR / "fixtures.py").as_posix(),
+    ] * 6
+    frames += [
+        (PROJECT_DIR / "tests" / "conftest.py").as_posix(),
+        (PROJECT_DIR / "src" / "package" / "client.py").as_posix(),
+        (PROJECT_DIR / "src" / "package" / "models.py").as_posix(),
+        "<string>",
+    ] * 5
+    return frames
+
+
+def filter_traceback_without_cache(raw_filename: str) -> bool:
+    """Filter traceback entries using Path.parents, without caching."""
+    if "<" in raw_filename and ">" in raw_filename:
+        return False
+    parents = Path(raw_filename).parents
+    if _PLUGGY_DIR in parents:
+        return False
+    return _PYTEST_DIR not in parents
+
+
+def main() -> None:
+    """Run the benchmark and print results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tracebacks", type=int, default=10_000)
+    args = parser.parse_args()
+    corpus = make_corpus()
+    assert [filter_traceback(f) for f in corpus] == [  # noqa: S101
+        filter_traceback_without_cache(f) for f in corpus
+    ]
+    frames = len(corpus) * args.tracebacks
+    print(f"frames: {frames}")
+    for name, function in (
+        ("path parents", filter_traceback_without_cache),
+        ("cached prefixes", filter_traceback),
+    ):
+        start = time.perf_counter()
+        for _ in range(args.tracebacks):
+            for filename in corpus:
+                function(filename)
+        elapsed = time.perf_counter() - start
+        print(f"{name}: {elapsed / frames * 1e9:.0f} ns per frame")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Measure the memory used by a session result holding many test reports.
+
+Usage: python benchmarks/models_memory.py [--tests 100000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+
+from pytest_broadcaster.models.outcome import Outcome
+from pytest_broadcaster.models.python_distribution import (
+    Platform,
+    PythonDistribution,
+    Releaselevel,
+    Version,
+)
+from pytest_broadcaster.models.session_result import SessionResult
+from pytest_broadcaster.models.test_case_call import TestCaseCall
+from pytest_broadcaster.models.test_case_end import TestCaseEnd
+from pytest_broadcaster.models.test_case_report import TestCaseReport
+from pytest_broadcaster.models.test_case_setup import TestCaseSetup
+from pytest_broadcaster.models.test_case_teardown import TestCaseTeardown
+
+SESSION_ID = "5e6b5d9e-2f8c-4a8e-9a43-3f6c0b3f8f1e"
+TIMESTAMP = "2024-01-01T00:00:00.000000+00:00"
+
+
+def make_test_report(index: int) -> TestCaseReport:
+    """Create a test report similar to the ones created by the default reporter."""
+    node_id = f"tests/test_module_{index // 100}.py::test_case[{index}]"
+    step = {
+        "session_id": SESSION_ID,
+        "node_id": node_id,
+        "start_timestamp": TIMESTAMP,
+        "stop_timestamp": TIMESTAMP,
+        "duration": 0.001,
+        "outcome": Outcome.passed,
+    }
+    return TestCaseReport(
+        node_id=node_id,
+        outcome=Outcome.passed,
+        duration=0.003,
+        setup=TestCaseSetup(**step),  # type: ignore[arg-type]
+        call=TestCaseCall(**step),  # type: ignore[arg-type]
+        teardown=TestCaseTeardown(**step),  # type: ignore[arg-type]
+        finished=TestCaseEnd(
+            session_id=SESSION_ID,
+            node_id=node_id,
+            start_timestamp=TIMESTAMP,
+            stop_timestamp=TIMESTAMP,
+            total_duration=0.003,
+            outcome=Outcome.passed,
+        ),
+    )
+
+
+def make_session_result(tests: int) -> SessionResult:
+    """Create a session result holding the given number of test reports."""
+    return SessionResult(
+        session_id=SESSION_ID,
+        start_timestamp=TIMESTAMP,
+        stop_timestamp=TIMESTAMP,
+        python=PythonDistribution(
+            version=Version(3, 12, 0, Releaselevel.final),
+            processor="x86_64",
+            platform=Platform.linux,
+            packages=[],
+        ),
+        pytest_version="8.0.0",
+        plugin_version="0.0.0",
+        exit_status=0,
+        errors=[],
+        warnings=[],
+        collect_reports=[],
+        test_reports=[make_test_report(index) for index in range(tests)],
+    )
+
+
+def main() -> None:
+    """Run the benchmark and print results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tests", type=int, default=100_000)
+    args = parser.parse_args()
+    tracemalloc.start()
+    result = make_session_result(args.tests)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    start = time.perf_counter()
+    for report in result.test_reports:
+        _ = report.finished.outcome, report.setup.duration, report.node_id
+    elapsed = time.perf_counter() - start
+    print(f"tests: {args.tests}")
+    print(f"memory: {current / 1024 / 1024:.1f} MiB")
+    print(f"memory per test: {current / args.tests:.0f} B")
+    print(f"attribute access: {elapsed / args.tests * 1e9:.0f} ns per test")
+
+
+if __name__ == "__main__":
+    main()
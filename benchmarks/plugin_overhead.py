@@ -0,0 +1,397 @@
+"""Measure the overhead of the plugin on synthetic test suites.
+
+Usage:
+
+    python benchmarks/plugin_overhead.py run [--scenario flat-1k]
+        [--destination json-lines] [--repeat 3] [--output results.json]
+    python benchmarks/plugin_overhead.py compare baseline.json results.json
+        [--threshold 0.1]
+
+Each scenario generates a synthetic test suite in a temporary directory, which is
+then collected and run once per destination in a fresh pytest process. For each
+run, the following metrics are recorded:
+
+- `collect_seconds`: wall time of `pytest --collect-only`.
+- `run_seconds`: wall time of `pytest`.
+- `overhead_us_per_test`: extra time per test compared to a run with the plugin
+  disabled.
+- `peak_rss_mib`: peak resident set size of the pytest process.
+- `output_bytes`: number of bytes written or sent by the destination.
+
+The `compare` command exits with status 1 when a metric regressed by more than
+the threshold.
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.server
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import textwrap
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+
+import pytest
+
+from _testing.websocket_server import EmbeddedWebSocketServer, WebSocketSpy
+from pytest_broadcaster import __version__
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+MARKERS = [f"marker_{index}" for index in range(20)]
+
+METRICS = {
+    # metric: minimum absolute increase reported as a regression
+    "collect_seconds": 0.05,
+    "run_seconds": 0.05,
+    "overhead_us_per_test": 5.0,
+    "peak_rss_mib": 2.0,
+    "output_bytes": 0,
+}
+
+
+def flat_suite(modules: int, tests: int) -> Callable[[Path], int]:
+    """Create modules holding test functions."""
+
+    def generate(directory: Path) -> int:
+        body = "".join(f"def test_{index}():\n    pass\n\n\n" for index in range(tests))
+        for module in range(modules):
+            directory.joinpath(f"test_flat_{module}.py").write_text(body)
+        return modules * tests
+
+    return generate
+
+
+def nested_suite(directory: Path, modules: int = 100, depth: int = 10) -> int:
+    """Create modules holding deeply nested test classes."""
+    lines: list[str] = []
+    for level in range(depth):
+        indent = "    " * level
+        lines.append(f"{indent}class TestLevel{level}:")
+        lines.extend(
+            f"{indent}    def test_{index}(self):\n{indent}        pass\n"
+            for index in range(10)
+        )
+    body = "\n".join(lines) + "\n"
+    for module in range(modules):
+        directory.joinpath(f"test_nested_{module}.py").write_text(body)
+    return modules * depth * 10
+
+
+def parametrized_suite(directory: Path, modules: int = 10) -> int:
+    """Create modules holding a single test with stacked parametrizations."""
+    body = textwrap.dedent(
+        """\
+        import pytest
+
+        @pytest.mark.parametrize("x", range(10))
+        @pytest.mark.parametrize("y", list("abcdefghij"))
+        @pytest.mark.parametrize("z", [None, 1.5, (1, 2), {"k": "v"}, b"x"] * 2)
+        def test_parametrized(x, y, z):
+            pass
+        """
+    )
+    for module in range(modules):
+        directory.joinpath(f"test_parametrized_{module}.py").write_text(body)
+    return modules * 1000
+
+
+def markers_suite(directory: Path, modules: int = 10, tests: int = 100) -> int:
+    """Create modules holding tests with many markers."""
+    decorators = "".join(f"@pytest.mark.{marker}\n" for marker in MARKERS)
+    body = "import pytest\n\n\n" + "".join(
+        f"{decorators}def test_{index}():\n    pass\n\n\n" for index in range(tests)
+    )
+    for module in range(modules):
+        directory.joinpath(f"test_markers_{module}.py").write_text(body)
+    return modules * tests
+
+
+def failures_suite(directory: Path, modules: int = 10, tests: int = 100) -> int:
+    """Create modules holding failing tests."""
+    body = "".join(
+        f"def test_{index}():\n"
+        f"    expected = {{'index': {index}, 'values': list(range(20))}}\n"
+        f"    assert expected == {{'index': -1, 'values': []}}\n\n\n"
+        for index in range(tests)
+    )
+    for module in range(modules):
+        directory.joinpath(f"test_failures_{module}.py").write_text(body)
+    return modules * tests
+
+
+def warnings_suite(directory: Path, modules: int = 10, tests: int = 100) -> int:
+    """Create modules holding tests emitting warnings."""
+    body = "import warnings\n\n\n" + "".join(
+        f"def test_{index}():\n"
+        f"    warnings.warn('deprecated call {index}', DeprecationWarning)\n\n\n"
+        for index in range(tests)
+    )
+    for module in range(modules):
+        directory.joinpath(f"test_warnings_{module}.py").write_text(body)
+    return modules * tests
+
+
+SCENARIOS: dict[str, Callable[[Path], int]] = {
+    "flat-1k": flat_suite(10, 100),
+    "flat-10k": flat_suite(100, 100),
+    "flat-100k": flat_suite(1000, 100),
+    "nested-classes": nested_suite,
+    "parametrized": parametrized_suite,
+    "markers": markers_suite,
+    "failures": failures_suite,
+    "warnings": warnings_suite,
+}
+
+
+class _HTTPSink(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    received_bytes = 0
+
+
+class _HTTPSinkHandler(http.server.BaseHTTPRequestHandler):
+    server: _HTTPSink
+
+    def do_POST(self) -> None:  # noqa: N802
+        size = int(self.headers.get("Content-Length", 0))
+        self.server.received_bytes += len(self.rfile.read(size))
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+class _UnixSink:
+    """Count the bytes written to a unix socket."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.received_bytes = 0
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.bind(path.as_posix())
+        self.socket.listen(1)
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self) -> None:
+        connection, _ = self.socket.accept()
+        with connection:
+            while chunk := connection.recv(1024 * 1024):
+                self.received_bytes += len(chunk)
+
+    def close(self) -> int:
+        self.thread.join(timeout=60)
+        self.socket.close()
+        return self.received_bytes
+
+
+@contextmanager
+def http_sink(*, stream: bool) -> Iterator[tuple[list[str], Callable[[], int]]]:
+    """Receive session result or session events over HTTP."""
+    server = _HTTPSink(("127.0.0.1", 0), _HTTPSinkHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    option = "--collect-log-url" if stream else "--collect-url"
+    try:
+        yield [option, f"http://{host!s}:{port}/webhook"], lambda: server.received_bytes
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@contextmanager
+def websocket_sink() -> Iterator[tuple[list[str], Callable[[], int]]]:
+    """Receive session events over a websocket."""
+    spy = WebSocketSpy()
+    with EmbeddedWebSocketServer(spy) as server:
+        yield (
+            ["--collect-ws-url", server.url],
+            lambda: sum(len(message) for message in spy.received),
+        )
+
+
+@contextmanager
+def unix_sink() -> Iterator[tuple[list[str], Callable[[], int]]]:
+    """Receive session events over a unix socket."""
+    # Unix socket paths are limited to around 100 characters
+    with tempfile.TemporaryDirectory() as directory:
+        sink = _UnixSink(Path(directory).joinpath("events.sock"))
+        yield ["--collect-log-socket", sink.path.as_posix()], sink.close
+
+
+@contextmanager
+def file_sink(option: str) -> Iterator[tuple[list[str], Callable[[], int]]]:
+    """Write session result or session events to a temporary file."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory).joinpath("output")
+        yield [option, path.as_posix()], lambda: path.stat().st_size
+
+
+@contextmanager
+def no_sink(*options: str) -> Iterator[tuple[list[str], Callable[[], int]]]:
+    """Run pytest without any destination."""
+    yield list(options), lambda: 0
+
+
+DESTINATIONS: dict[str, Callable[[], Any]] = {
+    "disabled": lambda: no_sink("-p", "no:pytest_broadcaster"),
+    "none": no_sink,
+    "json-file": lambda: file_sink("--collect-report"),
+    "json-lines": lambda: file_sink("--collect-log"),
+    "http-webhook": lambda: http_sink(stream=False),
+    "http-webhook-stream": lambda: http_sink(stream=True),
+    "websocket": websocket_sink,
+    "unix-socket": unix_sink,
+}
+
+
+def run_pytest(directory: Path, *args: str) -> tuple[float, float]:
+    """Run pytest in a fresh process and return its wall time and peak RSS in MiB."""
+    command = [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", *args]
+    start = time.perf_counter()
+    process = subprocess.Popen(  # noqa: S603
+        command,
+        cwd=directory,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+    # ru_maxrss is expressed in bytes on macOS and in kilobytes elsewhere
+    scale = 1 if sys.platform == "darwin" else 1024
+    return elapsed, usage.ru_maxrss * scale / 1024 / 1024
+
+
+def measure(directory: Path, destination: str, repeat: int) -> dict[str, float]:
+    """Measure a destination on a generated test suite, keeping the best of runs."""
+    metrics: dict[str, float] = {}
+    for _ in range(repeat):
+        with DESTINATIONS[destination]() as (options, output_size):
+            collect_seconds, _ = run_pytest(directory, "--collect-only", *options)
+        with DESTINATIONS[destination]() as (options, output_size):
+            run_seconds, peak_rss_mib = run_pytest(directory, *options)
+            output_bytes = output_size()
+        for name, value in (
+            ("collect_seconds", collect_seconds),
+            ("run_seconds", run_seconds),
+            ("peak_rss_mib", peak_rss_mib),
+            ("output_bytes", output_bytes),
+        ):
+            metrics[name] = min(metrics.get(name, value), value)
+    return metrics
+
+
+def run(args: argparse.Namespace) -> None:
+    """Run the selected scenarios and write the results."""
+    results: list[dict[str, Any]] = []
+    for scenario in args.scenario or list(SCENARIOS):
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            root.joinpath("pytest.ini").write_text(
+                "[pytest]\nmarkers =\n"
+                + "".join(f"    {marker}\n" for marker in MARKERS)
+            )
+            tests = SCENARIOS[scenario](root)
+            disabled = measure(root, "disabled", args.repeat)
+            for destination in args.destination or list(DESTINATIONS):
+                metrics = (
+                    disabled
+                    if destination == "disabled"
+                    else measure(root, destination, args.repeat)
+                )
+                overhead = (metrics["run_seconds"] - disabled["run_seconds"]) / tests
+                result = {
+                    "scenario": scenario,
+                    "destination": destination,
+                    "tests": tests,
+                    "collect_seconds": round(metrics["collect_seconds"], 4),
+                    "run_seconds": round(metrics["run_seconds"], 4),
+                    "overhead_us_per_test": round(overhead * 1e6, 2),
+                    "peak_rss_mib": round(metrics["peak_rss_mib"], 1),
+                    "output_bytes": int(metrics["output_bytes"]),
+                }
+                print(
+                    f"{scenario:<16} {destination:<20} "
+                    + " ".join(f"{name}={result[name]}" for name in METRICS)
+                )
+                results.append(result)
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "pytest": pytest.__version__,
+        "plugin": __version__,
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+
+
+def compare(args: argparse.Namespace) -> int:
+    """Compare results against a baseline and return 1 if a metric regressed."""
+    baseline = json.loads(Path(args.baseline).read_text())
+    current = json.loads(Path(args.current).read_text())
+    previous = {
+        (result["scenario"], result["destination"]): result
+        for result in baseline["results"]
+    }
+    regressions = 0
+    for result in current["results"]:
+        key = (result["scenario"], result["destination"])
+        if key not in previous:
+            continue
+        for name, min_delta in METRICS.items():
+            before, after = previous[key][name], result[name]
+            delta = after - before
+            regressed = delta > min_delta and delta > abs(before) * args.threshold
+            regressions += regressed
+            change = f"{delta / before:+.1%}" if before else "n/a"
+            print(
+                f"{'REGRESSION' if regressed else 'ok':<10} {key[0]:<16} {key[1]:<20} "
+                f"{name:<20} {before:>12} -> {after:>12} ({change})"
+            )
+    print(f"{regressions} regression(s) found")
+    return 1 if regressions else 0
+
+
+def main() -> None:
+    """Parse command line arguments and run the requested command."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="Run benchmarks.")
+    run_parser.add_argument(
+        "--scenario", action="append", choices=list(SCENARIOS), default=None
+    )
+    run_parser.add_argument(
+        "--destination", action="append", choices=list(DESTINATIONS), default=None
+    )
+    run_parser.add_argument("--repeat", type=int, default=1)
+    run_parser.add_argument("--output", default=None)
+    compare_parser = commands.add_parser("compare", help="Compare with a baseline.")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args)
+    else:
+        sys.exit(compare(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Measure the cost of loading the plugin when pytest starts.
+
+Usage:
+
+    python benchmarks/plugin_startup.py [--repeat 10] [--output results.json]
+
+Each measure is taken in a fresh Python process, keeping the best of runs:
+
+- `import_seconds`: time spent importing the module registered as pytest entry
+  point, once pytest is imported.
+- `imported_modules`: number of modules imported by the entry point.
+- `version_seconds`: wall time of `pytest --version`, with and without the plugin.
+- `run_seconds`: wall time of a session running a single test, without the plugin,
+  with the plugin but no destination, and with a JSON Lines destination.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+from pytest_broadcaster import __version__
+
+IMPORT_SCRIPT = """\
+import sys
+import time
+
+import pytest
+
+before = set(sys.modules)
+start = time.perf_counter()
+import pytest_broadcaster.plugin
+elapsed = time.perf_counter() - start
+print(elapsed, len(set(sys.modules) - before))
+"""
+
+RUNS: dict[str, list[str]] = {
+    "disabled": ["-p", "no:pytest_broadcaster"],
+    "none": [],
+    "json-lines": ["--collect-log", "events.jsonl"],
+}
+
+
+def measure_import(repeat: int) -> tuple[float, int]:
+    """Return the best time spent importing the plugin, and the imported modules."""
+    best = float("inf")
+    modules = 0
+    for _ in range(repeat):
+        output = subprocess.run(  # noqa: S603
+            [sys.executable, "-c", IMPORT_SCRIPT],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.split()
+        best = min(best, float(output[0]))
+        modules = int(output[1])
+    return best, modules
+
+
+def measure_pytest(directory: Path, repeat: int, *args: str) -> float:
+    """Return the best wall time of a fresh pytest process."""
+    command = [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", *args]
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(  # noqa: S603
+            command,
+            cwd=directory,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        )
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(args: argparse.Namespace) -> None:
+    """Run all measures and write the results."""
+    import_seconds, imported_modules = measure_import(args.repeat)
+    results: dict[str, float] = {
+        "import_seconds": round(import_seconds, 4),
+        "imported_modules": imported_modules,
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        root.joinpath("test_trivial.py").write_text("def test_ok():\n    pass\n")
+        for name, options in RUNS.items():
+            if name != "json-lines":
+                version = measure_pytest(root, args.repeat, "--version", *options)
+                results[f"version_seconds[{name}]"] = round(version, 4)
+            elapsed = measure_pytest(root, args.repeat, *options)
+            results[f"run_seconds[{name}]"] = round(elapsed, 4)
+    for name, value in results.items():
+        print(f"{name:<28} {value}")
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "pytest": pytest.__version__,
+        "plugin": __version__,
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+
+
+def main() -> None:
+    """Parse command line arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--output", default=None)
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
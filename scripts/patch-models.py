@@ -0,0 +1,28 @@
+"""Make models generated by datamodel-codegen use slotted dataclasses.
+
+Usage: python scripts/patch-models.py <models-directory>
+
+`datamodel-codegen` cannot generate slotted dataclasses, so the `dataclass`
+decorator imported by generated modules is replaced with the one defined in
+`pytest_broadcaster._internal._slots`.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+STDLIB_IMPORT = "from dataclasses import dataclass\n"
+SLOTS_IMPORT = "from pytest_broadcaster._internal._slots import dataclass\n"
+
+
+def patch_models(directory: Path) -> None:
+    """Patch all generated modules found in directory."""
+    for module in sorted(directory.glob("*.py")):
+        source = module.read_text()
+        if STDLIB_IMPORT in source:
+            module.write_text(source.replace(STDLIB_IMPORT, SLOTS_IMPORT))
+
+
+if __name__ == "__main__":
+    patch_models(Path(sys.argv[1]))
@@ -15,6 +15,7 @@ class SpyRequest:
         self._method = request.method
         self._path = request.path
         self._query = request.query_string.decode()
+        self._content_type = request.content_type
         self._bytes = request.get_data()
 
     def method(self) -> str:
@@ -26,6 +27,12 @@ class SpyRequest:
     def query_string(self) -> str:
         return self._query
 
+    def content_type(self) -> str | None:
+        return self._content_type
+
+    def data(self) -> bytes:
+        return self._bytes
+
     def json(self) -> dict[str, Any]:
         return json.loads(self._bytes.decode())
 
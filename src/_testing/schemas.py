@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from typing import Any
+
+from pytest_broadcaster._internal._schemas import get_schema_validator
+
+
+def assert_valid_event(event: dict[str, Any]) -> None:
+    """Fail if an event does not match the JSON schemas."""
+    try:
+        get_schema_validator().validate_event(event)
+    except ValueError as e:
+        msg = f"Invalid {event.get('event')} event: {e}"
+        raise AssertionError(msg) from None
+
+
+def assert_valid_result(result: dict[str, Any]) -> None:
+    """Fail if a session result does not match the JSON schemas."""
+    try:
+        get_schema_validator().validate_result(result)
+    except ValueError as e:
+        msg = f"Invalid session result: {e}"
+        raise AssertionError(msg) from None
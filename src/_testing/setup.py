@@ -6,6 +6,8 @@ from typing import TYPE_CHECKING, Any
 
 import pytest
 
+from .schemas import assert_valid_event, assert_valid_result
+
 if TYPE_CHECKING:
     from pathlib import Path
 
@@ -22,14 +24,19 @@ class CommonTestSetup:
         self.json_lines_file = self.tmp_path.joinpath("collect.jsonl")
 
     def read_json_file(self) -> dict[str, Any]:
-        return json.loads(self.json_file.read_text())
+        result = json.loads(self.json_file.read_text())
+        assert_valid_result(result)
+        return result
 
     def read_json_lines_file(self) -> list[dict[str, Any]]:
-        return [
+        events = [
             json.loads(line.strip())
             for line in self.json_lines_file.read_text().splitlines()
             if line.strip()
         ]
+        for event in events:
+            assert_valid_event(event)
+        return events
 
     def make_testfile(self, filename: str, content: str) -> Path:
         if filename.endswith(".py"):
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import struct
+import threading
+import time
+from typing import TYPE_CHECKING, Any, BinaryIO
+
+from typing_extensions import Self
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def read_frames(stream: BinaryIO) -> list[dict[str, Any]]:
+    """Read length-prefixed JSON frames until end of stream."""
+    messages: list[dict[str, Any]] = []
+    while header := stream.read(4):
+        (size,) = struct.unpack("!I", header)
+        messages.append(json.loads(stream.read(size).decode()))
+    return messages
+
+
+class EmbeddedUnixStreamReader:
+    """Read length-prefixed frames from a unix socket or a named pipe in a thread."""
+
+    def __init__(self, path: Path, *, fifo: bool = False) -> None:
+        self.path = path
+        self.fifo = fifo
+        self.messages: list[dict[str, Any]] = []
+        self._socket: socket.socket | None = None
+        self._ready = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self) -> Self:
+        if self.fifo:
+            os.mkfifo(self.path)
+        else:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.bind(self.path.as_posix())
+            self._socket.listen(1)
+        self.thread.start()
+        self._ready.wait(timeout=5)
+        return self
+
+    def __exit__(self, *args: object, **kwargs: object) -> None:
+        self.thread.join(timeout=10)
+        if self._socket is not None:
+            self._socket.close()
+
+    def _run(self) -> None:
+        if self.fifo:
+            # Opening a FIFO for reading in non-blocking mode does not wait for
+            # a writer, so that writer can open the FIFO without failing.
+            fd = os.open(self.path, os.O_RDONLY | os.O_NONBLOCK)
+            self._ready.set()
+            os.set_blocking(fd, True)
+            with os.fdopen(fd, "rb") as stream:
+                self.messages = self._read_fifo(stream)
+            return
+        assert self._socket
+        self._ready.set()
+        connection, _ = self._socket.accept()
+        with connection, connection.makefile("rb") as stream:
+            self.messages = read_frames(stream)
+
+    def _read_fifo(self, stream: BinaryIO) -> list[dict[str, Any]]:
+        # Reading a FIFO returns EOF while no writer opened it yet, so keep reading
+        # until at least one frame was received.
+        messages: list[dict[str, Any]] = []
+        while not messages:
+            messages.extend(read_frames(stream))
+            time.sleep(0.01)
+        return messages
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import json
+import socketserver
+import struct
+import threading
+import zlib
+from dataclasses import dataclass, field
+from typing import Any
+
+from typing_extensions import Self
+
+from pytest_broadcaster._internal._websocket import (
+    RESUME_HEADER,
+    STREAM_HEADER,
+    make_accept_key,
+    mask_payload,
+)
+
+_OPCODE_CLOSE = 0x8
+_SIZE_16_BITS = 126
+_SIZE_64_BITS = 127
+
+
+@dataclass
+class WebSocketSpy:
+    received: list[bytes] = field(default_factory=list)
+    connections: int = 0
+    compressed_frames: int = 0
+    drop_after: int | None = None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def messages(self) -> list[dict[str, Any]]:
+        return [json.loads(message.decode()) for message in self.received]
+
+
+class EmbeddedWebSocketServer:
+    """A minimal websocket server which records text frames sent by clients.
+
+    The server acknowledges the resume semantics used by the websocket destination:
+    it replies to each opening handshake with the number of frames received so far.
+    """
+
+    def __init__(
+        self,
+        spy: WebSocketSpy,
+        host: str = "127.0.0.1",
+        *,
+        permessage_deflate: bool = False,
+    ) -> None:
+        self.spy = spy
+        self.server = _WebSocketServer((host, 0), _WebSocketHandler)
+        self.server.spy = spy
+        self.server.permessage_deflate = permessage_deflate
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"ws://{host!s}:{port}/events"
+
+    def __enter__(self) -> Self:
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args: object, **kwargs: object) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class _WebSocketServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    spy: WebSocketSpy
+    permessage_deflate: bool
+
+
+class _WebSocketHandler(socketserver.StreamRequestHandler):
+    server: _WebSocketServer
+
+    def handle(self) -> None:
+        spy = self.server.spy
+        headers = self.read_headers()
+        assert headers.get(STREAM_HEADER.lower())
+        extensions = ""
+        if self.server.permessage_deflate and "permessage-deflate" in headers.get(
+            "sec-websocket-extensions", ""
+        ):
+            extensions = "Sec-WebSocket-Extensions: permessage-deflate\r\n"
+        with spy.lock:
+            spy.connections += 1
+            resume_from = len(spy.received)
+        accept_key = make_accept_key(headers["sec-websocket-key"])
+        self.wfile.write(
+            (
+                "HTTP/1.1 101 Switching Protocols\r\n"
+                "Upgrade: websocket\r\n"
+                "Connection: Upgrade\r\n"
+                f"Sec-WebSocket-Accept: {accept_key}\r\n"
+                f"{RESUME_HEADER}: {resume_from}\r\n"
+                f"{extensions}\r\n"
+            ).encode()
+        )
+        decompressor = zlib.decompressobj(wbits=-zlib.MAX_WBITS)
+        while True:
+            first_byte, payload = self.read_frame()
+            if first_byte & 0x0F == _OPCODE_CLOSE:
+                self.wfile.write(struct.pack("!BB", 0x80 | _OPCODE_CLOSE, 0))
+                return
+            if first_byte & 0x40:
+                payload = decompressor.decompress(payload + b"\x00\x00\xff\xff")
+                spy.compressed_frames += 1
+            with spy.lock:
+                spy.received.append(payload)
+                if spy.drop_after == len(spy.received):
+                    # Simulate a connection loss
+                    spy.drop_after = None
+                    return
+
+    def read_headers(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        self.rfile.readline()
+        while line := self.rfile.readline().decode().strip():
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        return headers
+
+    def read_frame(self) -> tuple[int, bytes]:
+        first_byte, second_byte = self.rfile.read(2)
+        size = second_byte & 0x7F
+        if size == _SIZE_16_BITS:
+            size = struct.unpack("!H", self.rfile.read(2))[0]
+        elif size == _SIZE_64_BITS:
+            size = struct.unpack("!Q", self.rfile.read(8))[0]
+        mask = self.rfile.read(4)
+        return first_byte, mask_payload(self.rfile.read(size), mask)
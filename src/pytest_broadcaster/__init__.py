@@ -1,18 +1,113 @@
-"""pytest_broadcaster package."""
+"""pytest_broadcaster package.
+
+Classes are imported on first access, so that loading the pytest plugin does not
+import destinations, models and the reporter when they are not used.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
 
 from .__about__ import __version__, __version_tuple__
-from ._internal._json_files import JSONFile, JSONLinesFile
-from ._internal._reporter import DefaultReporter
-from ._internal._webhook import HTTPWebhook
-from .interfaces import Destination, Reporter
+
+if TYPE_CHECKING:
+    from ._internal._codecs import (
+        CompactCodec,
+        DictionaryCodec,
+        EncodedPayload,
+        JSONCodec,
+        MsgPackCodec,
+        get_codec,
+        read_events,
+    )
+    from ._internal._fast_reporter import FastReporter, WireEvent
+    from ._internal._filters import EventFilter, FilteredDestination
+    from ._internal._json_files import JSONFile, JSONLinesFile
+    from ._internal._otlp_traces import OTLPTraces
+    from ._internal._parallel import ThreadedDestination
+    from ._internal._prometheus import PrometheusMetrics
+    from ._internal._reporter import DefaultReporter
+    from ._internal._rotating_files import RotatingJSONLinesFile
+    from ._internal._schemas import SchemaChecker, SchemaValidator
+    from ._internal._unix_stream import UnixStream
+    from ._internal._webhook import HTTPWebhook
+    from ._internal._websocket import WebSocketStream
+    from .interfaces import CoalescingReporter, Codec, Destination, Reporter
 
 __all__ = [
+    "CoalescingReporter",
+    "Codec",
+    "CompactCodec",
     "DefaultReporter",
     "Destination",
+    "DictionaryCodec",
+    "EncodedPayload",
+    "EventFilter",
+    "FastReporter",
+    "FilteredDestination",
     "HTTPWebhook",
+    "JSONCodec",
     "JSONFile",
     "JSONLinesFile",
+    "MsgPackCodec",
+    "OTLPTraces",
+    "PrometheusMetrics",
     "Reporter",
+    "RotatingJSONLinesFile",
+    "SchemaChecker",
+    "SchemaValidator",
+    "ThreadedDestination",
+    "UnixStream",
+    "WebSocketStream",
+    "WireEvent",
     "__version__",
     "__version_tuple__",
+    "get_codec",
+    "read_events",
 ]
+
+_MODULES = {
+    "CoalescingReporter": ".interfaces",
+    "Codec": ".interfaces",
+    "CompactCodec": "._internal._codecs",
+    "DefaultReporter": "._internal._reporter",
+    "Destination": ".interfaces",
+    "DictionaryCodec": "._internal._codecs",
+    "EncodedPayload": "._internal._codecs",
+    "EventFilter": "._internal._filters",
+    "FastReporter": "._internal._fast_reporter",
+    "FilteredDestination": "._internal._filters",
+    "HTTPWebhook": "._internal._webhook",
+    "JSONCodec": "._internal._codecs",
+    "JSONFile": "._internal._json_files",
+    "JSONLinesFile": "._internal._json_files",
+    "MsgPackCodec": "._internal._codecs",
+    "OTLPTraces": "._internal._otlp_traces",
+    "PrometheusMetrics": "._internal._prometheus",
+    "Reporter": ".interfaces",
+    "RotatingJSONLinesFile": "._internal._rotating_files",
+    "SchemaChecker": "._internal._schemas",
+    "SchemaValidator": "._internal._schemas",
+    "ThreadedDestination": "._internal._parallel",
+    "UnixStream": "._internal._unix_stream",
+    "WebSocketStream": "._internal._websocket",
+    "WireEvent": "._internal._fast_reporter",
+    "get_codec": "._internal._codecs",
+    "read_events": "._internal._codecs",
+}
+"""Module defining each name exported by the package, imported on first access."""
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    module = _MODULES.get(name)
+    if module is None:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,346 @@
+from __future__ import annotations
+
+import io
+import json
+from dataclasses import asdict
+from enum import Enum
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO, Generic, TypeVar
+
+from pytest_broadcaster.interfaces import Codec
+
+from ._constants import FORMATS
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from types import ModuleType
+
+
+def default_serializer(obj: object) -> object:
+    if isinstance(obj, Enum):
+        return obj.value
+    msg = f"Object of type {type(obj).__name__} is not serializable"
+    raise TypeError(msg)
+
+
+def to_dict(obj: object) -> dict[str, Any]:
+    """Convert an event or a result into a dictionary."""
+    # Events built by the fast reporter are already dictionaries
+    if isinstance(obj, dict):
+        return obj
+    return asdict(obj)  # type: ignore[call-overload, no-any-return]
+
+
+T = TypeVar("T")
+
+
+class EncodedPayload(Generic[T]):
+    """An event or a result shared between destinations, encoded once per codec.
+
+    The value is converted into a dictionary on first access, and encoded once per
+    codec, no matter how many destinations write it. Payloads encoded by stateful
+    codecs are cached per codec instance instead of per codec name, since their
+    output depends on the payloads they encoded before.
+
+    The dictionary and the encoded payloads are shared, and must not be modified.
+    """
+
+    __slots__ = ("_data", "_encoded", "value")
+
+    def __init__(self, value: T) -> None:
+        self.value = value
+        self._data: dict[str, Any] | None = None
+        self._encoded: dict[object, bytes] = {}
+
+    @property
+    def data(self) -> dict[str, Any]:
+        """The value converted into a dictionary."""
+        if self._data is None:
+            self._data = to_dict(self.value)
+        return self._data
+
+    def encode(self, codec: Codec) -> bytes:
+        """Return the value encoded using a codec, encoding it on first call."""
+        key = codec.name if codec.stateless else codec
+        encoded = self._encoded.get(key)
+        if encoded is None:
+            encoded = self._encoded[key] = codec.encode(self.data)
+        return encoded
+
+    def encoded(self, codec: Codec) -> bytes | None:
+        """Return the value encoded using a codec, or None if it was never encoded."""
+        return self._encoded.get(codec.name if codec.stateless else codec)
+
+
+ENCODE_CHUNK_SIZE = 64 * 1024
+"""Minimum size of the chunks yielded when encoding incrementally."""
+
+
+class JSONCodec(Codec):
+    """Encode data as JSON text."""
+
+    name = "json"
+    content_type = "application/json"
+    binary = False
+    stateless = True
+
+    def encode(self, data: object) -> bytes:
+        return json.dumps(data, default=default_serializer).encode()
+
+    def iter_encode(self, data: object) -> Iterator[bytes]:
+        # Items of top-level arrays are encoded one at a time, so that the whole
+        # payload is never held in memory
+        if not isinstance(data, dict):
+            yield self.encode(data)
+            return
+        buffer = bytearray(b"{")
+        for index, (key, value) in enumerate(data.items()):
+            if index:
+                buffer += b", "
+            buffer += self.encode(key) + b": "
+            if not isinstance(value, list):
+                buffer += self.encode(value)
+                continue
+            buffer += b"["
+            for item_index, item in enumerate(value):
+                if item_index:
+                    buffer += b", "
+                buffer += self.encode(item)
+                if len(buffer) >= ENCODE_CHUNK_SIZE:
+                    yield bytes(buffer)
+                    buffer.clear()
+            buffer += b"]"
+        buffer += b"}"
+        yield bytes(buffer)
+
+    def decode(self, payload: bytes) -> Any:  # noqa: ANN401
+        return json.loads(payload)
+
+    def iter_decode(self, stream: BinaryIO) -> Iterator[Any]:
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+
+
+class MsgPackCodec(Codec):
+    """Encode data as MessagePack.
+
+    This codec requires the `msgpack` package to be installed.
+    """
+
+    name = "msgpack"
+    content_type = "application/msgpack"
+    binary = True
+    stateless = True
+
+    def __init__(self) -> None:
+        self._msgpack = _import_msgpack()
+        self._packer = self._msgpack.Packer(default=default_serializer)
+
+    def encode(self, data: object) -> bytes:
+        return self._packer.pack(data)  # type: ignore[no-any-return]
+
+    def decode(self, payload: bytes) -> Any:  # noqa: ANN401
+        return self._msgpack.unpackb(payload)
+
+    def iter_decode(self, stream: BinaryIO) -> Iterator[Any]:
+        yield from self._msgpack.Unpacker(stream)
+
+
+class CompactCodec(Codec):
+    """Encode data as JSON text where repeated object keys are interned.
+
+    Objects are encoded as arrays starting with the integer ID of their shape (the
+    tuple of their keys) followed by their values. The keys of a shape are sent once,
+    within the first payload where the shape appears. Lists are encoded as arrays
+    starting with `-1`. Each payload is a JSON array `[new_shapes, value]`.
+
+    The codec is stateful: payloads must be decoded in order, by a single decoder,
+    and a codec instance must not be shared between destinations.
+    """
+
+    name = "compact"
+    content_type = "application/vnd.pytest-broadcaster.compact+json"
+    binary = False
+
+    def __init__(self) -> None:
+        self._shapes: dict[tuple[str, ...], int] = {}
+        self._decoded_shapes: dict[int, list[str]] = {}
+
+    def encode(self, data: object) -> bytes:
+        new_shapes: dict[int, list[str]] = {}
+        value = self._pack(data, new_shapes)
+        return json.dumps(
+            [new_shapes, value], separators=(",", ":"), default=default_serializer
+        ).encode()
+
+    def decode(self, payload: bytes) -> Any:  # noqa: ANN401
+        new_shapes, value = json.loads(payload)
+        for shape_id, keys in new_shapes.items():
+            self._decoded_shapes[int(shape_id)] = keys
+        return self._unpack(value)
+
+    def iter_decode(self, stream: BinaryIO) -> Iterator[Any]:
+        for line in stream:
+            if line.strip():
+                yield self.decode(line)
+
+    def _pack(self, data: object, new_shapes: dict[int, list[str]]) -> object:
+        if isinstance(data, dict):
+            keys = tuple(data)
+            shape_id = self._shapes.get(keys)
+            if shape_id is None:
+                shape_id = self._shapes[keys] = len(self._shapes)
+                new_shapes[shape_id] = list(keys)
+            return [
+                shape_id,
+                *(self._pack(value, new_shapes) for value in data.values()),
+            ]
+        if isinstance(data, (list, tuple)):
+            return [-1, *(self._pack(value, new_shapes) for value in data)]
+        if isinstance(data, Enum):
+            return data.value
+        return data
+
+    def _unpack(self, value: object) -> object:
+        if not isinstance(value, list):
+            return value
+        tag, *items = value
+        if tag == -1:
+            return [self._unpack(item) for item in items]
+        keys = self._decoded_shapes[tag]
+        return {key: self._unpack(item) for key, item in zip(keys, items)}
+
+
+DICTIONARY_FIELDS = ("session_id", "node_id", "path")
+"""Fields whose values are dictionary encoded by default."""
+
+DEFINITIONS_EVENT = "definitions"
+"""Event type of the records holding new dictionary values."""
+
+
+class DictionaryCodec(Codec):
+    """Encode data using another codec, with repeated values dictionary encoded.
+
+    String values of dictionary encoded fields are assigned an integer ID on first
+    appearance, and are then replaced by their ID. New values are sent within a
+    `{"event": "definitions", "values": [...]}` record written before the payload
+    where they first appear. IDs are assigned in order starting from 0, so that
+    the stream can be decoded in a single pass.
+
+    The codec is stateful: payloads must be decoded in order, by a single decoder,
+    and a codec instance must not be shared between destinations.
+    """
+
+    def __init__(
+        self, inner: Codec | None = None, fields: Iterable[str] = DICTIONARY_FIELDS
+    ) -> None:
+        self.inner = inner or JSONCodec()
+        self.name = f"dict-{self.inner.name}"
+        self.content_type = f"application/vnd.pytest-broadcaster.dict+{self.inner.name}"
+        self.binary = self.inner.binary
+        self.fields = frozenset(fields)
+        self._delimiter = b"" if self.binary else b"\n"
+        self._ids: dict[str, int] = {}
+        self._values: list[str] = []
+
+    def encode(self, data: object) -> bytes:
+        new_values: list[str] = []
+        payload = self.inner.encode(self._pack(data, new_values))
+        if not new_values:
+            return payload
+        definitions = {"event": DEFINITIONS_EVENT, "values": new_values}
+        return self.inner.encode(definitions) + self._delimiter + payload
+
+    def decode(self, payload: bytes) -> Any:  # noqa: ANN401
+        value = None
+        for value in self.iter_decode(io.BytesIO(payload)):  # noqa: B007
+            pass
+        return value
+
+    def iter_decode(self, stream: BinaryIO) -> Iterator[Any]:
+        for data in self.inner.iter_decode(stream):
+            if isinstance(data, dict) and data.get("event") == DEFINITIONS_EVENT:
+                self._values.extend(data["values"])
+                continue
+            yield self._unpack(data)
+
+    def _pack(self, data: object, new_values: list[str]) -> object:
+        if isinstance(data, dict):
+            packed: dict[str, object] = {}
+            for key, value in data.items():
+                if key in self.fields and isinstance(value, str):
+                    value_id = self._ids.get(value)
+                    if value_id is None:
+                        value_id = self._ids[value] = len(self._ids)
+                        new_values.append(value)
+                    packed[key] = value_id
+                else:
+                    packed[key] = self._pack(value, new_values)
+            return packed
+        if isinstance(data, list):
+            return [self._pack(value, new_values) for value in data]
+        return data
+
+    def _unpack(self, data: object) -> object:
+        if isinstance(data, dict):
+            return {
+                key: self._values[value]
+                if key in self.fields and isinstance(value, int)
+                else self._unpack(value)
+                for key, value in data.items()
+            }
+        if isinstance(data, list):
+            return [self._unpack(value) for value in data]
+        return data
+
+
+CODECS: dict[str, type[Codec]] = {
+    JSONCodec.name: JSONCodec,
+    CompactCodec.name: CompactCodec,
+    MsgPackCodec.name: MsgPackCodec,
+}
+
+
+def get_codec(name: str) -> Codec:
+    """Create a new codec instance given its name.
+
+    Names prefixed with `dict-` create a dictionary codec wrapping the codec
+    named after the prefix.
+    """
+    if name.startswith("dict-"):
+        return DictionaryCodec(get_codec(name[5:]))
+    try:
+        codec_type = CODECS[name]
+    except KeyError:
+        msg = f"Unknown codec: {name} (expected one of {', '.join(FORMATS)})"
+        raise ValueError(msg) from None
+    return codec_type()
+
+
+def read_events(path: str | Path, codec: str | Codec = "json") -> Iterator[Any]:
+    """Iterate over the events written to a file by a JSON Lines destination."""
+    if isinstance(codec, str):
+        codec = get_codec(codec)
+    with Path(path).open("rb") as stream:
+        yield from codec.iter_decode(stream)
+
+
+def _import_msgpack() -> ModuleType:
+    try:
+        import msgpack
+    except ImportError as e:
+        msg = (
+            "msgpack package is required to use msgpack codec. "
+            "Install it using: pip install pytest-broadcaster[msgpack]"
+        )
+        raise RuntimeError(msg) from e
+    return msgpack  # type: ignore[no-any-return]
+
+
+if TYPE_CHECKING:
+    # Make sure the classes implement the Codec interface
+    JSONCodec()
+    CompactCodec()
+    MsgPackCodec()
+    DictionaryCodec()
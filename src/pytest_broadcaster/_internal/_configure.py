@@ -0,0 +1,362 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import TYPE_CHECKING
+
+import pytest
+
+from pytest_broadcaster.interfaces import CoalescingReporter
+from pytest_broadcaster.plugin import PytestBroadcasterPlugin
+
+from ._codecs import get_codec
+from ._fast_reporter import FastReporter
+from ._filters import EventFilter, FilteredDestination
+from ._json_files import JSONFile, JSONLinesFile
+from ._otlp import OTLPFileExporter
+from ._otlp_traces import OTLPTraces
+from ._parallel import ThreadedDestination
+from ._profiling import ProfiledDestination, ProfiledReporter, Profiler
+from ._prometheus import PrometheusMetrics
+from ._reporter import DefaultReporter
+from ._rotating_files import RotatingJSONLinesFile
+from ._schemas import SchemaChecker
+from ._telemetry import Instrumentation, InstrumentedDestination
+from ._unix_stream import UnixStream
+from ._webhook import HTTPWebhook
+from ._websocket import WebSocketStream
+
+if TYPE_CHECKING:
+    from pytest_broadcaster.interfaces import Codec, Destination, Reporter
+
+
+def make_plugin(  # noqa: C901
+    config: pytest.Config, user_destinations: list[Destination]
+) -> PytestBroadcasterPlugin:
+    """Create the plugin instance and its destinations from command line options.
+
+    Destinations added by the user are written after the destinations created from
+    command line options, and are never filtered.
+    """
+    # Create publishers
+    destinations: list[Destination] = []
+
+    report_format = config.option.collect_report_format
+    log_format = config.option.collect_log_format
+
+    if json_path := config.option.collect_report:
+        destinations.append(_make_json_file(config, json_path, report_format))
+
+    if json_lines_path := config.option.collect_log:
+        destinations.append(_make_json_lines_file(config, json_lines_path, log_format))
+
+    if json_url := config.option.collect_url:
+        destinations.append(
+            HTTPWebhook(
+                json_url,
+                emit_events=False,
+                emit_result=True,
+                codec=_make_codec(report_format),
+            )
+        )
+
+    if json_lines_url := config.option.collect_log_url:
+        destinations.append(
+            HTTPWebhook(
+                json_lines_url,
+                emit_events=True,
+                emit_result=False,
+                codec=_make_codec(log_format),
+            )
+        )
+
+    if ws_url := config.option.collect_ws_url:
+        destinations.append(
+            WebSocketStream(
+                ws_url,
+                permessage_deflate=config.option.collect_ws_deflate,
+                codec=_make_codec(log_format),
+            )
+        )
+
+    if socket_path := config.option.collect_log_socket:
+        destinations.append(
+            UnixStream(
+                socket_path,
+                buffer_size=config.option.collect_log_socket_buffer,
+                codec=_make_codec(log_format),
+            )
+        )
+
+    if otlp_endpoint := config.option.collect_otlp:
+        destinations.append(_make_otlp_traces(config, otlp_endpoint))
+
+    if metrics := _make_prometheus_metrics(config):
+        destinations.append(metrics)
+
+    # Only destinations created from command line options are filtered
+    event_filter = _make_event_filter(config)
+    filtered_destinations = len(destinations)
+
+    # Add the destinations of the user
+    destinations.extend(user_destinations)
+
+    # Encode the session result once when several destinations share its codec
+    _share_encoded_results(destinations)
+
+    # Check all events, including those written to user destinations
+    if config.option.broadcaster_validate:
+        destinations.append(SchemaChecker())
+
+    # Create the reporter
+    reporter_to_use = _make_user_reporter(config)
+
+    # Measure the time spent by the reporter and the destinations if requested.
+    # Nothing is wrapped otherwise, so that measuring costs nothing when disabled.
+    profiler = _make_profiler(config)
+    if profiler is not None:
+        reporter_to_use = ProfiledReporter(reporter_to_use, profiler)
+        destinations = _make_profiled_destinations(profiler, destinations)
+
+    # Filter events before they are encoded if requested
+    if event_filter:
+        destinations[:filtered_destinations] = [
+            destination
+            if _is_report_file(destination)
+            else FilteredDestination(destination, event_filter)
+            for destination in destinations[:filtered_destinations]
+        ]
+
+    # Write to destinations in parallel if requested
+    if config.option.collect_parallel:
+        destinations = _make_threaded_destinations(config, destinations)
+
+    # Let metrics report the events dropped by other destinations
+    _watch_dropped_events(destinations)
+
+    # Create plugin instance.
+    return PytestBroadcasterPlugin(
+        config=config,
+        reporter=reporter_to_use,
+        publishers=destinations,
+        profiler=profiler if config.option.broadcaster_profile else None,
+        coalesce=config.option.collect_log_coalesce,
+        instrumentation=profiler if isinstance(profiler, Instrumentation) else None,
+    )
+
+
+def _make_codec(name: str) -> Codec:
+    """Create a codec, reporting missing packages as usage errors."""
+    try:
+        return get_codec(name)
+    except (ValueError, RuntimeError) as e:
+        raise pytest.UsageError(str(e)) from e
+
+
+def _make_json_file(config: pytest.Config, path: str, report_format: str) -> JSONFile:
+    """Create a JSON report destination, checkpointed or spooled if requested."""
+    checkpoint = config.option.collect_report_checkpoint
+    if checkpoint is not None and report_format != "json":
+        msg = "--collect-report-checkpoint requires --collect-report-format=json"
+        raise pytest.UsageError(msg)
+    spool = config.option.collect_report_spool
+    if spool and report_format != "json":
+        msg = "--collect-report-spool requires --collect-report-format=json"
+        raise pytest.UsageError(msg)
+    return JSONFile(
+        path,
+        codec=_make_codec(report_format),
+        checkpoint_interval=checkpoint,
+        spool=spool,
+    )
+
+
+def _make_json_lines_file(
+    config: pytest.Config, path: str, log_format: str
+) -> Destination:
+    """Create a JSON Lines destination, rotated or not depending on options."""
+    max_bytes = config.option.collect_log_rotate_bytes
+    max_events = config.option.collect_log_rotate_events
+    compression = config.option.collect_log_compress
+    if max_bytes is None and max_events is None and compression is None:
+        return JSONLinesFile(path, codec=_make_codec(log_format))
+    try:
+        return RotatingJSONLinesFile(
+            path,
+            codec=_make_codec(log_format),
+            max_bytes=max_bytes,
+            max_events=max_events,
+            compression=compression,
+        )
+    except (ValueError, RuntimeError) as e:
+        raise pytest.UsageError(str(e)) from e
+
+
+def _share_encoded_results(destinations: list[Destination]) -> None:
+    """Stop streaming report files whose codec is used by another result destination.
+
+    Streamed results are never cached, so other destinations would encode them again.
+    Stateful codecs are never shared between destinations, and are left unchanged.
+    """
+    result_codecs = Counter(
+        destination.codec.name
+        for destination in destinations
+        if (
+            isinstance(destination, JSONFile)
+            or (isinstance(destination, HTTPWebhook) and destination.emit_result)
+        )
+        and destination.codec.stateless
+    )
+    for destination in destinations:
+        if (
+            isinstance(destination, JSONFile)
+            and result_codecs[destination.codec.name] > 1
+        ):
+            destination.stream = False
+
+
+def _make_user_reporter(config: pytest.Config) -> Reporter:
+    """Create the default reporter, unless the user sets another reporter."""
+    reporter_to_use: Reporter = _make_reporter(config)
+
+    def set_reporter(reporter: Reporter) -> None:
+        nonlocal reporter_to_use
+        reporter_to_use = reporter
+
+    # Let the user set the reporter if they want to
+    config.hook.pytest_broadcaster_set_reporter(set=set_reporter)
+
+    if config.option.collect_log_coalesce and not isinstance(
+        reporter_to_use, CoalescingReporter
+    ):
+        msg = (
+            "--collect-log-coalesce requires a reporter implementing "
+            f"CoalescingReporter, got {type(reporter_to_use).__name__}"
+        )
+        raise pytest.UsageError(msg)
+    return reporter_to_use
+
+
+def _make_reporter(config: pytest.Config) -> Reporter:
+    """Create the default reporter, or the fast reporter if requested."""
+    reporter_class = DefaultReporter
+    if config.option.collect_log_fast:
+        # The fast reporter neither builds models nor accumulates a session result
+        for option in (
+            "collect_report",
+            "collect_url",
+            "collect_otlp",
+            "collect_metrics_port",
+            "collect_metrics_file",
+        ):
+            if getattr(config.option, option) is not None:
+                name = option.replace("_", "-")
+                msg = f"--collect-log-fast cannot be used with --{name}"
+                raise pytest.UsageError(msg)
+        reporter_class = FastReporter
+    return reporter_class(
+        numeric_timestamps=config.option.collect_timestamps == "ns",
+        max_traceback_depth=config.option.collect_traceback_depth,
+        max_message_length=config.option.collect_message_length,
+        deduplicate_errors=config.option.collect_dedup_errors,
+    )
+
+
+def _make_otlp_traces(config: pytest.Config, endpoint: str) -> OTLPTraces:
+    """Create the OTLP traces destination from command line options."""
+    try:
+        return OTLPTraces(endpoint, protobuf=config.option.collect_otlp_protobuf)
+    except ValueError as e:
+        raise pytest.UsageError(str(e)) from e
+
+
+def _make_prometheus_metrics(config: pytest.Config) -> PrometheusMetrics | None:
+    """Create the metrics destination from command line options, if requested."""
+    port = config.option.collect_metrics_port
+    textfile = config.option.collect_metrics_file
+    if port is None and textfile is None:
+        return None
+    return PrometheusMetrics(port=port, textfile=textfile)
+
+
+def _make_event_filter(config: pytest.Config) -> EventFilter | None:
+    """Create an event filter from command line options, if any filter is requested."""
+    events = config.option.collect_log_events
+    outcomes = config.option.collect_log_outcomes
+    node_ids = config.option.collect_log_nodes
+    sample_rate = config.option.collect_log_sample
+    if events is None and outcomes is None and node_ids is None and sample_rate == 1:
+        return None
+    try:
+        return EventFilter(
+            events=None if events is None else events.split(","),
+            outcomes=None if outcomes is None else outcomes.split(","),
+            node_ids=node_ids,
+            sample_rate=sample_rate,
+        )
+    except ValueError as e:
+        raise pytest.UsageError(str(e)) from e
+
+
+def _make_threaded_destinations(
+    config: pytest.Config, destinations: list[Destination]
+) -> list[Destination]:
+    """Wrap each destination so that it is written within a dedicated thread."""
+    try:
+        return [
+            ThreadedDestination(
+                destination,
+                queue_size=config.option.collect_parallel_queue,
+                drop=config.option.collect_parallel_drop,
+            )
+            for destination in destinations
+        ]
+    except ValueError as e:
+        raise pytest.UsageError(str(e)) from e
+
+
+def _make_profiler(config: pytest.Config) -> Profiler | None:
+    """Return the profiler to use, if profiling or tracing is requested."""
+    if trace_path := config.option.broadcaster_trace:
+        return Instrumentation(OTLPFileExporter(trace_path))
+    if config.option.broadcaster_profile:
+        return Profiler()
+    return None
+
+
+def _make_profiled_destinations(
+    profiler: Profiler, destinations: list[Destination]
+) -> list[Destination]:
+    """Wrap each destination so that the time spent writing to it is recorded."""
+    if isinstance(profiler, Instrumentation):
+        return [
+            InstrumentedDestination(
+                destination, profiler, f"{type(destination).__name__}#{idx}"
+            )
+            for idx, destination in enumerate(destinations)
+        ]
+    return [
+        ProfiledDestination(
+            destination, profiler, f"{type(destination).__name__}#{idx}"
+        )
+        for idx, destination in enumerate(destinations)
+    ]
+
+
+def _watch_dropped_events(destinations: list[Destination]) -> None:
+    """Let metrics destinations report the events dropped by all destinations."""
+    for destination in destinations:
+        metrics: object = destination
+        # Find metrics wrapped by profiled, filtered or threaded destinations
+        while not isinstance(metrics, PrometheusMetrics) and hasattr(
+            metrics, "destination"
+        ):
+            metrics = metrics.destination
+        if isinstance(metrics, PrometheusMetrics):
+            metrics.watch_destinations(destinations)
+
+
+def _is_report_file(destination: Destination) -> bool:
+    """Return True if destination needs all events, such as a JSON report file."""
+    if isinstance(destination, ProfiledDestination):
+        destination = destination.destination
+    return isinstance(destination, (JSONFile, PrometheusMetrics))
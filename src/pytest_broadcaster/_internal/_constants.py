@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+# Choices and defaults of command line options. This module is imported whenever the
+# plugin is loaded, even when no destination is used, so it must not import anything.
+
+CODEC_NAMES = ("json", "compact", "msgpack")
+"""Names of all available codecs."""
+
+FORMATS = [*CODEC_NAMES, *(f"dict-{name}" for name in CODEC_NAMES)]
+"""Names of all available formats."""
+
+COMPRESSIONS = {"gzip": ".gz", "zstd": ".zst"}
+"""Supported compressions, and the extension of compressed segments."""
+
+QUEUE_SIZE = 10000
+"""Default maximum number of events waiting to be written to a destination."""
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, cast
+
+from pytest_broadcaster.models.outcome import Outcome
+
+from ._codecs import to_dict
+from ._reporter import DefaultReporter
+
+if TYPE_CHECKING:
+    import datetime
+
+    import pytest
+
+    from pytest_broadcaster.models.session_result import SessionResult
+    from pytest_broadcaster.models.test_case_call import TestCaseCall
+    from pytest_broadcaster.models.test_case_end import TestCaseEnd
+    from pytest_broadcaster.models.test_case_report_event import TestCaseReportEvent
+    from pytest_broadcaster.models.test_case_setup import TestCaseSetup
+    from pytest_broadcaster.models.test_case_teardown import TestCaseTeardown
+
+
+_PASSED = Outcome.passed.value
+_FAILED = Outcome.failed.value
+_SKIPPED = Outcome.skipped.value
+_XFAILED = Outcome.xfailed.value
+
+
+class WireEvent(dict[str, Any]):
+    """A session event built as a dictionary ready to be encoded.
+
+    Fields can also be read as attributes, like the fields of models, but they hold
+    the values found on the wire: outcomes are strings instead of enums, and nested
+    objects are dictionaries.
+    """
+
+    __slots__ = ()
+
+    def __getattr__(self, name: str) -> Any:  # noqa: ANN401
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+class FastReporter(DefaultReporter):
+    """A reporter building test case events as dictionaries ready to be encoded.
+
+    The default reporter builds models, which are converted into dictionaries before
+    being encoded. This reporter builds the events emitted for each test case as
+    [WireEvent][pytest_broadcaster.WireEvent] dictionaries holding the same fields in
+    the same order instead, so that they are encoded without any conversion. Other
+    events are rare, and are built using the default reporter then converted.
+
+    No event is accumulated into a session result, and `make_session_result` always
+    returns None, so this reporter is meant for destinations streaming events only,
+    such as JSON Lines files, streaming webhooks, WebSockets or Unix sockets.
+
+    Destinations receive test case events as `WireEvent` dictionaries rather than
+    models: fields can be read as attributes, but outcomes are strings and nested
+    steps and errors are dictionaries. Custom destinations must not expect models.
+    """
+
+    _accumulate_result = False
+
+    def __init__(  # noqa: PLR0913
+        self,
+        session_id: str | None = None,
+        clock: Callable[[], datetime.datetime] | None = None,
+        *,
+        numeric_timestamps: bool = False,
+        max_traceback_depth: int | None = None,
+        max_message_length: int | None = None,
+        deduplicate_errors: bool = False,
+    ) -> None:
+        super().__init__(
+            session_id,
+            clock,
+            numeric_timestamps=numeric_timestamps,
+            max_traceback_depth=max_traceback_depth,
+            max_message_length=max_message_length,
+            deduplicate_errors=deduplicate_errors,
+        )
+        self._steps: dict[str, WireEvent] = {}
+
+    def make_session_result(self) -> SessionResult | None:
+        return None
+
+    def make_test_case_step(
+        self, report: pytest.TestReport
+    ) -> TestCaseCall | TestCaseSetup | TestCaseTeardown:
+        when = report.when
+        outcome: str = report.outcome
+        if outcome not in _OUTCOMES:
+            # Fail the same way as the default reporter
+            Outcome(outcome)
+        error = None
+        if report.failed:
+            error = to_dict(self._make_test_case_error(report))
+        if when == "call":
+            if outcome == _SKIPPED and hasattr(report, "wasxfail"):
+                outcome = _XFAILED
+            step = WireEvent(
+                node_id=report.nodeid,
+                session_id=self._session_id,
+                start_timestamp=self._make_timestamp(report.start),
+                stop_timestamp=self._make_timestamp(report.stop),
+                duration=report.duration,
+                outcome=outcome,
+                event="case_call",
+                error=error,
+            )
+        elif when in ("setup", "teardown"):
+            if when == "setup":
+                self._steps.clear()
+            step = WireEvent(
+                session_id=self._session_id,
+                node_id=report.nodeid,
+                start_timestamp=self._make_timestamp(report.start),
+                stop_timestamp=self._make_timestamp(report.stop),
+                duration=report.duration,
+                outcome=outcome,
+                event=f"case_{when}",
+                error=error,
+            )
+        else:
+            msg = f"Unknown step {when}"
+            raise ValueError(msg)
+        self._steps[when] = step
+        return cast("TestCaseSetup", step)
+
+    def make_test_case_end(self, node_id: str) -> TestCaseEnd:
+        steps = self._steps
+        setup = steps.get("setup")
+        teardown = steps.get("teardown")
+        assert setup, (
+            "pending steps are missing, this is a bug in pytest-broadcaster plugin"
+        )
+        assert teardown, (
+            "pending steps are missing, this is a bug in pytest-broadcaster plugin"
+        )
+        assert setup["node_id"] == node_id, (
+            "node_id mismatch, this is a bug in pytest-broadcaster plugin"
+        )
+        outcomes = [step["outcome"] for step in steps.values()]
+        # Same precedence as the default reporter
+        if _FAILED in outcomes:
+            outcome = _FAILED
+        elif _XFAILED in outcomes:
+            outcome = _XFAILED
+        elif _SKIPPED in outcomes:
+            outcome = _SKIPPED
+        else:
+            outcome = _PASSED
+        duration = 0
+        for step in steps.values():
+            duration += step["duration"]
+        return cast(
+            "TestCaseEnd",
+            WireEvent(
+                session_id=self._session_id,
+                node_id=node_id,
+                start_timestamp=setup["start_timestamp"],
+                stop_timestamp=teardown["stop_timestamp"],
+                total_duration=duration,
+                outcome=outcome,
+                event="case_end",
+            ),
+        )
+
+    def make_test_case_report(self, node_id: str) -> TestCaseReportEvent:
+        finished = cast("WireEvent", self.make_test_case_end(node_id))
+        steps = self._steps
+        return cast(
+            "TestCaseReportEvent",
+            WireEvent(
+                session_id=self._session_id,
+                node_id=node_id,
+                outcome=finished["outcome"],
+                duration=finished["total_duration"],
+                setup=steps["setup"],
+                teardown=steps["teardown"],
+                finished=finished,
+                event="case_report",
+                call=steps.get("call"),
+            ),
+        )
+
+
+_OUTCOMES = frozenset(outcome.value for outcome in Outcome)
+
+
+if TYPE_CHECKING:
+    # Make sure that the class implements the interface
+    FastReporter("fake-id", datetime.datetime.now)
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import datetime
+import functools
+import hashlib
 import importlib.metadata
+import math
 import platform
 import sys
 from typing import TYPE_CHECKING
@@ -39,7 +42,7 @@ if TYPE_CHECKING:
     from warnings import WarningMessage
 
     import pytest
-    from _pytest._code.code import ReprTraceback
+    from _pytest._code.code import ReprFileLocation, ReprTraceback
 
 
 def make_session_id() -> str:
@@ -141,22 +144,114 @@ def make_warning_message(warning: WarningMessage) -> str:
 
 
 def make_timestamp(epoch: float) -> str:
-    return datetime.datetime.fromtimestamp(epoch, tz=datetime.timezone.utc).isoformat()
+    """Format an epoch timestamp in ISO 8601 format.
+
+    The result is identical to `datetime.fromtimestamp(epoch, tz=utc).isoformat()`,
+    but the date and time up to the second are cached, since consecutive timestamps
+    are most often within the same second.
+    """
+    # Round to the nearest microsecond the same way datetime.fromtimestamp does
+    fraction, seconds = math.modf(epoch)
+    microseconds = round(fraction * _MICROSECONDS_PER_SECOND)
+    if microseconds >= _MICROSECONDS_PER_SECOND:
+        seconds += 1
+        microseconds -= _MICROSECONDS_PER_SECOND
+    elif microseconds < 0:
+        seconds -= 1
+        microseconds += _MICROSECONDS_PER_SECOND
+    prefix = _format_seconds(int(seconds))
+    if microseconds:
+        return f"{prefix}.{microseconds:06d}+00:00"
+    return f"{prefix}+00:00"
+
+
+@functools.lru_cache(maxsize=16)
+def _format_seconds(seconds: int) -> str:
+    dt = datetime.datetime.fromtimestamp(seconds, tz=datetime.timezone.utc)
+    return dt.replace(tzinfo=None).isoformat()
 
 
 def make_timestamp_from_datetime(dt: datetime.datetime) -> str:
     return dt.astimezone(datetime.timezone.utc).isoformat()
 
 
-def make_traceback(report: pytest.TestReport) -> list[TracebackLine]:
-    return make_traceback_from_reprtraceback(report.longrepr.reprtraceback)  # type: ignore[union-attr]
+def make_timestamp_ns(epoch: float) -> int:
+    """Convert an epoch timestamp in seconds to nanoseconds."""
+    return int(epoch * 1_000_000_000)
+
+
+def make_timestamp_ns_from_datetime(dt: datetime.datetime) -> int:
+    """Convert a datetime to nanoseconds since epoch."""
+    delta = dt.astimezone(datetime.timezone.utc) - _EPOCH
+    return delta // _ONE_MICROSECOND * 1000
+
+
+def parse_timestamp_ns(timestamp: str | int) -> int:
+    """Convert a timestamp found in events, in any format, to nanoseconds."""
+    if isinstance(timestamp, int):
+        return timestamp
+    return make_timestamp_ns_from_datetime(datetime.datetime.fromisoformat(timestamp))
+
+
+_MICROSECONDS_PER_SECOND = 1_000_000
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_ONE_MICROSECOND = datetime.timedelta(microseconds=1)
+
+
+def make_traceback(
+    report: pytest.TestReport, max_depth: int | None = None
+) -> list[TracebackLine]:
+    return make_traceback_from_reprtraceback(report.longrepr.reprtraceback, max_depth)  # type: ignore[union-attr]
+
+
+def make_crash(report: pytest.TestReport) -> ReprFileLocation | None:
+    """Return the crash location and message of a failed report, if any."""
+    return getattr(report.longrepr, "reprcrash", None)
+
+
+def make_exception_type(report: pytest.TestReport, crash: ReprFileLocation) -> str:
+    """Return the exception type name of a failed report."""
+    # Location of the last traceback entry holds the exception type name
+    entries = report.longrepr.reprtraceback.reprentries  # type: ignore[union-attr]
+    location = getattr(entries[-1], "reprfileloc", None) if entries else None
+    if location is not None:
+        return location.message  # type: ignore[no-any-return]
+    # Crash message may not start with the exception type (e.g. for assertions)
+    return crash.message.split(":", 1)[0].strip()
+
+
+def make_error_fingerprint(
+    exception_type: str, crash: ReprFileLocation, lines: list[TracebackLine]
+) -> str:
+    """Compute the fingerprint of an error.
+
+    Fingerprint is computed from the exception type, the crash location and the
+    traceback entries. Exception value is ignored, so that errors raised by the same
+    code share the same fingerprint.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(f"{exception_type}\0{crash.path}:{crash.lineno}".encode())
+    for line in lines:
+        digest.update(f"\0{line.path}:{line.lineno}:{line.message}".encode())
+    return digest.hexdigest()
 
 
 def make_traceback_from_reprtraceback(
-    reprtraceback: ReprTraceback,
+    reprtraceback: ReprTraceback, max_depth: int | None = None
 ) -> list[TracebackLine]:
-    return [
-        make_traceback_line(line.reprfileloc)  # type: ignore[union-attr, arg-type]
-        for line in reprtraceback.reprentries
-        if filter_traceback(line.reprfileloc.path)  # type: ignore[union-attr]
-    ]
+    """Return the traceback lines, keeping at most `max_depth` innermost lines."""
+    if max_depth is None:
+        return [
+            make_traceback_line(line.reprfileloc)  # type: ignore[union-attr, arg-type]
+            for line in reprtraceback.reprentries
+            if filter_traceback(line.reprfileloc.path)  # type: ignore[union-attr]
+        ]
+    # Walk entries from the innermost one, so that dropped lines are never built
+    lines: list[TracebackLine] = []
+    for line in reversed(reprtraceback.reprentries):
+        if len(lines) >= max_depth:
+            break
+        if filter_traceback(line.reprfileloc.path):  # type: ignore[union-attr]
+            lines.append(make_traceback_line(line.reprfileloc))  # type: ignore[union-attr, arg-type]
+    lines.reverse()
+    return lines
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import contextlib
+import errno
+import os
+import stat
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, Callable
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+COPY_CHUNK_SIZE = 1024 * 1024
+"""Size of the chunks copied when copying within the kernel is not supported."""
+
+_UNSUPPORTED_COPY_ERRORS = (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP)
+
+
+def copy_range(source: int, destination: int, offset: int, count: int) -> None:
+    """Copy bytes from a file at a given offset to the current position of another file.
+
+    Bytes are copied within the kernel using `copy_file_range` or `sendfile` when
+    available, and read and written in chunks otherwise.
+    """
+    copiers = _kernel_copiers()
+    while count > 0:
+        if copiers:
+            try:
+                copied = copiers[0](source, destination, offset, count)
+            except OSError as e:
+                if e.errno not in _UNSUPPORTED_COPY_ERRORS:
+                    raise
+                copiers.pop(0)
+                continue
+        else:
+            os.lseek(source, offset, os.SEEK_SET)
+            chunk = os.read(source, min(count, COPY_CHUNK_SIZE))
+            with memoryview(chunk) as view:
+                written = 0
+                while written < len(chunk):
+                    written += os.write(destination, view[written:])
+            copied = len(chunk)
+        if not copied:
+            msg = f"Unexpected end of file while copying {count} bytes"
+            raise EOFError(msg)
+        offset += copied
+        count -= copied
+
+
+def _kernel_copiers() -> list[Callable[[int, int, int, int], int]]:
+    """Return the functions copying bytes within the kernel, in order of preference."""
+    copiers: list[Callable[[int, int, int, int], int]] = []
+    if hasattr(os, "copy_file_range"):
+        copiers.append(_copy_file_range)
+    if hasattr(os, "sendfile"):
+        copiers.append(_sendfile)
+    return copiers
+
+
+def _copy_file_range(source: int, destination: int, offset: int, count: int) -> int:
+    return os.copy_file_range(source, destination, count, offset)
+
+
+def _sendfile(source: int, destination: int, offset: int, count: int) -> int:
+    return os.sendfile(destination, source, offset, count)
+
+
+@contextlib.contextmanager
+def atomic_writer(path: Path) -> Iterator[BinaryIO]:
+    """Write a file atomically.
+
+    Data is written to a temporary file within the same directory, which is synced
+    to disk and then renamed over the target path, so that readers never see a
+    partially written file. The temporary file is removed on error.
+
+    The file keeps the permissions of the target file when it exists, and otherwise
+    gets the permissions of a newly created file according to the umask. The file
+    object is buffered, and must be flushed before its file descriptor is written
+    to directly.
+    """
+    fd, temporary = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as file:
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+        Path(temporary).chmod(_file_mode(path))
+        Path(temporary).replace(path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            Path(temporary).unlink()
+        raise
+
+
+def _file_mode(path: Path) -> int:
+    """Return the permissions of the file, or of a new file if it does not exist."""
+    try:
+        return stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        # The umask can only be read by setting it
+        umask = os.umask(0o022)
+        os.umask(umask)
+        return 0o666 & ~umask
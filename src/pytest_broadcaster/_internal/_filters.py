@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import fnmatch
+import functools
+import re
+import zlib
+from typing import TYPE_CHECKING, Callable
+
+from pytest_broadcaster.interfaces import Destination
+from pytest_broadcaster.models.outcome import Outcome
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from pytest_broadcaster._internal._codecs import EncodedPayload
+    from pytest_broadcaster.models.session_event import SessionEvent
+    from pytest_broadcaster.models.session_result import SessionResult
+
+
+EVENT_TYPES = (
+    "session_start",
+    "warning_message",
+    "error_message",
+    "collect_report",
+    "case_setup",
+    "case_call",
+    "case_teardown",
+    "case_end",
+    "case_report",
+    "session_end",
+    "plugin_profile",
+)
+"""Types of the events which can be filtered."""
+
+STEP_EVENT_TYPES = frozenset(("case_setup", "case_call", "case_teardown"))
+"""Types of the events filtered by outcome."""
+
+TEST_CASE_EVENT_TYPES = frozenset(("case_end", "case_report"))
+"""Types of the events holding the outcome of a whole test case, which are sampled."""
+
+_SAMPLE_SCALE = 1 << 32
+
+_PASSED = Outcome.passed.value
+
+
+class EventFilter:
+    """Decide which session events are written to a destination.
+
+    An event is accepted when all the following conditions are met:
+
+    - Its type is one of the accepted event types (all types by default).
+    - When it is a test case step, its outcome is one of the accepted outcomes
+      (all outcomes by default). Test case end and test case report events are never
+      filtered by outcome, so that consumers can still count tests.
+    - When it has a node ID, the node ID matches one of the glob patterns (any node
+      ID by default).
+    - When it is a test case end or test case report event with a passed outcome,
+      its node ID is sampled. Sampling is deterministic: the same node ID is always
+      either sampled or not, across runs as well.
+
+    Steps are sampled along with their test case, according to the outcome of the
+    whole test case, which is only known once the test case ends: use a
+    [FilteredDestination][pytest_broadcaster.FilteredDestination] to hold steps until
+    then, so that all events of a test case are kept or dropped together.
+    """
+
+    def __init__(
+        self,
+        *,
+        events: Iterable[str] | None = None,
+        outcomes: Iterable[str] | None = None,
+        node_ids: Iterable[str] | None = None,
+        sample_rate: float = 1,
+    ) -> None:
+        self.events = None if events is None else frozenset(events)
+        if self.events is not None and (unknown := self.events - set(EVENT_TYPES)):
+            msg = (
+                f"Unknown event types: {', '.join(sorted(unknown))} "
+                f"(expected one of {', '.join(EVENT_TYPES)})"
+            )
+            raise ValueError(msg)
+        self.outcomes = None if outcomes is None else frozenset(outcomes)
+        known_outcomes = [outcome.value for outcome in Outcome]
+        if self.outcomes is not None and (
+            unknown := self.outcomes - set(known_outcomes)
+        ):
+            msg = (
+                f"Unknown outcomes: {', '.join(sorted(unknown))} "
+                f"(expected one of {', '.join(known_outcomes)})"
+            )
+            raise ValueError(msg)
+        if not 0 <= sample_rate <= 1:
+            msg = f"Sample rate must be between 0 and 1, got {sample_rate}"
+            raise ValueError(msg)
+        self.sample_rate = sample_rate
+        self.node_ids = None if node_ids is None else list(node_ids)
+        self._node_id_pattern = (
+            None
+            if self.node_ids is None
+            else re.compile("|".join(fnmatch.translate(glob) for glob in self.node_ids))
+        )
+        self._sample_threshold = int(sample_rate * _SAMPLE_SCALE)
+        self._accepted_node_ids: dict[str, bool] = {}
+        self._sampled_node_ids: dict[str, bool] = {}
+
+    def accept(self, event: SessionEvent) -> bool:
+        """Return True if the event must be written to the destination."""
+        event_type = event.event
+        if self.events is not None and event_type not in self.events:
+            return False
+        outcome = _get_outcome(event)
+        if (
+            self.outcomes is not None
+            and event_type in STEP_EVENT_TYPES
+            and outcome is not None
+            and outcome not in self.outcomes
+        ):
+            return False
+        node_id: str | None = getattr(event, "node_id", None)
+        if node_id is None:
+            return True
+        if self._node_id_pattern is not None and not self._accept_node_id(node_id):
+            return False
+        if (
+            outcome == _PASSED
+            and self.sample_rate < 1
+            and event_type in TEST_CASE_EVENT_TYPES
+        ):
+            return self._sample(node_id)
+        return True
+
+    def sampled(self, node_id: str) -> bool:
+        """Return True if events of the test case are kept even when it passes."""
+        return self.sample_rate >= 1 or self._sample(node_id)
+
+    def _accept_node_id(self, node_id: str) -> bool:
+        accepted = self._accepted_node_ids.get(node_id)
+        if accepted is None:
+            assert self._node_id_pattern, "node ID pattern expected to be set"
+            accepted = self._accepted_node_ids[node_id] = bool(
+                self._node_id_pattern.match(node_id)
+            )
+        return accepted
+
+    def _sample(self, node_id: str) -> bool:
+        sampled = self._sampled_node_ids.get(node_id)
+        if sampled is None:
+            sampled = self._sampled_node_ids[node_id] = (
+                zlib.crc32(node_id.encode()) < self._sample_threshold
+            )
+        return sampled
+
+
+def _get_outcome(event: SessionEvent) -> str | None:
+    outcome = getattr(event, "outcome", None)
+    # Events built by the fast reporter hold outcomes as strings
+    if isinstance(outcome, Outcome):
+        return outcome.value
+    return outcome
+
+
+class FilteredDestination(Destination):
+    """A destination forwarding only the events accepted by a filter.
+
+    Events are filtered before being handed over to the destination, so that dropped
+    events are never encoded. The session result is always written.
+
+    When passing tests are sampled, the steps of test cases which are not sampled
+    are held until the test case ends, and are only forwarded when the test case
+    did not pass. Steps still held when the destination is closed are forwarded.
+    """
+
+    def __init__(self, destination: Destination, event_filter: EventFilter) -> None:
+        self.destination = destination
+        self.event_filter = event_filter
+        self.dropped_events = 0
+        self._pending_steps: dict[str, list[Callable[[], None]]] = {}
+
+    def write_event(self, event: SessionEvent) -> None:
+        self._write(event, functools.partial(self.destination.write_event, event))
+
+    def write_result(self, result: SessionResult) -> None:
+        self.destination.write_result(result)
+
+    def write_encoded_event(self, payload: EncodedPayload[SessionEvent]) -> None:
+        self._write(
+            payload.value,
+            functools.partial(self.destination.write_encoded_event, payload),
+        )
+
+    def _write(self, event: SessionEvent, write: Callable[[], None]) -> None:
+        event_filter = self.event_filter
+        node_id: str | None = getattr(event, "node_id", None)
+        if event_filter.sample_rate < 1 and node_id is not None:
+            event_type = event.event
+            if event_type in STEP_EVENT_TYPES and not event_filter.sampled(node_id):
+                # Hold the step until the outcome of the test case is known
+                if event_filter.accept(event):
+                    self._pending_steps.setdefault(node_id, []).append(write)
+                else:
+                    self.dropped_events += 1
+                return
+            if event_type in TEST_CASE_EVENT_TYPES:
+                pending = self._pending_steps.pop(node_id, [])
+                if _get_outcome(event) == _PASSED:
+                    self.dropped_events += len(pending)
+                else:
+                    for write_step in pending:
+                        write_step()
+        if event_filter.accept(event):
+            write()
+        else:
+            self.dropped_events += 1
+
+    def write_encoded_result(self, payload: EncodedPayload[SessionResult]) -> None:
+        self.destination.write_encoded_result(payload)
+
+    def summary(self) -> str | None:
+        return self.destination.summary()
+
+    def open(self) -> None:
+        self.destination.open()
+
+    def close(self) -> None:
+        # Outcome of test cases which never ended is unknown, keep their steps
+        for pending in self._pending_steps.values():
+            for write_step in pending:
+                write_step()
+        self._pending_steps.clear()
+        self.destination.close()
+
+    def __repr__(self) -> str:
+        return repr(self.destination)
+
+
+if TYPE_CHECKING:
+    # Make sure the class implements the Destination interface
+    from ._json_files import JSONLinesFile
+
+    FilteredDestination(JSONLinesFile("fake.jsonl"), EventFilter())
@@ -1,64 +1,321 @@
 from __future__ import annotations
 
-import json
-from dataclasses import asdict
-from enum import Enum
+import dataclasses
+import tempfile
+import time
 from pathlib import Path
-from typing import TYPE_CHECKING, TextIO
+from typing import TYPE_CHECKING, Any, BinaryIO
+
+import pytest
 
 from pytest_broadcaster.interfaces import Destination
 
+from ._codecs import EncodedPayload, JSONCodec, to_dict
+from ._files import atomic_writer, copy_range
+
 if TYPE_CHECKING:
+    from pytest_broadcaster.interfaces import Codec
     from pytest_broadcaster.models.session_event import SessionEvent
     from pytest_broadcaster.models.session_result import SessionResult
 
 
-def _default_serializer(obj: object) -> object:
-    if isinstance(obj, Enum):
-        return obj.value
-    return obj
+_CHECKPOINT_ARRAYS = ("collect_reports", "test_reports", "errors", "warnings")
+_CHECKPOINT_EVENTS = {
+    "collect_report": "collect_reports",
+    "error_message": "errors",
+    "warning_message": "warnings",
+}
+
+
+class _CheckpointArray:
+    """An array of the checkpoint file, which only grows between checkpoints."""
+
+    __slots__ = ("offset", "pending", "size")
+
+    def __init__(self) -> None:
+        # Position of the items already written in the checkpoint file
+        self.offset = 0
+        self.size = 0
+        # Encoded items not written yet
+        self.pending: list[bytes] = []
+
+
+class _SpoolFile:
+    """Encoded items of an array of the session result, appended to a temporary file."""
+
+    __slots__ = ("count", "file", "size")
 
+    def __init__(self, directory: Path) -> None:
+        # Within the same directory as the report, so that items can be copied
+        # within the kernel
+        self.file = tempfile.TemporaryFile(dir=directory)  # noqa: SIM115
+        self.count = 0
+        self.size = 0
 
-def encode(obj: object) -> str:
-    return json.dumps(
-        asdict(obj),  # type: ignore[call-overload]
-        default=_default_serializer,
-    )
+    def append(self, item: bytes) -> None:
+        if self.count:
+            self.size += self.file.write(b", ")
+        self.size += self.file.write(item)
+        self.count += 1
 
 
 class JSONFile(Destination):
-    def __init__(self, filepath: str) -> None:
+    """Write the session result to a JSON file.
+
+    When a checkpoint interval is given, a partial session result is built from
+    session events and written to the file at most once per interval, so that a
+    usable report is left behind if the process is killed before the session ends.
+    Checkpoints are written atomically (to a temporary file which is then renamed).
+    Items written by the previous checkpoint are copied from the previous file
+    within the kernel when supported, so that the cost of a checkpoint is
+    proportional to the data received since the previous checkpoint.
+
+    Partial session results have an exit status of 2 (interrupted), and their stop
+    timestamp is the last timestamp found in events.
+
+    The session result is always written atomically, in chunks. When spooling is
+    enabled, items are encoded as events are received and appended to temporary
+    files, which are copied within the kernel when the session result is written,
+    instead of encoding the whole session result at the end of the session.
+
+    When `stream` is False, the session result is encoded as a whole instead of in
+    chunks, so that the encoded result is shared with other destinations using the
+    same codec rather than encoded once more.
+    """
+
+    def __init__(
+        self,
+        filepath: str,
+        *,
+        codec: Codec | None = None,
+        checkpoint_interval: float | None = None,
+        spool: bool = False,
+        stream: bool = True,
+    ) -> None:
         self.filepath = Path(filepath)
+        self.codec = codec or JSONCodec()
+        if checkpoint_interval is not None and self.codec.name != JSONCodec.name:
+            msg = f"Checkpoints require json format, got {self.codec.name}"
+            raise ValueError(msg)
+        if spool and self.codec.name != JSONCodec.name:
+            msg = f"Spooling requires json format, got {self.codec.name}"
+            raise ValueError(msg)
+        self.checkpoint_interval = checkpoint_interval
+        self.spool = spool
+        self.stream = stream
+        self.spooled_result = False
+        self.checkpoints = 0
+        self._last_checkpoint = time.monotonic()
+        self._finalized = False
+        self._header: dict[str, Any] | None = None
+        self._stop_timestamp: str | int | None = None
+        self._arrays = {name: _CheckpointArray() for name in _CHECKPOINT_ARRAYS}
+        self._spool_files: dict[str, _SpoolFile] = {}
+        self._pending_steps: dict[str, dict[str, Any]] = {}
+        self._dirty = False
 
     def open(self) -> None:
         # Ensure the directory exists.
         self.filepath.parent.mkdir(parents=True, exist_ok=True)
 
     def close(self) -> None:
-        pass
+        if self._dirty and not self._finalized:
+            self.checkpoint()
+        self._close_spool_files()
 
     def write_result(self, result: SessionResult) -> None:
-        json_data = json.dumps(
-            asdict(result),
-            default=_default_serializer,
+        self._write_result(result)
+
+    def write_encoded_result(self, payload: EncodedPayload[SessionResult]) -> None:
+        self._write_result(payload.value, payload)
+
+    def _write_result(
+        self,
+        result: SessionResult,
+        payload: EncodedPayload[SessionResult] | None = None,
+    ) -> None:
+        with atomic_writer(self.filepath) as file:
+            if self.spool and self._is_spooled(result):
+                self._write_spooled_result(file, result)
+                self.spooled_result = True
+            elif payload is not None and (encoded := payload.encoded(self.codec)):
+                # Already encoded by another destination
+                file.write(encoded)
+            elif payload is not None and not self.stream:
+                # Encoded as a whole, so that other destinations reuse it
+                file.write(payload.encode(self.codec))
+            else:
+                # Encoded in chunks, so that the whole result is never held in memory
+                data = to_dict(result) if payload is None else payload.data
+                for chunk in self.codec.iter_encode(data):
+                    file.write(chunk)
+        self._finalized = True
+        self._close_spool_files()
+
+    def _is_spooled(self, result: SessionResult) -> bool:
+        """Return True if spooled items are the items of the session result."""
+        return all(
+            len(getattr(result, name))
+            == (spool.count if (spool := self._spool_files.get(name)) else 0)
+            for name in _CHECKPOINT_ARRAYS
         )
-        self.filepath.write_text(json_data)
+
+    def _write_spooled_result(self, file: BinaryIO, result: SessionResult) -> None:
+        """Write the session result, copying spooled items within the kernel."""
+        encode = self.codec.encode
+        data = to_dict(
+            dataclasses.replace(
+                result, collect_reports=[], test_reports=[], errors=[], warnings=[]
+            )
+        )
+        # Same layout as the JSON codec
+        file.write(b"{")
+        for index, (key, value) in enumerate(data.items()):
+            if index:
+                file.write(b", ")
+            file.write(encode(key) + b": ")
+            spool = self._spool_files.get(key)
+            if spool is None:
+                file.write(encode(value))
+                continue
+            spool.file.flush()
+            file.write(b"[")
+            file.flush()
+            copy_range(spool.file.fileno(), file.fileno(), 0, spool.size)
+            file.write(b"]")
+        file.write(b"}")
+
+    def _close_spool_files(self) -> None:
+        for spool in self._spool_files.values():
+            spool.file.close()
+        self._spool_files.clear()
 
     def write_event(
         self,
         event: SessionEvent,
     ) -> None:
-        # We don't write events to JSON file
-        pass
+        self.write_encoded_event(EncodedPayload(event))
+
+    def write_encoded_event(self, payload: EncodedPayload[SessionEvent]) -> None:
+        # Events are only used to write checkpoints and spool items, until result
+        # is written
+        if (self.checkpoint_interval is None and not self.spool) or self._finalized:
+            return
+        self._add_event(payload)
+        if (
+            self._dirty
+            and self.checkpoint_interval is not None
+            and time.monotonic() - self._last_checkpoint >= self.checkpoint_interval
+        ):
+            self.checkpoint()
+
+    def checkpoint(self) -> None:
+        """Write the partial session result built from events received so far."""
+        if self._header is None:
+            return
+        encode = self.codec.encode
+        previous = self._open_previous_checkpoint()
+        try:
+            with atomic_writer(self.filepath) as file:
+                file.write(b"{" + encode(self._header)[1:-1])
+                for name, array in self._arrays.items():
+                    file.write(b', "' + name.encode() + b'": [')
+                    offset = file.tell()
+                    if array.size and previous is not None:
+                        file.flush()
+                        copy_range(
+                            previous.fileno(), file.fileno(), array.offset, array.size
+                        )
+                        if array.pending:
+                            file.write(b", ")
+                    file.write(b", ".join(array.pending))
+                    array.offset = offset
+                    array.size = file.tell() - offset
+                    array.pending.clear()
+                    file.write(b"]")
+                trailer = {
+                    "stop_timestamp": self._stop_timestamp,
+                    "exit_status": int(pytest.ExitCode.INTERRUPTED),
+                }
+                file.write(b", " + encode(trailer)[1:])
+        finally:
+            if previous is not None:
+                previous.close()
+        self.checkpoints += 1
+        self._last_checkpoint = time.monotonic()
+        self._dirty = False
+
+    def _open_previous_checkpoint(self) -> BinaryIO | None:
+        if not self.checkpoints:
+            return None
+        return self.filepath.open("rb")
+
+    def _add_event(self, payload: EncodedPayload[SessionEvent]) -> None:
+        """Update the partial session result with an event."""
+        kind = payload.value.event
+        # Shared with other destinations, must not be modified
+        data = payload.data
+        timestamp = data.get("stop_timestamp", data.get("timestamp"))
+        if timestamp is not None:
+            self._stop_timestamp = timestamp
+        if kind == "session_start":
+            self._header = {
+                "session_id": data["session_id"],
+                "start_timestamp": data["timestamp"],
+                "python": data["python"],
+                "pytest_version": data["pytest_version"],
+                "plugin_version": data["plugin_version"],
+                "project": data["project"],
+            }
+        elif kind in _CHECKPOINT_EVENTS:
+            self._add_encoded_item(_CHECKPOINT_EVENTS[kind], payload.encode(self.codec))
+        elif kind in ("case_setup", "case_call", "case_teardown"):
+            self._pending_steps.setdefault(data["node_id"], {})[kind[5:]] = data
+        elif kind == "case_end":
+            steps = self._pending_steps.pop(data["node_id"], {})
+            # Same fields as TestCaseReport
+            report = {
+                "node_id": data["node_id"],
+                "outcome": data["outcome"],
+                "duration": data["total_duration"],
+                "setup": steps.get("setup"),
+                "teardown": steps.get("teardown"),
+                "finished": data,
+                "call": steps.get("call"),
+            }
+            self._add_item("test_reports", report)
+        elif kind == "case_report":
+            report = {
+                key: value
+                for key, value in data.items()
+                if key not in ("event", "session_id")
+            }
+            self._add_item("test_reports", report)
+
+    def _add_item(self, array: str, item: dict[str, Any]) -> None:
+        self._add_encoded_item(array, self.codec.encode(item))
+
+    def _add_encoded_item(self, array: str, encoded: bytes) -> None:
+        if self.spool:
+            spool = self._spool_files.get(array)
+            if spool is None:
+                spool = self._spool_files[array] = _SpoolFile(self.filepath.parent)
+            spool.append(encoded)
+        if self.checkpoint_interval is not None:
+            self._arrays[array].pending.append(encoded)
+            self._dirty = True
 
     def summary(self) -> str | None:
         return f"generated report file: {self.filepath.as_posix()}"
 
 
 class JSONLinesFile(Destination):
-    def __init__(self, filepath: str) -> None:
+    def __init__(self, filepath: str, *, codec: Codec | None = None) -> None:
         self.filepath = Path(filepath)
-        self._file: TextIO | None = None
+        self.codec = codec or JSONCodec()
+        # Binary payloads are self-delimiting, text payloads are written one per line
+        self._delimiter = b"" if self.codec.binary else b"\n"
+        self._file: BinaryIO | None = None
 
     def _open(self) -> None:
         if self._file is not None:
@@ -66,8 +323,8 @@ class JSONLinesFile(Destination):
             raise RuntimeError(msg)
         # Ensure the directory exists.
         self.filepath.parent.mkdir(parents=True, exist_ok=True)
-        # Open the text file in write mode.
-        self._file = self.filepath.open("wt", buffering=1, encoding="UTF-8")
+        # Open the file in write mode.
+        self._file = self.filepath.open("wb")
 
     def close(self) -> None:
         if self._file is None:
@@ -83,14 +340,13 @@ class JSONLinesFile(Destination):
         self,
         event: SessionEvent,
     ) -> None:
+        self.write_encoded_event(EncodedPayload(event))
+
+    def write_encoded_event(self, payload: EncodedPayload[SessionEvent]) -> None:
         if self._file is None:
             self._open()
         assert self._file, "file expected to be opened"
-        json_data = json.dumps(
-            asdict(event),
-            default=_default_serializer,
-        )
-        self._file.write(json_data + "\n")
+        self._file.write(payload.encode(self.codec) + self._delimiter)
         self._file.flush()
 
     def summary(self) -> str | None:
@@ -0,0 +1,344 @@
+from __future__ import annotations
+
+import http
+import json
+import random
+import struct
+from http.client import HTTPConnection, HTTPSConnection
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlparse
+
+from pytest_broadcaster.__about__ import __version__
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from typing import BinaryIO
+
+
+SCOPE_NAME = "pytest_broadcaster"
+"""Name of the instrumentation scope of spans and metrics."""
+
+SPAN_KIND_INTERNAL = 1
+STATUS_CODE_UNSET = 0
+STATUS_CODE_OK = 1
+STATUS_CODE_ERROR = 2
+AGGREGATION_TEMPORALITY_CUMULATIVE = 2
+
+
+def new_trace_id() -> str:
+    """Return a random trace ID, as 32 hexadecimal characters."""
+    return f"{random.getrandbits(128):032x}"
+
+
+def new_span_id() -> str:
+    """Return a random span ID, as 16 hexadecimal characters."""
+    return f"{random.getrandbits(64):016x}"
+
+
+def make_attributes(attributes: Mapping[str, object]) -> list[dict[str, Any]]:
+    """Return attributes as a list of OTLP key values."""
+    return [
+        {"key": key, "value": make_any_value(value)}
+        for key, value in attributes.items()
+    ]
+
+
+def make_any_value(value: object) -> dict[str, Any]:
+    """Return a value as an OTLP any value."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # 64 bits integers are encoded as strings in OTLP JSON
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [make_any_value(item) for item in value]}}
+    return {"stringValue": str(value)}
+
+
+def make_span(  # noqa: PLR0913
+    trace_id: str,
+    span_id: str,
+    parent_span_id: str | None,
+    name: str,
+    start: int,
+    end: int,
+    attributes: Mapping[str, object] | None = None,
+    status_code: int = STATUS_CODE_UNSET,
+    status_message: str | None = None,
+) -> dict[str, Any]:
+    """Return an OTLP span, with start and end times in nanoseconds since epoch."""
+    span: dict[str, Any] = {
+        "traceId": trace_id,
+        "spanId": span_id,
+        "name": name,
+        "kind": SPAN_KIND_INTERNAL,
+        "startTimeUnixNano": str(start),
+        "endTimeUnixNano": str(end),
+    }
+    if parent_span_id:
+        span["parentSpanId"] = parent_span_id
+    if attributes:
+        span["attributes"] = make_attributes(attributes)
+    if status_code:
+        span["status"] = {"code": status_code}
+        if status_message:
+            span["status"]["message"] = status_message
+    return span
+
+
+def make_resource(attributes: Mapping[str, object] | None = None) -> dict[str, Any]:
+    """Return an OTLP resource, describing the plugin when attributes are omitted."""
+    if attributes is None:
+        attributes = {
+            "service.name": "pytest-broadcaster",
+            "service.version": __version__,
+        }
+    return {"attributes": make_attributes(attributes)}
+
+
+def make_traces_request(
+    spans: list[dict[str, Any]], resource: dict[str, Any] | None = None
+) -> dict[str, Any]:
+    """Return an OTLP export traces request holding spans."""
+    return {
+        "resourceSpans": [
+            {
+                "resource": resource or make_resource(),
+                "scopeSpans": [
+                    {
+                        "scope": {"name": SCOPE_NAME, "version": __version__},
+                        "spans": spans,
+                    }
+                ],
+            }
+        ]
+    }
+
+
+def make_metrics_request(
+    metrics: list[dict[str, Any]], resource: dict[str, Any] | None = None
+) -> dict[str, Any]:
+    """Return an OTLP export metrics request holding metrics."""
+    return {
+        "resourceMetrics": [
+            {
+                "resource": resource or make_resource(),
+                "scopeMetrics": [
+                    {
+                        "scope": {"name": SCOPE_NAME, "version": __version__},
+                        "metrics": metrics,
+                    }
+                ],
+            }
+        ]
+    }
+
+
+class OTLPFileExporter:
+    """Export OTLP requests to a local file, encoded as JSON, one request per line.
+
+    This is the format written by the OpenTelemetry collector file exporter, and
+    read by its `otlpjsonfile` receiver, so that exported telemetry can be inspected
+    or replayed without running a collector during tests.
+    """
+
+    def __init__(self, filepath: str) -> None:
+        self.filepath = Path(filepath)
+        self._file: BinaryIO | None = None
+
+    def export(self, request: dict[str, Any]) -> None:
+        """Write an export request to the file, opening it on first call."""
+        if self._file is None:
+            self.filepath.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.filepath.open("wb")
+        self._file.write(json.dumps(request, separators=(",", ":")).encode() + b"\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        """Close the file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def encode_traces_request(request: dict[str, Any]) -> bytes:
+    """Encode an OTLP export traces request using protobuf.
+
+    Only the fields produced by this module are encoded, which avoids depending on
+    the `opentelemetry-proto` and `protobuf` packages.
+    """
+    return b"".join(
+        _message(1, _encode_resource_spans(resource_spans))
+        for resource_spans in request["resourceSpans"]
+    )
+
+
+def _encode_resource_spans(resource_spans: dict[str, Any]) -> bytes:
+    return _message(
+        1, _encode_attributes(1, resource_spans["resource"]["attributes"])
+    ) + b"".join(
+        _message(
+            2,
+            _message(
+                1,
+                _string(1, scope_spans["scope"]["name"])
+                + _string(2, scope_spans["scope"]["version"]),
+            )
+            + b"".join(
+                _message(2, _encode_span(span)) for span in scope_spans["spans"]
+            ),
+        )
+        for scope_spans in resource_spans["scopeSpans"]
+    )
+
+
+def _encode_span(span: dict[str, Any]) -> bytes:
+    data = (
+        _message(1, bytes.fromhex(span["traceId"]))
+        + _message(2, bytes.fromhex(span["spanId"]))
+        + (
+            _message(4, bytes.fromhex(span["parentSpanId"]))
+            if "parentSpanId" in span
+            else b""
+        )
+        + _string(5, span["name"])
+        + _varint_field(6, span["kind"])
+        + _fixed64_field(7, int(span["startTimeUnixNano"]))
+        + _fixed64_field(8, int(span["endTimeUnixNano"]))
+        + _encode_attributes(9, span.get("attributes", []))
+    )
+    if status := span.get("status"):
+        data += _message(
+            15,
+            (_string(2, status["message"]) if "message" in status else b"")
+            + _varint_field(3, status["code"]),
+        )
+    return data
+
+
+def _encode_attributes(number: int, attributes: list[dict[str, Any]]) -> bytes:
+    return b"".join(
+        _message(
+            number,
+            _string(1, attribute["key"])
+            + _message(2, _encode_any_value(attribute["value"])),
+        )
+        for attribute in attributes
+    )
+
+
+def _encode_any_value(value: dict[str, Any]) -> bytes:
+    if "stringValue" in value:
+        return _string(1, value["stringValue"])
+    if "boolValue" in value:
+        return _varint_field(2, int(value["boolValue"]))
+    if "intValue" in value:
+        # Negative integers are encoded as 64 bits two's complement
+        return _varint_field(3, int(value["intValue"]) & 0xFFFFFFFFFFFFFFFF)
+    if "doubleValue" in value:
+        return _key(4, 1) + struct.pack("<d", value["doubleValue"])
+    return _message(
+        5,
+        b"".join(
+            _message(1, _encode_any_value(item))
+            for item in value["arrayValue"]["values"]
+        ),
+    )
+
+
+def _varint(value: int) -> bytes:
+    data = bytearray()
+    while value > 0x7F:  # noqa: PLR2004
+        data.append((value & 0x7F) | 0x80)
+        value >>= 7
+    data.append(value)
+    return bytes(data)
+
+
+def _key(number: int, wire_type: int) -> bytes:
+    return _varint(number << 3 | wire_type)
+
+
+def _varint_field(number: int, value: int) -> bytes:
+    return _key(number, 0) + _varint(value)
+
+
+def _fixed64_field(number: int, value: int) -> bytes:
+    return _key(number, 1) + struct.pack("<Q", value)
+
+
+def _message(number: int, data: bytes) -> bytes:
+    return _key(number, 2) + _varint(len(data)) + data
+
+
+def _string(number: int, value: str) -> bytes:
+    return _message(number, value.encode())
+
+
+class OTLPHTTPExporter:
+    """Export OTLP traces requests to an OTLP/HTTP endpoint.
+
+    Requests are encoded as JSON by default, or using protobuf when `protobuf` is
+    True. The URL is the full URL of the traces endpoint, such as
+    `http://localhost:4318/v1/traces`.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        protobuf: bool = False,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        parsed_url = urlparse(url)
+        host = parsed_url.hostname
+        if not host:
+            msg = f"Invalid OTLP endpoint URL: {url}"
+            raise ValueError(msg)
+        self.url = url
+        self.parsed_url = parsed_url
+        self.host = host
+        self.protobuf = protobuf
+        self.headers = headers or {}
+        self.headers.setdefault("User-Agent", "pytest-broadcaster")
+        self.content_type = "application/x-protobuf" if protobuf else "application/json"
+
+    def export(self, request: dict[str, Any]) -> None:
+        """Send an export request to the endpoint."""
+        if self.protobuf:
+            data = encode_traces_request(request)
+        else:
+            data = json.dumps(request, separators=(",", ":")).encode()
+        path = self.parsed_url.path or "/"
+        if self.parsed_url.query:
+            path = f"{path}?{self.parsed_url.query}"
+        connection: HTTPConnection | HTTPSConnection
+        if self.parsed_url.scheme == "https":
+            connection = HTTPSConnection(host=self.host, port=self.parsed_url.port)
+        else:
+            connection = HTTPConnection(host=self.host, port=self.parsed_url.port)
+        try:
+            connection.request(
+                method="POST",
+                url=path,
+                body=data,
+                headers={
+                    "Content-Type": self.content_type,
+                    "Content-Length": str(len(data)),
+                    **self.headers,
+                },
+            )
+            response = connection.getresponse()
+            response.read()
+        finally:
+            connection.close()
+        if response.status != http.HTTPStatus.OK:
+            details = f"{response.status} {response.reason}"
+            msg = f"Failed to export spans to {self.url}: {details}"
+            raise RuntimeError(msg)
+
+    def close(self) -> None:
+        """Nothing to close, a connection is opened for each request."""
@@ -0,0 +1,370 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+import uuid
+import warnings
+from typing import TYPE_CHECKING, Any, Union
+
+from pytest_broadcaster.interfaces import Destination
+from pytest_broadcaster.models.outcome import Outcome
+from pytest_broadcaster.models.session_end import SessionEnd
+from pytest_broadcaster.models.session_start import SessionStart
+from pytest_broadcaster.models.test_case_call import TestCaseCall
+from pytest_broadcaster.models.test_case_end import TestCaseEnd
+from pytest_broadcaster.models.test_case_report_event import TestCaseReportEvent
+from pytest_broadcaster.models.test_case_setup import TestCaseSetup
+from pytest_broadcaster.models.test_case_teardown import TestCaseTeardown
+
+from ._fields import parse_timestamp_ns
+from ._otlp import (
+    STATUS_CODE_ERROR,
+    OTLPFileExporter,
+    OTLPHTTPExporter,
+    make_resource,
+    make_span,
+    make_traces_request,
+    new_span_id,
+    new_trace_id,
+)
+
+if TYPE_CHECKING:
+    from pytest_broadcaster._internal._codecs import EncodedPayload
+    from pytest_broadcaster.models.session_event import SessionEvent
+    from pytest_broadcaster.models.session_result import SessionResult
+
+    Step = Union[TestCaseSetup, TestCaseCall, TestCaseTeardown]
+
+
+BATCH_SIZE = 512
+"""Default maximum number of spans exported at once."""
+
+QUEUE_SIZE = 2048
+"""Default maximum number of spans waiting to be exported."""
+
+EXPORT_DELAY = 5.0
+"""Default maximum delay in seconds before spans waiting to be exported are exported."""
+
+_STEP_NAMES: dict[type, str] = {
+    TestCaseSetup: "setup",
+    TestCaseCall: "call",
+    TestCaseTeardown: "teardown",
+}
+
+
+class BatchSpanProcessor:
+    """Export spans in batches within a background thread.
+
+    Spans are put in a bounded queue, and exported once `batch_size` spans are
+    waiting, or `export_delay` seconds after the previous export. Spans are dropped
+    when the queue is full, so that the test session never waits for the exporter.
+
+    A failed export does not prevent next exports, and a single warning reporting
+    dropped spans and failed exports is emitted on shutdown.
+    """
+
+    def __init__(
+        self,
+        exporter: OTLPFileExporter | OTLPHTTPExporter,
+        *,
+        batch_size: int = BATCH_SIZE,
+        queue_size: int = QUEUE_SIZE,
+        export_delay: float = EXPORT_DELAY,
+    ) -> None:
+        if batch_size <= 0:
+            msg = f"Batch size must be positive, got {batch_size}"
+            raise ValueError(msg)
+        if queue_size < batch_size:
+            msg = f"Queue size must be at least the batch size, got {queue_size}"
+            raise ValueError(msg)
+        self.exporter = exporter
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.export_delay = export_delay
+        self.resource = make_resource()
+        self.dropped_spans = 0
+        self.failed_exports = 0
+        self._error: Exception | None = None
+        self._batch: list[dict[str, Any]] = []
+        self._queue: queue.Queue[dict[str, Any] | None] = queue.Queue(
+            maxsize=queue_size
+        )
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start the thread exporting spans."""
+        self._thread = threading.Thread(
+            target=self._run, name="pytest-broadcaster-otlp", daemon=True
+        )
+        self._thread.start()
+
+    def add(self, span: dict[str, Any]) -> None:
+        """Add a span to export."""
+        # Export synchronously when the processor was not started
+        if self._thread is None:
+            self._batch.append(span)
+            if len(self._batch) >= self.batch_size:
+                self._export()
+            return
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped_spans += 1
+
+    def shutdown(self) -> None:
+        """Export all spans waiting to be exported, and close the exporter."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        try:
+            if self._batch:
+                self._export()
+        finally:
+            self.exporter.close()
+        if self.dropped_spans or self.failed_exports:
+            warnings.warn(
+                f"Dropped {self.dropped_spans} spans and failed to export "
+                f"{self.failed_exports} batches of spans - {self._error!r}",
+                stacklevel=2,
+            )
+
+    def _run(self) -> None:
+        deadline = time.monotonic() + self.export_delay
+        while True:
+            try:
+                span = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                span = {}
+            if span is None:
+                return
+            if span:
+                self._batch.append(span)
+            if len(self._batch) >= self.batch_size or time.monotonic() >= deadline:
+                if self._batch:
+                    self._export()
+                deadline = time.monotonic() + self.export_delay
+
+    def _export(self) -> None:
+        batch, self._batch = self._batch, []
+        try:
+            self.exporter.export(make_traces_request(batch, self.resource))
+        except Exception as e:  # noqa: BLE001
+            self.failed_exports += 1
+            if self._error is None:
+                self._error = e
+
+
+class _ModuleSpan:
+    """A span covering the test cases of a module, ended once another module starts."""
+
+    __slots__ = ("end", "name", "span_id", "start")
+
+    def __init__(self, name: str, start: int, end: int) -> None:
+        self.name = name
+        self.span_id = new_span_id()
+        self.start = start
+        self.end = end
+
+
+class OTLPTraces(Destination):
+    """Export test cases as OpenTelemetry spans.
+
+    Spans form a tree: the session span is the parent of a span per test module,
+    which is the parent of a span per test case, which is the parent of a span per
+    step (`setup`, `call` and `teardown`). Spans are built from the timestamps and
+    outcomes found in events, and spans of failed test cases and steps have an error
+    status. The trace ID is the session ID, so that traces can be found from events.
+
+    The endpoint is either the URL of an OTLP/HTTP traces endpoint, such as
+    `http://localhost:4318/v1/traces`, where spans are sent encoded as JSON or
+    protobuf, or the path of a local file, where spans are written encoded as JSON.
+
+    A module span is ended when a test case of another module starts, so a module
+    whose test cases are not run consecutively has several spans.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        endpoint: str,
+        *,
+        protobuf: bool = False,
+        headers: dict[str, str] | None = None,
+        batch_size: int = BATCH_SIZE,
+        queue_size: int = QUEUE_SIZE,
+        export_delay: float = EXPORT_DELAY,
+    ) -> None:
+        exporter: OTLPFileExporter | OTLPHTTPExporter
+        if endpoint.startswith(("http://", "https://")):
+            exporter = OTLPHTTPExporter(endpoint, protobuf=protobuf, headers=headers)
+        elif protobuf:
+            msg = "Protobuf encoding is only supported by OTLP/HTTP endpoints"
+            raise ValueError(msg)
+        else:
+            exporter = OTLPFileExporter(endpoint)
+        self.endpoint = endpoint
+        self.processor = BatchSpanProcessor(
+            exporter,
+            batch_size=batch_size,
+            queue_size=queue_size,
+            export_delay=export_delay,
+        )
+        self.trace_id = new_trace_id()
+        self.session_span_id = new_span_id()
+        self._session_start: SessionStart | None = None
+        self._module: _ModuleSpan | None = None
+        self._tests: dict[str, str] = {}
+
+    def open(self) -> None:
+        self.processor.start()
+
+    def close(self) -> None:
+        self._end_module()
+        self.processor.shutdown()
+
+    def write_event(self, event: SessionEvent) -> None:
+        if isinstance(event, (TestCaseSetup, TestCaseCall, TestCaseTeardown)):
+            self._add_step(event)
+        elif isinstance(event, TestCaseEnd):
+            self._add_test(event)
+        elif isinstance(event, TestCaseReportEvent):
+            for step in (event.setup, event.call, event.teardown):
+                if step is not None:
+                    self._add_step(step)
+            self._add_test(event.finished)
+        elif isinstance(event, SessionStart):
+            self._start_session(event)
+        elif isinstance(event, SessionEnd):
+            self._end_session(event)
+
+    def write_result(self, result: SessionResult) -> None:
+        # Spans are built from events only
+        pass
+
+    def write_encoded_event(self, payload: EncodedPayload[SessionEvent]) -> None:
+        self.write_event(payload.value)
+
+    def summary(self) -> str | None:
+        return f"exported test spans to: {self.endpoint}"
+
+    def _start_session(self, event: SessionStart) -> None:
+        self._session_start = event
+        try:
+            self.trace_id = uuid.UUID(event.session_id).hex
+        except ValueError:
+            self.trace_id = new_trace_id()
+        project = event.project
+        self.processor.resource = make_resource(
+            {
+                "service.name": project.name if project else "pytest",
+                **(
+                    {"service.version": project.version}
+                    if project and project.version
+                    else {}
+                ),
+                "telemetry.sdk.name": "pytest-broadcaster",
+                "telemetry.sdk.version": event.plugin_version,
+                "pytest.version": event.pytest_version,
+            }
+        )
+
+    def _end_session(self, event: SessionEnd) -> None:
+        self._end_module()
+        end = parse_timestamp_ns(event.timestamp)
+        start = (
+            end
+            if self._session_start is None
+            else parse_timestamp_ns(self._session_start.timestamp)
+        )
+        self.processor.add(
+            make_span(
+                self.trace_id,
+                self.session_span_id,
+                None,
+                "pytest session",
+                start,
+                end,
+                {
+                    "session_id": event.session_id,
+                    "pytest.exit_status": event.exit_status,
+                },
+                STATUS_CODE_ERROR if event.exit_status else 0,
+            )
+        )
+
+    def _add_step(self, step: Step) -> None:
+        start = parse_timestamp_ns(step.start_timestamp)
+        stop = parse_timestamp_ns(step.stop_timestamp)
+        test_span_id = self._get_test_span_id(step.node_id, start, stop)
+        failed = step.outcome == Outcome.failed
+        self.processor.add(
+            make_span(
+                self.trace_id,
+                new_span_id(),
+                test_span_id,
+                _STEP_NAMES[type(step)],
+                start,
+                stop,
+                {"pytest.outcome": step.outcome.value},
+                STATUS_CODE_ERROR if failed else 0,
+                str(step.error.message) if failed and step.error else None,
+            )
+        )
+
+    def _add_test(self, event: TestCaseEnd) -> None:
+        start = parse_timestamp_ns(event.start_timestamp)
+        stop = parse_timestamp_ns(event.stop_timestamp)
+        span_id = self._get_test_span_id(event.node_id, start, stop)
+        del self._tests[event.node_id]
+        module = self._module
+        self.processor.add(
+            make_span(
+                self.trace_id,
+                span_id,
+                module.span_id if module else self.session_span_id,
+                event.node_id.split("::", 1)[-1],
+                start,
+                stop,
+                {
+                    "test.case.name": event.node_id,
+                    "pytest.outcome": event.outcome.value,
+                },
+                STATUS_CODE_ERROR if event.outcome == Outcome.failed else 0,
+            )
+        )
+
+    def _get_test_span_id(self, node_id: str, start: int, stop: int) -> str:
+        """Return the span ID of a test case, and extend its module span."""
+        module_name = node_id.split("::", 1)[0]
+        module = self._module
+        if module is None or module.name != module_name:
+            self._end_module()
+            module = self._module = _ModuleSpan(module_name, start, stop)
+        module.start = min(module.start, start)
+        module.end = max(module.end, stop)
+        span_id = self._tests.get(node_id)
+        if span_id is None:
+            span_id = self._tests[node_id] = new_span_id()
+        return span_id
+
+    def _end_module(self) -> None:
+        module, self._module = self._module, None
+        if module is None:
+            return
+        self.processor.add(
+            make_span(
+                self.trace_id,
+                module.span_id,
+                self.session_span_id,
+                module.name,
+                module.start,
+                module.end,
+                {"test.suite.name": module.name},
+            )
+        )
+
+
+if TYPE_CHECKING:
+    # Make sure the class implements the Destination interface
+    OTLPTraces("fake.jsonl")
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import queue
+import threading
+import warnings
+from typing import TYPE_CHECKING, Any, Callable
+
+from pytest_broadcaster.interfaces import Destination
+
+from ._constants import QUEUE_SIZE
+
+if TYPE_CHECKING:
+    from pytest_broadcaster._internal._codecs import EncodedPayload
+    from pytest_broadcaster.models.session_event import SessionEvent
+    from pytest_broadcaster.models.session_result import SessionResult
+
+
+class ThreadedDestination(Destination):
+    """A destination writing to another destination within a dedicated thread.
+
+    Events and results are put in a bounded queue and written in order by a worker
+    thread, so that the test session only waits for destinations when their queue is
+    full. When several destinations are wrapped, each one gets its own queue and
+    worker, so that a slow destination does not delay the others.
+
+    When `drop` is True, events are dropped instead of waiting when the queue is
+    full. The session result is never dropped.
+
+    Failures are isolated within the worker: a failed write does not prevent next
+    writes, and a single warning reporting the number of failed writes and the first
+    error is emitted when the destination is closed.
+    """
+
+    def __init__(
+        self,
+        destination: Destination,
+        *,
+        queue_size: int = QUEUE_SIZE,
+        drop: bool = False,
+    ) -> None:
+        if queue_size <= 0:
+            msg = f"Queue size must be positive, got {queue_size}"
+            raise ValueError(msg)
+        self.destination = destination
+        self.queue_size = queue_size
+        self.drop = drop
+        self.dropped_events = 0
+        self.failed_writes = 0
+        self._error: Exception | None = None
+        self._queue: queue.Queue[tuple[Callable[[Any], None], object] | None] = (
+            queue.Queue(maxsize=queue_size)
+        )
+        self._thread: threading.Thread | None = None
+
+    @property
+    def queue_depth(self) -> int:
+        """The approximate number of events and results waiting to be written."""
+        return self._queue.qsize()
+
+    def open(self) -> None:
+        self.destination.open()
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"pytest-broadcaster-{type(self.destination).__name__}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        self.destination.close()
+        if self.failed_writes:
+            warnings.warn(
+                f"Failed to write {self.failed_writes} events or results to "
+                f"destination: {self.destination} - {self._error!r}",
+                stacklevel=2,
+            )
+
+    def write_event(self, event: SessionEvent) -> None:
+        self._write_event(self.destination.write_event, event)
+
+    def _write_event(self, write: Callable[[Any], None], data: object) -> None:
+        # Write synchronously when the destination could not be opened
+        if self._thread is None:
+            write(data)
+            return
+        if not self.drop:
+            self._queue.put((write, data))
+            return
+        try:
+            self._queue.put_nowait((write, data))
+        except queue.Full:
+            self.dropped_events += 1
+
+    def write_result(self, result: SessionResult) -> None:
+        if self._thread is None:
+            self.destination.write_result(result)
+            return
+        self._queue.put((self.destination.write_result, result))
+
+    def write_encoded_event(self, payload: EncodedPayload[SessionEvent]) -> None:
+        self._write_event(self.destination.write_encoded_event, payload)
+
+    def write_encoded_result(self, payload: EncodedPayload[SessionResult]) -> None:
+        if self._thread is None:
+            self.destination.write_encoded_result(payload)
+            return
+        self._queue.put((self.destination.write_encoded_result, payload))
+
+    def summary(self) -> str | None:
+        return self.destination.summary()
+
+    def __repr__(self) -> str:
+        return repr(self.destination)
+
+    def _run(self) -> None:
+        while (item := self._queue.get()) is not None:
+            write, data = item
+            try:
+                write(data)
+            except Exception as e:  # noqa: BLE001
+                self.failed_writes += 1
+                if self._error is None:
+                    self._error = e
+
+
+if TYPE_CHECKING:
+    # Make sure the class implements the Destination interface
+    from ._json_files import JSONLinesFile
+
+    ThreadedDestination(JSONLinesFile("fake.jsonl"))
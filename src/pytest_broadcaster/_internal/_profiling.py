@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Any, Callable, Literal, TypeVar
+
+from pytest_broadcaster.interfaces import (
+    CoalescingReporter,
+    Codec,
+    Destination,
+    Reporter,
+)
+from pytest_broadcaster.models.plugin_profile import PluginProfile, Timing
+
+from ._codecs import EncodedPayload
+
+if TYPE_CHECKING:
+    import warnings
+
+    import pytest
+
+    from pytest_broadcaster.models.collect_report import CollectReport
+    from pytest_broadcaster.models.error_message import ErrorMessage
+    from pytest_broadcaster.models.session_end import SessionEnd
+    from pytest_broadcaster.models.session_event import SessionEvent
+    from pytest_broadcaster.models.session_result import SessionResult
+    from pytest_broadcaster.models.session_start import SessionStart
+    from pytest_broadcaster.models.test_case_call import TestCaseCall
+    from pytest_broadcaster.models.test_case_end import TestCaseEnd
+    from pytest_broadcaster.models.test_case_report_event import TestCaseReportEvent
+    from pytest_broadcaster.models.test_case_setup import TestCaseSetup
+    from pytest_broadcaster.models.test_case_teardown import TestCaseTeardown
+    from pytest_broadcaster.models.warning_message import WarningMessage
+
+
+T = TypeVar("T")
+
+_SUB_BUCKET_BITS = 3
+_SUB_BUCKETS = 1 << _SUB_BUCKET_BITS
+
+
+class Histogram:
+    """A log-linear histogram of durations in nanoseconds.
+
+    Each power of two is split into 8 linear buckets, so that percentiles are
+    reported with a relative error below 12.5% while using a constant amount of
+    memory. Percentiles are reported as the upper bound of their bucket, capped to
+    the maximum recorded duration.
+    """
+
+    __slots__ = ("buckets", "count", "max", "total")
+
+    def __init__(self) -> None:
+        self.buckets: dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, duration: int) -> None:
+        """Record a duration in nanoseconds."""
+        self.count += 1
+        self.total += duration
+        self.max = max(duration, self.max)
+        if duration < _SUB_BUCKETS:
+            key = duration
+        else:
+            shift = duration.bit_length() - _SUB_BUCKET_BITS - 1
+            key = ((shift + 1) << _SUB_BUCKET_BITS) | (
+                (duration >> shift) & (_SUB_BUCKETS - 1)
+            )
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+
+    def percentile(self, percent: float) -> int:
+        """Return the duration below which `percent` percent of durations fall."""
+        if not self.count:
+            return 0
+        rank = max(1, round(self.count * percent / 100))
+        seen = 0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen >= rank:
+                return min(_upper_bound(key), self.max)
+        return self.max
+
+    def explicit_buckets(self) -> tuple[list[int], list[int]]:
+        """Return the upper bounds of non-empty buckets, and the count of each bucket.
+
+        Counts hold one more item than bounds, for durations above the last bound,
+        which is always zero, as expected by OpenTelemetry explicit bucket histograms.
+        """
+        keys = sorted(self.buckets)
+        return (
+            [_upper_bound(key) for key in keys],
+            [self.buckets[key] for key in keys] + [0],
+        )
+
+
+def _upper_bound(key: int) -> int:
+    """Return the largest duration falling within a bucket."""
+    if key < _SUB_BUCKETS:
+        return key
+    shift = (key >> _SUB_BUCKET_BITS) - 1
+    return ((_SUB_BUCKETS | (key & (_SUB_BUCKETS - 1))) + 1 << shift) - 1
+
+
+class Profiler:
+    """Record the time spent by the plugin in named operations."""
+
+    def __init__(self) -> None:
+        self.histograms: dict[str, Histogram] = {}
+
+    def record(self, name: str, duration: int) -> None:
+        """Record the duration of an operation in nanoseconds."""
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.record(duration)
+
+    def call(self, name: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:  # noqa: ANN401
+        """Call a function and record the time spent in it."""
+        start = time.perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.record(name, time.perf_counter_ns() - start)
+
+    def make_timings(self) -> list[Timing]:
+        """Return the timings recorded so far, in order of first appearance."""
+        return [
+            Timing(
+                name=name,
+                count=histogram.count,
+                total=histogram.total,
+                p50=histogram.percentile(50),
+                p99=histogram.percentile(99),
+                max=histogram.max,
+            )
+            for name, histogram in self.histograms.items()
+        ]
+
+    def make_plugin_profile(self, session_id: str) -> PluginProfile:
+        """Return a plugin profile event holding the timings recorded so far."""
+        return PluginProfile(session_id=session_id, timings=self.make_timings())
+
+    def summary_lines(self) -> list[str]:
+        """Return the timings formatted as a table, one line per operation."""
+        timings = self.make_timings()
+        width = max((len(timing.name) for timing in timings), default=0)
+        lines = [
+            f"{'operation':<{width}} {'count':>8} {'p50':>10} {'p99':>10} {'total':>10}"
+        ]
+        lines.extend(
+            f"{timing.name:<{width}} {timing.count:>8} {_format_ns(timing.p50):>10} "
+            f"{_format_ns(timing.p99):>10} {_format_ns(timing.total):>10}"
+            for timing in timings
+        )
+        return lines
+
+
+def _format_ns(duration: int) -> str:
+    """Format a duration in nanoseconds using a human readable unit."""
+    for unit, scale in (("s", 1_000_000_000), ("ms", 1_000_000), ("us", 1_000)):
+        if duration >= scale:
+            return f"{duration / scale:.1f}{unit}"
+    return f"{duration}ns"
+
+
+class ProfiledReporter(CoalescingReporter):
+    """A reporter recording the time spent in each method of another reporter."""
+
+    def __init__(self, reporter: Reporter, profiler: Profiler) -> None:
+        self.reporter = reporter
+        self.profiler = profiler
+
+    def make_session_result(self) -> SessionResult | None:
+        return self.profiler.call(
+            "reporter.make_session_result", self.reporter.make_session_result
+        )
+
+    def make_session_start(self) -> SessionStart:
+        return self.profiler.call(
+            "reporter.make_session_start", self.reporter.make_session_start
+        )
+
+    def make_session_end(self, exit_status: int) -> SessionEnd:
+        return self.profiler.call(
+            "reporter.make_session_end", self.reporter.make_session_end, exit_status
+        )
+
+    def make_warning_message(
+        self,
+        warning_message: warnings.WarningMessage,
+        when: Literal["config", "collect", "runtest"],
+        nodeid: str,
+    ) -> WarningMessage:
+        return self.profiler.call(
+            "reporter.make_warning_message",
+            self.reporter.make_warning_message,
+            warning_message=warning_message,
+            when=when,
+            nodeid=nodeid,
+        )
+
+    def make_error_message(
+        self, report: pytest.CollectReport, call: pytest.CallInfo[Any]
+    ) -> ErrorMessage:
+        return self.profiler.call(
+            "reporter.make_error_message",
+            self.reporter.make_error_message,
+            report,
+            call,
+        )
+
+    def make_collect_report(self, report: pytest.CollectReport) -> CollectReport:
+        return self.profiler.call(
+            "reporter.make_collect_report", self.reporter.make_collect_report, report
+        )
+
+    def make_test_case_step(
+        self, report: pytest.TestReport
+    ) -> TestCaseCall | TestCaseSetup | TestCaseTeardown:
+        return self.profiler.call(
+            "reporter.make_test_case_step", self.reporter.make_test_case_step, report
+        )
+
+    def make_test_case_end(self, node_id: str) -> TestCaseEnd:
+        return self.profiler.call(
+            "reporter.make_test_case_end", self.reporter.make_test_case_end, node_id
+        )
+
+    def make_test_case_report(self, node_id: str) -> TestCaseReportEvent:
+        reporter = self.reporter
+        assert isinstance(reporter, CoalescingReporter), (
+            "reporter does not support coalesced events, "
+            "this is a bug in pytest-broadcaster plugin"
+        )
+        return self.profiler.call(
+            "reporter.make_test_case_report", reporter.make_test_case_report, node_id
+        )
+
+
+class ProfiledPayload(EncodedPayload[T]):
+    """A payload recording the time spent encoding another payload.
+
+    Encoded payloads are shared with the other payload, so that the time is only
+    recorded when the payload is not already encoded using the codec.
+    """
+
+    __slots__ = ("payload", "profile_name", "profiler")
+
+    def __init__(
+        self, payload: EncodedPayload[T], profiler: Profiler, name: str
+    ) -> None:
+        super().__init__(payload.value)
+        self.payload = payload
+        self.profiler = profiler
+        self.profile_name = name
+
+    @property
+    def data(self) -> dict[str, Any]:
+        return self.payload.data
+
+    def encode(self, codec: Codec) -> bytes:
+        encoded = self.payload.encoded(codec)
+        if encoded is None:
+            encoded = self.profiler.call(self.profile_name, self.payload.encode, codec)
+        return encoded
+
+    def encoded(self, codec: Codec) -> bytes | None:
+        return self.payload.encoded(codec)
+
+
+class ProfiledDestination(Destination):
+    """A destination recording the time spent writing to another destination.
+
+    Shared payloads are handed over to the destination wrapped in profiled payloads,
+    so that the time spent encoding them is recorded separately, without modifying
+    the destination.
+    """
+
+    def __init__(self, destination: Destination, profiler: Profiler, name: str) -> None:
+        self.destination = destination
+        self.profiler = profiler
+        self.name = name
+
+    def write_event(self, event: SessionEvent) -> None:
+        self.profiler.call(
+            f"{self.name}.write_event", self.destination.write_event, event
+        )
+
+    def write_result(self, result: SessionResult) -> None:
+        self.profiler.call(
+            f"{self.name}.write_result", self.destination.write_result, result
+        )
+
+    def write_encoded_event(self, payload: EncodedPayload[SessionEvent]) -> None:
+        self.profiler.call(
+            f"{self.name}.write_event",
+            self.destination.write_encoded_event,
+            ProfiledPayload(payload, self.profiler, f"{self.name}.encode"),
+        )
+
+    def write_encoded_result(self, payload: EncodedPayload[SessionResult]) -> None:
+        self.profiler.call(
+            f"{self.name}.write_result",
+            self.destination.write_encoded_result,
+            ProfiledPayload(payload, self.profiler, f"{self.name}.encode"),
+        )
+
+    def summary(self) -> str | None:
+        return self.destination.summary()
+
+    def open(self) -> None:
+        self.destination.open()
+
+    def close(self) -> None:
+        self.destination.close()
+
+    def __repr__(self) -> str:
+        return repr(self.destination)
+
+
+if TYPE_CHECKING:
+    # Make sure the classes implement the interfaces
+    from ._reporter import DefaultReporter
+
+    ProfiledReporter(DefaultReporter(), Profiler())
@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pytest_broadcaster.interfaces import Destination
+from pytest_broadcaster.models.error_message import ErrorMessage
+from pytest_broadcaster.models.test_case_call import TestCaseCall
+from pytest_broadcaster.models.test_case_end import TestCaseEnd
+from pytest_broadcaster.models.test_case_report_event import TestCaseReportEvent
+from pytest_broadcaster.models.test_case_setup import TestCaseSetup
+from pytest_broadcaster.models.test_case_teardown import TestCaseTeardown
+from pytest_broadcaster.models.warning_message import WarningMessage
+
+from ._files import atomic_writer
+from ._filters import FilteredDestination
+
+if TYPE_CHECKING:
+    from pytest_broadcaster._internal._codecs import EncodedPayload
+    from pytest_broadcaster.models.session_event import SessionEvent
+    from pytest_broadcaster.models.session_result import SessionResult
+
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+"""Upper bounds of the step duration histogram buckets, in seconds."""
+
+TEXTFILE_INTERVAL = 15.0
+"""Default minimum interval in seconds between two writes of the metrics file."""
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+"""Content type of the Prometheus text exposition format."""
+
+_STEP_NAMES: dict[type, str] = {
+    TestCaseSetup: "setup",
+    TestCaseCall: "call",
+    TestCaseTeardown: "teardown",
+}
+
+
+class PrometheusMetrics(Destination):
+    """Expose live metrics derived from session events in Prometheus text format.
+
+    Metrics are served over HTTP on `/metrics` when `port` is given (use 0 to pick
+    a free port), and written to `textfile` for the node exporter textfile
+    collector when given. The file is replaced atomically at most once every
+    `interval` seconds, and once more when the session ends.
+
+    Metrics are updated in constant time for each event, and only formatted when
+    scraped or written:
+
+    - `pytest_broadcaster_events_total`: events by type.
+    - `pytest_broadcaster_tests_total`: finished test cases by outcome.
+    - `pytest_broadcaster_step_duration_seconds`: a histogram of step durations.
+    - `pytest_broadcaster_warnings_total`: warnings.
+    - `pytest_broadcaster_errors_total`: errors, such as collection errors.
+    - `pytest_broadcaster_events_dropped_total`: events dropped by other
+      destinations, such as parallel destinations with a full queue, once they are
+      watched using `watch_destinations`.
+    """
+
+    def __init__(
+        self,
+        *,
+        port: int | None = None,
+        host: str = "127.0.0.1",
+        textfile: str | None = None,
+        interval: float = TEXTFILE_INTERVAL,
+    ) -> None:
+        if port is None and textfile is None:
+            msg = "Either a port or a textfile is required to expose metrics"
+            raise ValueError(msg)
+        self.port = port
+        self.host = host
+        self.textfile = Path(textfile) if textfile else None
+        self.interval = interval
+        self.events: dict[str, int] = {}
+        self.tests: dict[str, int] = {}
+        self.steps: dict[str, _Histogram] = {}
+        self.warnings = 0
+        self.errors = 0
+        self._watched: list[Destination] = []
+        self._lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+        self._next_write = 0.0
+
+    @property
+    def url(self) -> str | None:
+        """The URL of the metrics endpoint, once opened."""
+        if self._server is None:
+            return None
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}/metrics"
+
+    def watch_destinations(self, destinations: list[Destination]) -> None:
+        """Report the events dropped by destinations, or by destinations they wrap."""
+        self._watched.extend(destinations)
+
+    def open(self) -> None:
+        if self.port is None:
+            return
+        self._server = ThreadingHTTPServer((self.host, self.port), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            name="pytest-broadcaster-metrics",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        if self._server is not None and self._thread is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = self._thread = None
+        if self.textfile is not None:
+            self._write_textfile()
+
+    def write_event(self, event: SessionEvent) -> None:
+        with self._lock:
+            self.events[event.event] = self.events.get(event.event, 0) + 1
+            if isinstance(event, (TestCaseSetup, TestCaseCall, TestCaseTeardown)):
+                self._add_step(event)
+            elif isinstance(event, TestCaseEnd):
+                self._add_test(event)
+            elif isinstance(event, TestCaseReportEvent):
+                for step in (event.setup, event.call, event.teardown):
+                    if step is not None:
+                        self._add_step(step)
+                self._add_test(event.finished)
+            elif isinstance(event, WarningMessage):
+                self.warnings += 1
+            elif isinstance(event, ErrorMessage):
+                self.errors += 1
+        if self.textfile is not None and time.monotonic() >= self._next_write:
+            self._write_textfile()
+
+    def write_result(self, result: SessionResult) -> None:
+        # Metrics are derived from events only
+        pass
+
+    def write_encoded_event(self, payload: EncodedPayload[SessionEvent]) -> None:
+        self.write_event(payload.value)
+
+    def summary(self) -> str | None:
+        if self.textfile is not None:
+            return f"generated metrics file: {self.textfile.as_posix()}"
+        return f"served metrics on: {self.url}"
+
+    def render(self) -> str:
+        """Return the metrics formatted using the Prometheus text format."""
+        with self._lock:
+            events = dict(self.events)
+            tests = dict(self.tests)
+            steps = {name: histogram.copy() for name, histogram in self.steps.items()}
+            warnings, errors = self.warnings, self.errors
+        dropped = self._dropped_events()
+        lines: list[str] = []
+        _add_metric(
+            lines,
+            "pytest_broadcaster_events_total",
+            "counter",
+            "Number of session events, by type.",
+            [(f'{{event="{name}"}}', count) for name, count in events.items()],
+        )
+        _add_metric(
+            lines,
+            "pytest_broadcaster_tests_total",
+            "counter",
+            "Number of finished test cases, by outcome.",
+            [(f'{{outcome="{name}"}}', count) for name, count in tests.items()],
+        )
+        lines.append(
+            "# HELP pytest_broadcaster_step_duration_seconds "
+            "Duration of test case steps, in seconds."
+        )
+        lines.append("# TYPE pytest_broadcaster_step_duration_seconds histogram")
+        for name, histogram in steps.items():
+            lines.extend(
+                histogram.lines("pytest_broadcaster_step_duration_seconds", name)
+            )
+        _add_metric(
+            lines,
+            "pytest_broadcaster_warnings_total",
+            "counter",
+            "Number of warnings.",
+            [("", warnings)],
+        )
+        _add_metric(
+            lines,
+            "pytest_broadcaster_errors_total",
+            "counter",
+            "Number of errors, such as collection errors.",
+            [("", errors)],
+        )
+        _add_metric(
+            lines,
+            "pytest_broadcaster_events_dropped_total",
+            "counter",
+            "Number of events dropped by destinations.",
+            [(f'{{destination="{name}"}}', count) for name, count in dropped.items()],
+        )
+        return "\n".join(lines) + "\n"
+
+    def _add_step(self, step: TestCaseSetup | TestCaseCall | TestCaseTeardown) -> None:
+        name = _STEP_NAMES[type(step)]
+        histogram = self.steps.get(name)
+        if histogram is None:
+            histogram = self.steps[name] = _Histogram()
+        histogram.observe(step.duration)
+
+    def _add_test(self, event: TestCaseEnd) -> None:
+        outcome = event.outcome.value
+        self.tests[outcome] = self.tests.get(outcome, 0) + 1
+
+    def _dropped_events(self) -> dict[str, int]:
+        dropped: dict[str, int] = {}
+        for destination in self._watched:
+            name = repr(destination)
+            current: Destination | None = destination
+            while current is not None:
+                # Events rejected by filters are not lost
+                if not isinstance(current, FilteredDestination):
+                    count = getattr(current, "dropped_events", 0)
+                    if count:
+                        dropped[name] = dropped.get(name, 0) + count
+                current = getattr(current, "destination", None)
+        return dropped
+
+    def _write_textfile(self) -> None:
+        assert self.textfile, "textfile expected to be set"
+        self._next_write = time.monotonic() + self.interval
+        self.textfile.parent.mkdir(parents=True, exist_ok=True)
+        with atomic_writer(self.textfile) as file:
+            file.write(self.render().encode())
+
+
+class _Histogram:
+    """A Prometheus histogram, counting observations in fixed buckets."""
+
+    __slots__ = ("counts", "sum")
+
+    def __init__(self) -> None:
+        # The last bucket counts observations above the largest bound
+        self.counts = [0] * (len(DURATION_BUCKETS) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(DURATION_BUCKETS, value)] += 1
+        self.sum += value
+
+    def copy(self) -> _Histogram:
+        histogram = _Histogram()
+        histogram.counts = list(self.counts)
+        histogram.sum = self.sum
+        return histogram
+
+    def lines(self, name: str, step: str) -> list[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip((*DURATION_BUCKETS, "+Inf"), self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{step="{step}",le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_sum{{step="{step}"}} {self.sum}')
+        lines.append(f'{name}_count{{step="{step}"}} {cumulative}')
+        return lines
+
+
+def _add_metric(
+    lines: list[str],
+    name: str,
+    kind: str,
+    description: str,
+    samples: list[tuple[str, int]],
+) -> None:
+    lines.append(f"# HELP {name} {description}")
+    lines.append(f"# TYPE {name} {kind}")
+    lines.extend(f"{name}{labels} {value}" for labels, value in samples)
+
+
+def _make_handler(metrics: PrometheusMetrics) -> type[BaseHTTPRequestHandler]:
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(HTTPStatus.NOT_FOUND)
+                return
+            body = metrics.render().encode()
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+            # Do not write access logs in the middle of test output
+            pass
+
+    return MetricsHandler
+
+
+if TYPE_CHECKING:
+    # Make sure the class implements the Destination interface
+    PrometheusMetrics(port=0)
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import heapq
+import json
+import mmap
+import re
+import sys
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+
+from typing_extensions import Self
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+
+# Events are written by the JSON codec with default separators, and quotes within
+# strings are escaped, so these patterns only match object keys. Lines are indexed
+# without being decoded:
+# - The node ID of an event is always written before nested objects, so the first
+#   node ID found in a line belongs to the top-level event.
+# - Only test case report events hold nested events (their steps).
+_EVENT_PATTERN = re.compile(rb'"event": "([a-z_]+)"')
+_NODE_ID_PATTERN = re.compile(rb'"node_id": ("(?:[^"\\]|\\.)*")')
+_NESTING_EVENT = b"case_report"
+
+TEST_CASE_EVENTS = ("case_end", "case_report")
+"""Types of the events holding the outcome of a whole test case."""
+
+
+class LogIndex:
+    """Offsets of the lines of a JSON Lines log, by event type and by node ID."""
+
+    def __init__(self) -> None:
+        self.offsets = array("Q")
+        self.by_event: dict[str, array[int]] = {}
+        self.by_node_id: dict[str, array[int]] = {}
+
+    def add(self, offset: int, event: str | None, node_id: str | None) -> None:
+        """Add the offset of a line to the index."""
+        self.offsets.append(offset)
+        if event is not None:
+            offsets = self.by_event.get(event)
+            if offsets is None:
+                offsets = self.by_event[event] = array("Q")
+            offsets.append(offset)
+        if node_id is not None:
+            offsets = self.by_node_id.get(node_id)
+            if offsets is None:
+                offsets = self.by_node_id[node_id] = array("Q")
+            offsets.append(offset)
+
+
+class LogReader:
+    """Read a JSON Lines log written by the plugin without loading it in memory.
+
+    The file is memory-mapped, and an index of line offsets by event type and by
+    node ID is built on first use, without decoding events. Events are decoded
+    lazily while iterating.
+
+    Only logs encoded with the default `json` format are supported.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._file = self.path.open("rb")
+        self._data: mmap.mmap | bytes
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be memory-mapped
+            self._data = b""
+        self._index: LogIndex | None = None
+
+    def close(self) -> None:
+        """Close the log file."""
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    @property
+    def index(self) -> LogIndex:
+        """The index of the log, built on first access."""
+        if self._index is None:
+            self._index = self._build_index()
+        return self._index
+
+    def count(self) -> int:
+        """Return the number of events in the log."""
+        return len(self.index.offsets)
+
+    def event_types(self) -> dict[str, int]:
+        """Return the number of events by event type."""
+        return {event: len(offsets) for event, offsets in self.index.by_event.items()}
+
+    def node_ids(self) -> list[str]:
+        """Return the node IDs found in the log, in order of first appearance."""
+        return list(self.index.by_node_id)
+
+    def events(
+        self,
+        events: Iterable[str] | None = None,
+        node_ids: Iterable[str] | None = None,
+        where: Callable[[dict[str, Any]], bool] | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Iterate lazily over the events of the log, in order.
+
+        Args:
+            events: Only yield events of these types.
+            node_ids: Only yield events whose node ID matches one of these globs.
+            where: Only yield events for which this function returns True.
+        """
+        for offset in self._select(events, node_ids):
+            event = self._decode(offset)
+            if where is None or where(event):
+                yield event
+
+    def _select(
+        self, events: Iterable[str] | None, node_ids: Iterable[str] | None
+    ) -> Iterable[int]:
+        """Return the offsets of the lines matching filters, in order."""
+        index = self.index
+        by_event: Iterable[int] | None = None
+        by_node_id: Iterable[int] | None = None
+        if events is not None:
+            by_event = heapq.merge(
+                *(index.by_event.get(event, ()) for event in set(events))
+            )
+        if node_ids is not None:
+            patterns = list(node_ids)
+            by_node_id = heapq.merge(
+                *(
+                    offsets
+                    for node_id, offsets in index.by_node_id.items()
+                    if any(fnmatch.fnmatchcase(node_id, glob) for glob in patterns)
+                )
+            )
+        if by_event is None:
+            return index.offsets if by_node_id is None else by_node_id
+        if by_node_id is None:
+            return by_event
+        return sorted(set(by_event).intersection(by_node_id))
+
+    def _decode(self, offset: int) -> dict[str, Any]:
+        end = self._data.find(b"\n", offset)
+        if end == -1:
+            end = len(self._data)
+        return json.loads(self._data[offset:end])  # type: ignore[no-any-return]
+
+    def _build_index(self) -> LogIndex:
+        index = LogIndex()
+        data = self._data
+        size = len(data)
+        offset = 0
+        while offset < size:
+            end = data.find(b"\n", offset)
+            if end == -1:
+                end = size
+            event_types = _EVENT_PATTERN.findall(data, offset, end)
+            if len(event_types) == 1 or _NESTING_EVENT in event_types:
+                event_type = _NESTING_EVENT if len(event_types) > 1 else event_types[0]
+                node_id = _NODE_ID_PATTERN.search(data, offset, end)
+                index.add(
+                    offset,
+                    event_type.decode(),
+                    json.loads(node_id.group(1)) if node_id else None,
+                )
+            elif (line := data[offset:end]).strip():
+                # Not written by the plugin, or by an unknown version of it
+                decoded = json.loads(line)
+                index.add(offset, decoded.get("event"), decoded.get("node_id"))
+            offset = end + 1
+        return index
+
+
+def summarize(reader: LogReader, slowest: int = 10) -> list[str]:
+    """Summarize the outcomes and the slowest tests found in a log."""
+    outcomes: Counter[str] = Counter()
+    durations: list[tuple[float, str]] = []
+    for event in reader.events(events=TEST_CASE_EVENTS):
+        outcomes[event["outcome"]] += 1
+        duration = event.get("total_duration", event.get("duration", 0))
+        durations.append((duration, event["node_id"]))
+    lines = [
+        f"events: {reader.count()}",
+        f"tests: {sum(outcomes.values())}",
+        "outcomes: "
+        + " ".join(f"{outcome}={count}" for outcome, count in sorted(outcomes.items())),
+    ]
+    if slowest and durations:
+        lines.append(f"slowest {min(slowest, len(durations))} tests:")
+        lines.extend(
+            f"  {duration:.3f}s {node_id}"
+            for duration, node_id in heapq.nlargest(slowest, durations)
+        )
+    return lines
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Summarize or query a JSON Lines log written by the plugin."""
+    parser = argparse.ArgumentParser(
+        prog="python -m pytest_broadcaster.reader", description=main.__doc__
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    summary = commands.add_parser(
+        "summary", help="Summarize outcomes and slowest tests."
+    )
+    summary.add_argument("path")
+    summary.add_argument("--slowest", type=int, default=10, metavar="count")
+    query = commands.add_parser("query", help="Print events matching filters.")
+    query.add_argument("path")
+    query.add_argument("--event", action="append", default=None, metavar="type")
+    query.add_argument("--node", action="append", default=None, metavar="glob")
+    query.add_argument("--outcome", action="append", default=None, metavar="outcome")
+    args = parser.parse_args(argv)
+    lines: Iterable[str]
+    with LogReader(args.path) as reader:
+        if args.command == "summary":
+            lines = summarize(reader, args.slowest)
+        else:
+            outcomes = args.outcome
+            lines = (
+                json.dumps(event)
+                for event in reader.events(
+                    events=args.event,
+                    node_ids=args.node,
+                    where=None
+                    if outcomes is None
+                    else lambda event: event.get("outcome") in outcomes,
+                )
+            )
+        for line in lines:
+            sys.stdout.write(line + "\n")
+    return 0
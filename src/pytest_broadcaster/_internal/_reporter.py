@@ -1,15 +1,17 @@
 from __future__ import annotations
 
 import datetime
+import functools
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Callable, Literal
 
 import pytest
 
 from pytest_broadcaster.__about__ import __version__
-from pytest_broadcaster.interfaces import Reporter
+from pytest_broadcaster.interfaces import CoalescingReporter
 from pytest_broadcaster.models.collect_report import CollectReport
 from pytest_broadcaster.models.error_message import ErrorMessage
+from pytest_broadcaster.models.failure_cluster import FailureCluster
 from pytest_broadcaster.models.location import Location
 from pytest_broadcaster.models.outcome import Outcome
 from pytest_broadcaster.models.session_end import SessionEnd
@@ -20,6 +22,7 @@ from pytest_broadcaster.models.test_case_call import TestCaseCall
 from pytest_broadcaster.models.test_case_end import TestCaseEnd
 from pytest_broadcaster.models.test_case_error import TestCaseError
 from pytest_broadcaster.models.test_case_report import TestCaseReport
+from pytest_broadcaster.models.test_case_report_event import TestCaseReportEvent
 from pytest_broadcaster.models.test_case_setup import TestCaseSetup
 from pytest_broadcaster.models.test_case_teardown import TestCaseTeardown
 from pytest_broadcaster.models.test_directory import TestDirectory
@@ -29,24 +32,89 @@ from pytest_broadcaster.models.traceback import Entry, Traceback
 from pytest_broadcaster.models.warning_message import WarningMessage, When
 
 from . import _fields as api
+from ._utils import truncate_text
 
 if TYPE_CHECKING:
     import warnings
 
+    from ._utils import TracebackLine
+
+
+_MESSAGE = TestCaseError.__dict__["message"]
+"""Slot holding the message of test case errors."""
+
+
+class _DeferredTestCaseError(TestCaseError):
+    """A test case error whose message is rendered on first access.
+
+    Rendering the error text of a report is costly, and is deferred until the error
+    is converted into a dictionary, usually when a destination encodes the event or
+    the result holding it. The message is always a plain string once accessed.
+    """
+
+    __slots__ = ("_render",)
 
-class DefaultReporter(Reporter):
     def __init__(
+        self,
+        message: str = "",
+        traceback: Traceback | None = None,
+        fingerprint: str | None = None,
+        duplicate: bool | None = False,  # noqa: FBT002
+        *,
+        render: Callable[[], str] | None = None,
+    ) -> None:
+        super().__init__(message, traceback, fingerprint, duplicate)
+        self._render = render
+
+    @property
+    def message(self) -> str:
+        if self._render is not None:
+            _MESSAGE.__set__(self, self._render())
+            self._render = None
+        return _MESSAGE.__get__(self)  # type: ignore[no-any-return]
+
+    @message.setter
+    def message(self, value: str) -> None:
+        self._render = None
+        _MESSAGE.__set__(self, value)
+
+
+class DefaultReporter(CoalescingReporter):
+    _accumulate_result = True
+    """Whether events are accumulated into the session result."""
+
+    def __init__(  # noqa: PLR0913
         self,
         session_id: str | None = None,
         clock: Callable[[], datetime.datetime] | None = None,
+        *,
+        numeric_timestamps: bool = False,
+        max_traceback_depth: int | None = None,
+        max_message_length: int | None = None,
+        deduplicate_errors: bool = False,
     ) -> None:
         self._clock = clock or (lambda: datetime.datetime.now(tz=datetime.timezone.utc))
+        self._make_timestamp: Callable[[float], str | int]
+        self._make_timestamp_from_datetime: Callable[[datetime.datetime], str | int]
+        if numeric_timestamps:
+            self._make_timestamp = api.make_timestamp_ns
+            self._make_timestamp_from_datetime = api.make_timestamp_ns_from_datetime
+        else:
+            self._make_timestamp = api.make_timestamp
+            self._make_timestamp_from_datetime = api.make_timestamp_from_datetime
         self._session_id = session_id or api.make_session_id()
         self._python = api.make_python_distribution()
         self._project = api.make_project()
         self._roots: dict[str, str] = {}
+        self._max_traceback_depth = max_traceback_depth
+        self._max_message_length = max_message_length
+        # Identical error texts and tracebacks are stored once
+        self._texts: dict[str, str] = {}
+        self._tracebacks: dict[tuple[tuple[str, int, str], ...], Traceback] = {}
+        self._deduplicate_errors = deduplicate_errors
+        self._failure_clusters: dict[str, FailureCluster] = {}
         self._pending_report: TestCaseReport | None = None
-        self._start_timestamp = api.make_timestamp_from_datetime(self._clock())
+        self._start_timestamp = self._make_timestamp_from_datetime(self._clock())
         self._result = SessionResult(
             session_id=self._session_id,
             start_timestamp=self._start_timestamp,
@@ -59,6 +127,7 @@ class DefaultReporter(Reporter):
             errors=[],
             collect_reports=[],
             test_reports=[],
+            failure_clusters=[] if deduplicate_errors else None,
             project=self._project,
         )
         self._done = False
@@ -76,6 +145,65 @@ class DefaultReporter(Reporter):
             return f"{pathobj.parent.name}/{pathobj.name}"
         return path
 
+    def _make_traceback(self, lines: list[TracebackLine]) -> Traceback:
+        key = tuple((line.path, line.lineno, line.message) for line in lines)
+        traceback = self._tracebacks.get(key)
+        if traceback is None:
+            traceback = self._tracebacks[key] = Traceback(
+                entries=[
+                    Entry(path=line.path, lineno=line.lineno, message=line.message)
+                    for line in lines
+                ]
+            )
+        return traceback
+
+    def _make_error_text(self, report: pytest.TestReport) -> str:
+        text = truncate_text(report.longreprtext, self._max_message_length)
+        return self._texts.setdefault(text, text)
+
+    def _make_test_case_error(self, report: pytest.TestReport) -> TestCaseError:
+        # Keep the innermost entries, which are the closest to the error
+        lines = api.make_traceback(report, self._max_traceback_depth)
+        crash = api.make_crash(report)
+        if not self._deduplicate_errors or crash is None:
+            return _DeferredTestCaseError(
+                render=functools.partial(self._make_error_text, report),
+                traceback=self._make_traceback(lines),
+            )
+        exception_type = api.make_exception_type(report, crash)
+        fingerprint = api.make_error_fingerprint(exception_type, crash, lines)
+        cluster = self._failure_clusters.get(fingerprint)
+        if cluster is not None:
+            # The full error was already emitted, only send the crash message
+            cluster.count += 1
+            cluster.node_ids.append(report.nodeid)
+            return TestCaseError(
+                message=crash.message, fingerprint=fingerprint, duplicate=True
+            )
+        cluster = FailureCluster(
+            fingerprint=fingerprint,
+            exception_type=exception_type,
+            message=crash.message,
+            location=Location(
+                filename=self._get_path(crash.path, is_error_or_warning=True),
+                lineno=crash.lineno,
+            ),
+            count=1,
+            node_ids=[report.nodeid],
+        )
+        self._failure_clusters[fingerprint] = cluster
+        if self._accumulate_result:
+            assert self._result.failure_clusters is not None, (
+                "failure clusters are missing, "
+                "this is a bug in pytest-broadcaster plugin"
+            )
+            self._result.failure_clusters.append(cluster)
+        return _DeferredTestCaseError(
+            render=functools.partial(self._make_error_text, report),
+            traceback=self._make_traceback(lines),
+            fingerprint=fingerprint,
+        )
+
     def make_session_result(self) -> SessionResult | None:
         if not self._done:
             return None
@@ -92,7 +220,7 @@ class DefaultReporter(Reporter):
         )
 
     def make_session_end(self, exit_status: int) -> SessionEnd:
-        stop_timestamp = api.make_timestamp_from_datetime(self._clock())
+        stop_timestamp = self._make_timestamp_from_datetime(self._clock())
         self._result.stop_timestamp = stop_timestamp
         self._result.exit_status = exit_status
         self._done = True
@@ -122,7 +250,8 @@ class DefaultReporter(Reporter):
             when=When(when),
             node_id=nodeid,
         )
-        self._result.warnings.append(msg)
+        if self._accumulate_result:
+            self._result.warnings.append(msg)
         return msg
 
     def make_error_message(
@@ -132,7 +261,9 @@ class DefaultReporter(Reporter):
         assert exc_info, "exception info is missing"
         exc_repr = exc_info.getrepr()
         assert exc_repr.reprcrash, "exception crash repr is missing"
-        traceback_lines = api.make_traceback_from_reprtraceback(exc_repr.reprtraceback)
+        traceback_lines = api.make_traceback_from_reprtraceback(
+            exc_repr.reprtraceback, self._max_traceback_depth
+        )
         msg = ErrorMessage(
             when=call.when,  # type: ignore[arg-type]
             location=Location(
@@ -141,20 +272,12 @@ class DefaultReporter(Reporter):
                 ),
                 lineno=exc_repr.reprcrash.lineno,
             ),
-            traceback=Traceback(
-                entries=[
-                    Entry(
-                        lineno=line.lineno,
-                        path=line.path,
-                        message=line.message,
-                    )
-                    for line in traceback_lines
-                ]
-            ),
+            traceback=self._make_traceback(traceback_lines),
             exception_type=exc_info.typename,
             exception_value=str(exc_info.value),
         )
-        self._result.errors.append(msg)
+        if self._accumulate_result:
+            self._result.errors.append(msg)
         return msg
 
     def make_collect_report(self, report: pytest.CollectReport) -> CollectReport:
@@ -212,11 +335,12 @@ class DefaultReporter(Reporter):
         # Generate a collect report event.
         collect_report = CollectReport(
             session_id=self._session_id,
-            timestamp=api.make_timestamp_from_datetime(self._clock()),
+            timestamp=self._make_timestamp_from_datetime(self._clock()),
             node_id=report.nodeid or "",
             items=items,
         )
-        self._result.collect_reports.append(collect_report)
+        if self._accumulate_result:
+            self._result.collect_reports.append(collect_report)
         return collect_report
 
     def make_test_case_step(
@@ -227,23 +351,15 @@ class DefaultReporter(Reporter):
         # Let's process the error if any
         error: TestCaseError | None = None
         if report.failed:
-            error = TestCaseError(
-                message=report.longreprtext,
-                traceback=Traceback(
-                    entries=[
-                        Entry(path=line.path, lineno=line.lineno, message=line.message)
-                        for line in api.make_traceback(report)
-                    ]
-                ),
-            )
+            error = self._make_test_case_error(report)
         # Let's process the report based on the step
         step: TestCaseSetup | TestCaseCall | TestCaseTeardown
         if report.when == "setup":
             step = TestCaseSetup(
                 session_id=self._session_id,
                 node_id=report.nodeid,
-                start_timestamp=api.make_timestamp(report.start),
-                stop_timestamp=api.make_timestamp(report.stop),
+                start_timestamp=self._make_timestamp(report.start),
+                stop_timestamp=self._make_timestamp(report.stop),
                 duration=report.duration,
                 outcome=outcome,
                 error=error,
@@ -262,8 +378,8 @@ class DefaultReporter(Reporter):
             step = TestCaseCall(
                 session_id=self._session_id,
                 node_id=report.nodeid,
-                start_timestamp=api.make_timestamp(report.start),
-                stop_timestamp=api.make_timestamp(report.stop),
+                start_timestamp=self._make_timestamp(report.start),
+                stop_timestamp=self._make_timestamp(report.stop),
                 duration=report.duration,
                 outcome=outcome,
                 error=error,
@@ -280,8 +396,8 @@ class DefaultReporter(Reporter):
                 outcome=outcome,
                 duration=report.duration,
                 error=error,
-                start_timestamp=api.make_timestamp(report.start),
-                stop_timestamp=api.make_timestamp(report.stop),
+                start_timestamp=self._make_timestamp(report.start),
+                stop_timestamp=self._make_timestamp(report.stop),
             )
             assert self._pending_report, (
                 "pending report is missing, this is a bug in pytest-broadcaster plugin"
@@ -346,6 +462,20 @@ class DefaultReporter(Reporter):
         self._result.test_reports.append(report)
         return finished
 
+    def make_test_case_report(self, node_id: str) -> TestCaseReportEvent:
+        finished = self.make_test_case_end(node_id)
+        report = self._result.test_reports[-1]
+        return TestCaseReportEvent(
+            session_id=self._session_id,
+            node_id=node_id,
+            outcome=finished.outcome,
+            duration=finished.total_duration,
+            setup=report.setup,
+            call=report.call,
+            teardown=report.teardown,
+            finished=finished,
+        )
+
 
 if TYPE_CHECKING:
     # Make sure that the class implements the interface
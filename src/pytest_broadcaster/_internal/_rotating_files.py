@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import gzip
+import json
+import queue
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+
+from pytest_broadcaster.interfaces import Destination
+
+from ._codecs import EncodedPayload, JSONCodec
+from ._constants import COMPRESSIONS
+from ._files import atomic_writer
+
+if TYPE_CHECKING:
+    import io
+    from types import ModuleType
+
+    from pytest_broadcaster.interfaces import Codec
+    from pytest_broadcaster.models.session_event import SessionEvent
+    from pytest_broadcaster.models.session_result import SessionResult
+
+
+QUEUE_SIZE = 1024
+"""Maximum number of pending operations when compressing in background."""
+
+
+def segment_path(filepath: Path, index: int, compression: str | None = None) -> Path:
+    """Return the path of a segment, e.g. `events.0001.jsonl.gz` for `events.jsonl`."""
+    extension = "" if compression is None else COMPRESSIONS[compression]
+    return filepath.with_name(
+        f"{filepath.stem}.{index:04d}{filepath.suffix}{extension}"
+    )
+
+
+def manifest_path(filepath: Path) -> Path:
+    """Return the path of the manifest, e.g. `events.manifest.json`."""
+    return filepath.with_name(f"{filepath.stem}.manifest.json")
+
+
+def open_segment(path: Path, compression: str | None) -> io.BufferedIOBase:
+    """Open a segment for writing."""
+    if compression is None:
+        return path.open("wb")
+    if compression == "gzip":
+        return gzip.GzipFile(path, "wb", compresslevel=6)
+    if compression == "zstd":
+        file = path.open("wb")
+        try:
+            compressor = _import_zstd().ZstdCompressor()
+        except BaseException:
+            file.close()
+            raise
+        return compressor.stream_writer(file)  # type: ignore[no-any-return]
+    msg = (
+        f"Unknown compression: {compression} "
+        f"(expected one of {', '.join(COMPRESSIONS)})"
+    )
+    raise ValueError(msg)
+
+
+class _SegmentWriter:
+    """Write segments and the manifest listing completed segments.
+
+    When compression is enabled, methods are called within a background thread.
+    """
+
+    def __init__(self, filepath: Path, compression: str | None) -> None:
+        self.filepath = filepath
+        self.compression = compression
+        self.manifest = manifest_path(filepath)
+        self.segments: list[dict[str, Any]] = []
+        self._file: io.BufferedIOBase | None = None
+
+    def write(self, payload: bytes) -> None:
+        if self._file is None:
+            path = segment_path(self.filepath, len(self.segments) + 1, self.compression)
+            self._file = open_segment(path, self.compression)
+        self._file.write(payload)
+        # Compressed segments are only readable once completed
+        if self.compression is None:
+            self._file.flush()
+
+    def finish_segment(self, events: int, size: int) -> None:
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        index = len(self.segments) + 1
+        self.segments.append(
+            {
+                "path": segment_path(self.filepath, index, self.compression).name,
+                "events": events,
+                "size": size,
+            }
+        )
+        self.write_manifest(complete=False)
+
+    def write_manifest(self, *, complete: bool) -> None:
+        manifest = {
+            "compression": self.compression,
+            "complete": complete,
+            "segments": self.segments,
+        }
+        with atomic_writer(self.manifest) as file:
+            file.write(json.dumps(manifest, indent=2).encode())
+
+
+class RotatingJSONLinesFile(Destination):
+    """Write session events to a sequence of JSON Lines files.
+
+    A new segment is started when the current one would exceed `max_bytes`
+    (uncompressed) or already holds `max_events` events. A segment always holds at
+    least one event. Segments are named after the file path, e.g.
+    `events.0001.jsonl`, `events.0002.jsonl` for `events.jsonl`.
+
+    A manifest (`events.manifest.json`) lists completed segments in order, and is
+    rewritten atomically each time a segment is completed, so that segments can be
+    shipped while the session is still running. The manifest is marked complete
+    once the destination is closed.
+
+    When compression is enabled, segments are compressed within a background
+    thread, so that the cost of compression is not paid by the test session.
+
+    Each segment can be decoded on its own, so stateful codecs (such as the compact
+    and dictionary codecs) are rejected.
+    """
+
+    def __init__(
+        self,
+        filepath: str,
+        *,
+        codec: Codec | None = None,
+        max_bytes: int | None = None,
+        max_events: int | None = None,
+        compression: str | None = None,
+    ) -> None:
+        if max_bytes is not None and max_bytes <= 0:
+            msg = f"Maximum segment size must be positive, got {max_bytes}"
+            raise ValueError(msg)
+        if max_events is not None and max_events <= 0:
+            msg = f"Maximum segment events must be positive, got {max_events}"
+            raise ValueError(msg)
+        if compression is not None and compression not in COMPRESSIONS:
+            msg = (
+                f"Unknown compression: {compression} "
+                f"(expected one of {', '.join(COMPRESSIONS)})"
+            )
+            raise ValueError(msg)
+        if compression == "zstd":
+            # Fail early when zstandard is not installed
+            _import_zstd()
+        self.filepath = Path(filepath)
+        self.codec = codec or JSONCodec()
+        if not self.codec.stateless:
+            # Segments must be decodable on their own
+            msg = (
+                f"Rotated segments cannot be written using the {self.codec.name} "
+                "format, since its payloads refer to payloads written before"
+            )
+            raise ValueError(msg)
+        self.max_bytes = max_bytes
+        self.max_events = max_events
+        self.compression = compression
+        # Binary payloads are self-delimiting, text payloads are written one per line
+        self._delimiter = b"" if self.codec.binary else b"\n"
+        self._writer = _SegmentWriter(self.filepath, compression)
+        self._segment_events = 0
+        self._segment_size = 0
+        self._opened = False
+        self._queue: queue.Queue[Callable[[], None] | None] | None = None
+        self._thread: threading.Thread | None = None
+        self._error: BaseException | None = None
+
+    @property
+    def manifest(self) -> Path:
+        """The path of the manifest."""
+        return self._writer.manifest
+
+    @property
+    def segments(self) -> list[Path]:
+        """The paths of the completed segments, in order."""
+        return [
+            self.filepath.with_name(segment["path"])
+            for segment in self._writer.segments
+        ]
+
+    def open(self) -> None:
+        if self._opened:
+            msg = "Rotating JSON Lines output file is already opened"
+            raise RuntimeError(msg)
+        # Ensure the directory exists.
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        self._opened = True
+        if self.compression is not None:
+            self._queue = queue.Queue(maxsize=QUEUE_SIZE)
+            self._thread = threading.Thread(
+                target=self._run, name="pytest-broadcaster-compression", daemon=True
+            )
+            self._thread.start()
+
+    def close(self) -> None:
+        if not self._opened:
+            return
+        self._opened = False
+        self._submit(
+            self._writer.finish_segment, self._segment_events, self._segment_size
+        )
+        self._submit(self._writer.write_manifest, complete=True)
+        if self._queue is not None and self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._queue = self._thread = None
+        self._raise_error()
+
+    def write_result(self, result: SessionResult) -> None:
+        # We don't write results to JSON Lines
+        pass
+
+    def write_event(
+        self,
+        event: SessionEvent,
+    ) -> None:
+        self.write_encoded_event(EncodedPayload(event))
+
+    def write_encoded_event(self, payload: EncodedPayload[SessionEvent]) -> None:
+        if not self._opened:
+            self.open()
+        self._raise_error()
+        line = payload.encode(self.codec) + self._delimiter
+        if self._segment_events and (
+            (
+                self.max_bytes is not None
+                and self._segment_size + len(line) > self.max_bytes
+            )
+            or (self.max_events is not None and self._segment_events >= self.max_events)
+        ):
+            self._submit(
+                self._writer.finish_segment, self._segment_events, self._segment_size
+            )
+            self._segment_events = self._segment_size = 0
+        self._segment_events += 1
+        self._segment_size += len(line)
+        self._submit(self._writer.write, line)
+
+    def summary(self) -> str | None:
+        return f"generated report log manifest: {self.manifest.as_posix()}"
+
+    def _submit(self, func: Callable[..., None], *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        if self._queue is None:
+            func(*args, **kwargs)
+        else:
+            self._queue.put(lambda: func(*args, **kwargs))
+
+    def _run(self) -> None:
+        assert self._queue, "queue expected to be created"
+        while (operation := self._queue.get()) is not None:
+            # Keep consuming operations after an error, so that producer never blocks
+            if self._error is None:
+                try:
+                    operation()
+                except BaseException as e:  # noqa: BLE001
+                    self._error = e
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+
+def _import_zstd() -> ModuleType:
+    try:
+        import zstandard
+    except ImportError as e:
+        msg = (
+            "zstandard package is required to use zstd compression. "
+            "Install it using: pip install pytest-broadcaster[zstd]"
+        )
+        raise RuntimeError(msg) from e
+    return zstandard  # type: ignore[no-any-return]
+
+
+if TYPE_CHECKING:
+    # Make sure the class implements the Destination interface
+    RotatingJSONLinesFile("fake.jsonl")
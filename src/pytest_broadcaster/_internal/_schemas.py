@@ -0,0 +1,459 @@
+from __future__ import annotations
+
+import functools
+import json
+import re
+from enum import Enum
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, NoReturn
+
+from pytest_broadcaster.interfaces import Destination
+
+from ._codecs import to_dict
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from pytest_broadcaster._internal._codecs import EncodedPayload
+    from pytest_broadcaster.models.session_event import SessionEvent
+    from pytest_broadcaster.models.session_result import SessionResult
+
+    Check = Callable[[Any, str], None]
+
+
+EVENT_SCHEMA = "session_event.json"
+"""Name of the schema describing all session events."""
+
+RESULT_SCHEMA = "session_result.json"
+"""Name of the schema describing the session result."""
+
+# Keywords which do not constrain values
+_ANNOTATIONS = frozenset(("$schema", "$id", "title", "description", "default"))
+
+_DATE_TIME = re.compile(
+    r"\d{4}-\d{2}-\d{2}[Tt ]\d{2}:\d{2}:\d{2}(\.\d+)?([Zz]|[+-]\d{2}:\d{2})"
+)
+
+# Python types of JSON values, as found in dictionaries converted from models
+_TYPES: dict[str, tuple[type, ...]] = {
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "object": (dict,),
+    "array": (list, tuple),
+    "null": (type(None),),
+}
+
+_MISSING = object()
+
+
+def find_schemas() -> Path:
+    """Return the directory holding the JSON schemas.
+
+    Schemas are shipped within the package, and found next to the package when
+    running from the source tree.
+    """
+    package = Path(__file__).parent.parent
+    for directory in (package / "schemas", package.parent / "schemas"):
+        if directory.joinpath(EVENT_SCHEMA).is_file():
+            return directory
+    msg = f"JSON schemas not found next to {package.as_posix()}"
+    raise RuntimeError(msg)
+
+
+@functools.cache
+def get_schema_validator() -> SchemaValidator:
+    """Return the validator of the JSON schemas shipped with the package.
+
+    Schemas are compiled on first call only.
+    """
+    return SchemaValidator()
+
+
+class SchemaValidator:
+    """Validate events and results using JSON schemas compiled into functions.
+
+    Each schema found in `directory` (default to the schemas shipped with the
+    package) is compiled once into nested functions, so that
+    a value is validated without interpreting the schema again. `oneOf` keywords
+    whose alternatives are objects sharing a property with a `const` value (such as
+    `event` or `node_type`), or alternatives of distinct types, are compiled into a
+    lookup instead of trying each alternative.
+
+    Values are validated as converted from models, before they are encoded: enums
+    are validated using their values, and optional properties may be null, since
+    models hold None for optional fields which are not set.
+
+    Only the keywords used by the schemas of this project are supported, and
+    compiling a schema using another keyword raises a ValueError.
+    """
+
+    def __init__(self, directory: str | Path | None = None) -> None:
+        self.directory = find_schemas() if directory is None else Path(directory)
+        self._schemas: dict[str, dict[str, Any]] = {
+            path.name: json.loads(path.read_text(encoding="utf-8"))
+            for path in sorted(self.directory.glob("*.json"))
+        }
+        self._checks: dict[str, Check] = {}
+        for name in self._schemas:
+            self._compile_document(name)
+
+    @property
+    def schemas(self) -> list[str]:
+        """The names of the compiled schemas."""
+        return list(self._checks)
+
+    def validate(self, value: Any, schema: str) -> None:  # noqa: ANN401
+        """Raise a ValueError if the value does not match the schema."""
+        try:
+            check = self._checks[schema]
+        except KeyError:
+            msg = f"Unknown schema: {schema}"
+            raise ValueError(msg) from None
+        check(value, "$")
+
+    def validate_event(self, value: Any) -> None:  # noqa: ANN401
+        """Raise a ValueError if the value is not a valid session event."""
+        self._checks[EVENT_SCHEMA](value, "$")
+
+    def validate_result(self, value: Any) -> None:  # noqa: ANN401
+        """Raise a ValueError if the value is not a valid session result."""
+        self._checks[RESULT_SCHEMA](value, "$")
+
+    def _compile_document(self, name: str) -> Check:
+        check = self._checks.get(name)
+        if check is None:
+            # Register a placeholder first, so that recursive references resolve
+            checks = self._checks
+            checks[name] = lambda value, path: checks[name](value, path)
+            check = checks[name] = self._compile(self._schemas[name])
+        return check
+
+    def _resolve(self, reference: str) -> str:
+        name, _, pointer = reference.partition("#")
+        name = name.rstrip("/")
+        if pointer.strip("/") or name not in self._schemas:
+            msg = f"Unsupported reference: {reference}"
+            raise ValueError(msg)
+        return name
+
+    def _compile(self, schema: dict[str, Any]) -> Check:  # noqa: C901, PLR0912
+        checks: list[Check] = []
+        for keyword, value in schema.items():
+            if keyword in _ANNOTATIONS:
+                continue
+            if keyword == "$ref":
+                checks.append(self._compile_ref(value))
+            elif keyword == "type":
+                checks.append(_compile_type(value))
+            elif keyword == "const":
+                checks.append(_compile_enum([value]))
+            elif keyword == "enum":
+                checks.append(_compile_enum(value))
+            elif keyword == "format":
+                checks.append(_compile_format(value))
+            elif keyword == "properties":
+                checks.append(
+                    self._compile_properties(value, schema.get("required", []))
+                )
+            elif keyword == "required":
+                if "properties" not in schema:
+                    checks.append(self._compile_properties({}, value))
+            elif keyword == "additionalProperties":
+                checks.append(self._compile_additional_properties(schema, value))
+            elif keyword == "items":
+                checks.append(self._compile_items(value))
+            elif keyword == "oneOf":
+                checks.append(self._compile_one_of(value))
+            else:
+                msg = f"Unsupported keyword: {keyword}"
+                raise ValueError(msg)
+        if not checks:
+            return _accept
+        if len(checks) == 1:
+            return checks[0]
+
+        def check_all(value: Any, path: str) -> None:  # noqa: ANN401
+            for check in checks:
+                check(value, path)
+
+        return check_all
+
+    def _compile_ref(self, reference: str) -> Check:
+        name = self._resolve(reference)
+        checks = self._checks
+        compiled = checks.get(name)
+        if compiled is not None:
+            return compiled
+
+        # Referenced document is being compiled, look it up on first use
+        def check_ref(value: Any, path: str) -> None:  # noqa: ANN401
+            checks[name](value, path)
+
+        return check_ref
+
+    def _compile_properties(
+        self, properties: dict[str, Any], required: Iterable[str]
+    ) -> Check:
+        required_names = tuple(required)
+        property_checks = [
+            (name, self._compile(schema), name in required_names)
+            for name, schema in properties.items()
+        ]
+
+        def check_properties(value: Any, path: str) -> None:  # noqa: ANN401
+            if not isinstance(value, dict):
+                return
+            for name in required_names:
+                if name not in value:
+                    _fail(path, f"missing required property '{name}'")
+            for name, check, is_required in property_checks:
+                item = value.get(name, _MISSING)
+                if item is _MISSING or (item is None and not is_required):
+                    continue
+                check(item, f"{path}.{name}")
+
+        return check_properties
+
+    def _compile_additional_properties(
+        self, schema: dict[str, Any], additional: dict[str, Any] | bool
+    ) -> Check:
+        known = frozenset(schema.get("properties", ()))
+        check = (
+            self._compile(additional)
+            if isinstance(additional, dict)
+            else _accept
+            if additional
+            else _reject
+        )
+
+        def check_additional_properties(value: Any, path: str) -> None:  # noqa: ANN401
+            if not isinstance(value, dict):
+                return
+            for name, item in value.items():
+                if name not in known:
+                    check(item, f"{path}.{name}")
+
+        return check_additional_properties
+
+    def _compile_items(self, schema: dict[str, Any]) -> Check:
+        check = self._compile(schema)
+
+        def check_items(value: Any, path: str) -> None:  # noqa: ANN401
+            if not isinstance(value, (list, tuple)):
+                return
+            for index, item in enumerate(value):
+                check(item, f"{path}[{index}]")
+
+        return check_items
+
+    def _compile_one_of(self, schemas: list[dict[str, Any]]) -> Check:
+        checks = [self._compile(schema) for schema in schemas]
+        return (
+            self._compile_discriminated(schemas, checks)
+            or _compile_typed(
+                [self._expected_types(schema) for schema in schemas], checks
+            )
+            or _compile_any_one_of(checks)
+        )
+
+    def _compile_discriminated(
+        self, schemas: list[dict[str, Any]], checks: list[Check]
+    ) -> Check | None:
+        """Compile alternatives told apart by a required property with a const value."""
+        targets = [self._target(schema) for schema in schemas]
+        candidates: set[str] | None = None
+        for target in targets:
+            names = {
+                name
+                for name, schema in target.get("properties", {}).items()
+                if "const" in schema and name in target.get("required", ())
+            }
+            candidates = names if candidates is None else candidates & names
+        if not candidates:
+            return None
+        key = sorted(candidates)[0]
+        lookup: dict[Any, Check] = {}
+        for target, check in zip(targets, checks):
+            const = target["properties"][key]["const"]
+            if const in lookup:
+                return None
+            lookup[const] = check
+
+        def check_discriminated(value: Any, path: str) -> None:  # noqa: ANN401
+            if not isinstance(value, dict):
+                _fail(path, "expected object")
+            discriminator = value.get(key)
+            if isinstance(discriminator, Enum):
+                discriminator = discriminator.value
+            check = lookup.get(discriminator)
+            if check is None:
+                _fail(path, f"unexpected value of '{key}': {discriminator!r}")
+            check(value, path)
+
+        return check_discriminated
+
+    def _expected_types(self, schema: dict[str, Any]) -> tuple[str, ...] | None:
+        """Return the JSON types accepted by a schema, if stated."""
+        types = self._target(schema).get("type")
+        if types is None:
+            return None
+        return (types,) if isinstance(types, str) else tuple(types)
+
+    def _target(self, schema: dict[str, Any]) -> dict[str, Any]:
+        """Return the schema, or the schema it references."""
+        if "$ref" in schema:
+            return self._schemas[self._resolve(schema["$ref"])]
+        return schema
+
+
+def _compile_type(types: str | list[str]) -> Check:
+    names = (types,) if isinstance(types, str) else tuple(types)
+    expected = tuple(cls for name in names for cls in _TYPES[name])
+    exclude_bool = "boolean" not in names
+    description = " or ".join(names)
+
+    def check_type(value: Any, path: str) -> None:  # noqa: ANN401
+        if isinstance(value, Enum):
+            value = value.value
+        if not isinstance(value, expected) or (
+            exclude_bool and isinstance(value, bool)
+        ):
+            _fail(path, f"expected {description}, got {type(value).__name__}")
+
+    return check_type
+
+
+def _compile_enum(values: list[Any]) -> Check:
+    accepted = list(values)
+
+    def check_enum(value: Any, path: str) -> None:  # noqa: ANN401
+        if isinstance(value, Enum):
+            value = value.value
+        if value not in accepted:
+            _fail(path, f"expected one of {accepted!r}, got {value!r}")
+
+    return check_enum
+
+
+def _compile_format(name: str) -> Check:
+    if name != "date-time":
+        msg = f"Unsupported format: {name}"
+        raise ValueError(msg)
+    match = _DATE_TIME.fullmatch
+
+    def check_date_time(value: Any, path: str) -> None:  # noqa: ANN401
+        if isinstance(value, str) and match(value) is None:
+            _fail(path, f"expected date-time, got {value!r}")
+
+    return check_date_time
+
+
+def _compile_typed(
+    types: list[tuple[str, ...] | None], checks: list[Check]
+) -> Check | None:
+    """Compile alternatives accepting distinct types into a lookup by type."""
+    lookup: dict[type, Check] = {}
+    for names, check in zip(types, checks):
+        if names is None:
+            return None
+        for name in names:
+            for cls in _TYPES[name]:
+                if cls in lookup:
+                    return None
+                lookup[cls] = check
+    # Booleans are only accepted by boolean alternatives
+    lookup.setdefault(bool, _reject)
+
+    def check_typed(value: Any, path: str) -> None:  # noqa: ANN401
+        check = lookup.get(type(value))
+        if check is None:
+            for cls, candidate in lookup.items():
+                if isinstance(value, cls):
+                    check = candidate
+                    break
+            else:
+                _fail(path, f"unexpected type {type(value).__name__}")
+        check(value, path)
+
+    return check_typed
+
+
+def _compile_any_one_of(checks: list[Check]) -> Check:
+    def check_one_of(value: Any, path: str) -> None:  # noqa: ANN401
+        matches = 0
+        for check in checks:
+            try:
+                check(value, path)
+            except ValueError:
+                continue
+            matches += 1
+        if matches != 1:
+            _fail(path, f"expected exactly one match, got {matches}")
+
+    return check_one_of
+
+
+def _accept(value: Any, path: str) -> None:  # noqa: ANN401
+    pass
+
+
+def _reject(value: Any, path: str) -> NoReturn:  # noqa: ANN401, ARG001
+    _fail(path, "unexpected value")
+
+
+def _fail(path: str, reason: str) -> NoReturn:
+    msg = f"{path}: {reason}"
+    raise ValueError(msg)
+
+
+class SchemaChecker(Destination):
+    """Check that events and the session result match the JSON schemas.
+
+    Schemas are compiled once, and each event is validated as converted into a
+    dictionary, which is shared with the destinations encoding it, so that events are
+    neither encoded nor parsed again. An event which does not match the schemas is
+    rejected with a ValueError, which the plugin reports as a warning.
+    """
+
+    def __init__(self, validator: SchemaValidator | None = None) -> None:
+        self.validator = validator or get_schema_validator()
+        self.checked = 0
+        self.invalid = 0
+
+    def open(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def write_event(self, event: SessionEvent) -> None:
+        self._check(to_dict(event), self.validator.validate_event)
+
+    def write_result(self, result: SessionResult) -> None:
+        self._check(to_dict(result), self.validator.validate_result)
+
+    def write_encoded_event(self, payload: EncodedPayload[SessionEvent]) -> None:
+        self._check(payload.data, self.validator.validate_event)
+
+    def write_encoded_result(self, payload: EncodedPayload[SessionResult]) -> None:
+        self._check(payload.data, self.validator.validate_result)
+
+    def summary(self) -> str | None:
+        if self.invalid:
+            return f"found {self.invalid} events not matching the JSON schemas"
+        return None
+
+    def _check(self, data: dict[str, Any], validate: Callable[[Any], None]) -> None:
+        self.checked += 1
+        try:
+            validate(data)
+        except ValueError:
+            self.invalid += 1
+            raise
+
+
+if TYPE_CHECKING:
+    # Make sure the class implements the Destination interface
+    SchemaChecker()
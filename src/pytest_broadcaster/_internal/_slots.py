@@ -0,0 +1,62 @@
+"""Slotted dataclasses for all supported python versions.
+
+Generated models are decorated using the `dataclass` function defined in this module
+instead of the one from the standard library, so that instances do not hold a
+`__dict__`. The `slots` argument of `dataclasses.dataclass` is only available since
+python 3.10, a backport is used on older versions.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import sys
+from typing import TYPE_CHECKING, TypeVar, cast
+
+T = TypeVar("T")
+
+if TYPE_CHECKING:
+    from typing_extensions import dataclass_transform
+
+    @dataclass_transform()
+    def dataclass(cls: type[T]) -> type[T]:
+        """Create a slotted dataclass."""
+
+elif sys.version_info >= (3, 10):
+
+    def dataclass(cls: type[T]) -> type[T]:
+        """Create a slotted dataclass."""
+        return dataclasses.dataclass(cls, slots=True)
+
+else:
+
+    def dataclass(cls: type[T]) -> type[T]:
+        """Create a slotted dataclass."""
+        return add_slots(dataclasses.dataclass(cls))
+
+
+def add_slots(cls: type[T]) -> type[T]:
+    """Return a copy of a dataclass with `__slots__` defined for its fields.
+
+    This is how `dataclasses.dataclass(slots=True)` works on python 3.10 and later:
+    a class cannot be given `__slots__` once created, so a new class is created.
+    """
+    inherited_slots = {
+        slot for base in cls.__mro__[1:-1] for slot in getattr(base, "__slots__", ())
+    }
+    field_names = tuple(
+        field.name
+        for field in dataclasses.fields(cls)  # type: ignore[arg-type]
+        if field.name not in inherited_slots
+    )
+    cls_dict = dict(cls.__dict__)
+    cls_dict["__slots__"] = field_names
+    for name in field_names:
+        # Default values are class attributes which would conflict with slots.
+        # They are not needed since they are also defined in generated __init__.
+        cls_dict.pop(name, None)
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+    metaclass: type[type] = type(cls)
+    slotted_cls = metaclass(cls.__name__, cls.__bases__, cls_dict)
+    slotted_cls.__qualname__ = cls.__qualname__
+    return cast("type[T]", slotted_cls)
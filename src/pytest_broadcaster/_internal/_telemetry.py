@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, TypeVar
+
+from ._otlp import (
+    AGGREGATION_TEMPORALITY_CUMULATIVE,
+    STATUS_CODE_ERROR,
+    STATUS_CODE_UNSET,
+    OTLPFileExporter,
+    make_attributes,
+    make_metrics_request,
+    make_resource,
+    make_span,
+    make_traces_request,
+    new_span_id,
+    new_trace_id,
+)
+from ._parallel import ThreadedDestination
+from ._profiling import ProfiledDestination, Profiler
+
+if TYPE_CHECKING:
+    from pytest_broadcaster._internal._codecs import EncodedPayload
+    from pytest_broadcaster.interfaces import Destination
+    from pytest_broadcaster.models.session_event import SessionEvent
+    from pytest_broadcaster.models.session_result import SessionResult
+
+
+T = TypeVar("T")
+
+BATCH_SIZE = 512
+"""Number of spans recorded before they are exported."""
+
+
+class Instrumentation(Profiler):
+    """A profiler also recording spans and metrics, exported in OTLP format.
+
+    Each recorded operation becomes a span, child of a single root span covering
+    the whole session. Spans are exported in batches of `batch_size` spans, so that
+    memory usage remains constant. Metrics are exported once, when the
+    instrumentation is closed:
+
+    - `pytest_broadcaster.operation.duration`: a histogram of the duration of each
+      operation, in nanoseconds.
+    - `pytest_broadcaster.events`: the number of events written to each destination.
+    - `pytest_broadcaster.events.rate`: the number of events written to each
+      destination per second.
+    - `pytest_broadcaster.bytes`: the number of bytes encoded for each destination.
+    - `pytest_broadcaster.queue.depth`: the number of events waiting to be written to
+      each parallel destination, sampled each time spans are exported.
+    """
+
+    def __init__(
+        self, exporter: OTLPFileExporter, *, batch_size: int = BATCH_SIZE
+    ) -> None:
+        super().__init__()
+        self.exporter = exporter
+        self.batch_size = batch_size
+        self.trace_id = new_trace_id()
+        self.root_span_id = new_span_id()
+        self.start_time = time.time_ns()
+        self.spans: list[dict[str, Any]] = []
+        self.events: dict[str, int] = {}
+        self.bytes_out: dict[str, int] = {}
+        self.queue_depths: dict[str, list[tuple[int, int]]] = {}
+        self._queues: dict[str, ThreadedDestination] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, duration: int) -> None:
+        super().record(name, duration)
+        self._add_span(name, duration, STATUS_CODE_UNSET)
+
+    def call(self, name: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:  # noqa: ANN401
+        start = time.perf_counter_ns()
+        status = STATUS_CODE_UNSET
+        try:
+            return func(*args, **kwargs)
+        except BaseException:
+            status = STATUS_CODE_ERROR
+            raise
+        finally:
+            duration = time.perf_counter_ns() - start
+            super().record(name, duration)
+            self._add_span(name, duration, status)
+
+    def count(self, name: str, size: int | None, *, events: int = 1) -> None:
+        """Count events written to a destination, and their size when encoded."""
+        with self._lock:
+            self.events[name] = self.events.get(name, 0) + events
+            if size is not None:
+                self.bytes_out[name] = self.bytes_out.get(name, 0) + size
+
+    def watch_queues(self, destinations: list[Destination]) -> None:
+        """Sample the queue depth of parallel destinations when exporting spans."""
+        for destination in destinations:
+            if isinstance(destination, ThreadedDestination):
+                name = getattr(destination.destination, "name", repr(destination))
+                self._queues[name] = destination
+                self.queue_depths[name] = []
+
+    def close(self, session_id: str | None = None) -> None:
+        """Export remaining spans, the root span and metrics, and close the exporter."""
+        end = time.time_ns()
+        with self._lock:
+            self._sample_queues(end)
+            spans, self.spans = self.spans, []
+        spans.append(
+            make_span(
+                self.trace_id,
+                self.root_span_id,
+                None,
+                "pytest_broadcaster.session",
+                self.start_time,
+                end,
+                {"session_id": session_id} if session_id else None,
+            )
+        )
+        resource = make_resource()
+        try:
+            self.exporter.export(make_traces_request(spans, resource))
+            self.exporter.export(make_metrics_request(self.make_metrics(end), resource))
+        finally:
+            self.exporter.close()
+
+    def make_metrics(self, end: int) -> list[dict[str, Any]]:
+        """Return the metrics recorded so far, as OTLP metrics."""
+        start = str(self.start_time)
+        now = str(end)
+        elapsed = max(end - self.start_time, 1) / 1_000_000_000
+
+        def point(name: str, key: str, **value: object) -> dict[str, Any]:
+            return {
+                "attributes": make_attributes({key: name}),
+                "startTimeUnixNano": start,
+                "timeUnixNano": now,
+                **value,
+            }
+
+        histograms = []
+        for name, histogram in self.histograms.items():
+            bounds, counts = histogram.explicit_buckets()
+            histograms.append(
+                point(
+                    name,
+                    "operation",
+                    count=str(histogram.count),
+                    sum=float(histogram.total),
+                    max=float(histogram.max),
+                    bucketCounts=[str(count) for count in counts],
+                    explicitBounds=[float(bound) for bound in bounds],
+                )
+            )
+        return [
+            {
+                "name": "pytest_broadcaster.operation.duration",
+                "unit": "ns",
+                "histogram": {
+                    "aggregationTemporality": AGGREGATION_TEMPORALITY_CUMULATIVE,
+                    "dataPoints": histograms,
+                },
+            },
+            _make_sum(
+                "pytest_broadcaster.events",
+                "{event}",
+                [
+                    point(name, "destination", asInt=str(count))
+                    for name, count in self.events.items()
+                ],
+            ),
+            {
+                "name": "pytest_broadcaster.events.rate",
+                "unit": "{event}/s",
+                "gauge": {
+                    "dataPoints": [
+                        point(name, "destination", asDouble=count / elapsed)
+                        for name, count in self.events.items()
+                    ]
+                },
+            },
+            _make_sum(
+                "pytest_broadcaster.bytes",
+                "By",
+                [
+                    point(name, "destination", asInt=str(size))
+                    for name, size in self.bytes_out.items()
+                ],
+            ),
+            {
+                "name": "pytest_broadcaster.queue.depth",
+                "unit": "{event}",
+                "gauge": {
+                    "dataPoints": [
+                        {
+                            "attributes": make_attributes({"destination": name}),
+                            "timeUnixNano": str(timestamp),
+                            "asInt": str(depth),
+                        }
+                        for name, samples in self.queue_depths.items()
+                        for timestamp, depth in samples
+                    ]
+                },
+            },
+        ]
+
+    def _add_span(self, name: str, duration: int, status: int) -> None:
+        end = time.time_ns()
+        span = make_span(
+            self.trace_id,
+            new_span_id(),
+            self.root_span_id,
+            name,
+            end - duration,
+            end,
+            status_code=status,
+        )
+        # Operations may be recorded from the threads of parallel destinations
+        with self._lock:
+            self.spans.append(span)
+            if len(self.spans) < self.batch_size:
+                return
+            self._sample_queues(end)
+            spans, self.spans = self.spans, []
+            self.exporter.export(make_traces_request(spans))
+
+    def _sample_queues(self, timestamp: int) -> None:
+        for name, destination in self._queues.items():
+            self.queue_depths[name].append((timestamp, destination.queue_depth))
+
+
+def _make_sum(name: str, unit: str, points: list[dict[str, Any]]) -> dict[str, Any]:
+    return {
+        "name": name,
+        "unit": unit,
+        "sum": {
+            "aggregationTemporality": AGGREGATION_TEMPORALITY_CUMULATIVE,
+            "isMonotonic": True,
+            "dataPoints": points,
+        },
+    }
+
+
+class InstrumentedDestination(ProfiledDestination):
+    """A profiled destination also counting the events and bytes it writes.
+
+    Bytes are counted for payloads encoded by the destination codec only, without
+    encoding payloads which the destination did not encode itself.
+    """
+
+    profiler: Instrumentation
+
+    def __init__(
+        self, destination: Destination, profiler: Instrumentation, name: str
+    ) -> None:
+        super().__init__(destination, profiler, name)
+
+    def write_encoded_event(self, payload: EncodedPayload[SessionEvent]) -> None:
+        super().write_encoded_event(payload)
+        self.profiler.count(self.name, self._size(payload))
+
+    def write_encoded_result(self, payload: EncodedPayload[SessionResult]) -> None:
+        super().write_encoded_result(payload)
+        self.profiler.count(self.name, self._size(payload), events=0)
+
+    def _size(self, payload: EncodedPayload[Any]) -> int | None:
+        codec = getattr(self.destination, "codec", None)
+        if codec is None:
+            return None
+        encoded = payload.encoded(codec)
+        return None if encoded is None else len(encoded)
+
+
+if TYPE_CHECKING:
+    # Make sure the class implements the Destination interface
+    from ._json_files import JSONLinesFile
+
+    InstrumentedDestination(
+        JSONLinesFile("fake.jsonl"),
+        Instrumentation(OTLPFileExporter("fake.jsonl")),
+        "fake",
+    )
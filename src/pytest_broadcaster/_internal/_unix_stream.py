@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import os
+import select
+import socket
+import stat
+import struct
+import time
+import warnings
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+from pytest_broadcaster.interfaces import Destination
+
+from ._codecs import EncodedPayload, JSONCodec
+
+if TYPE_CHECKING:
+    from pytest_broadcaster.interfaces import Codec
+    from pytest_broadcaster.models.session_event import SessionEvent
+    from pytest_broadcaster.models.session_result import SessionResult
+
+
+_LENGTH_PREFIX = struct.Struct("!I")
+
+
+def make_frame(payload: bytes) -> bytes:
+    """Prefix a payload with its length as a 4-bytes big-endian unsigned integer."""
+    return _LENGTH_PREFIX.pack(len(payload)) + payload
+
+
+class UnixStream(Destination):
+    def __init__(
+        self,
+        path: str,
+        *,
+        buffer_size: int = 1024 * 1024,
+        timeout: float = 10,
+        codec: Codec | None = None,
+    ) -> None:
+        self.path = Path(path)
+        self.buffer_size = buffer_size
+        self.timeout = timeout
+        self.codec = codec or JSONCodec()
+        self.dropped_events = 0
+        self._buffer = bytearray()
+        self._fd: int | None = None
+        self._socket: socket.socket | None = None
+        self._send: Callable[[memoryview], int] | None = None
+
+    def _open(self) -> None:
+        if self._send is not None:
+            msg = "Unix stream is already opened"
+            raise RuntimeError(msg)
+        mode = self.path.stat().st_mode
+        if stat.S_ISFIFO(mode):
+            # Opening a FIFO in non-blocking mode fails if there is no reader.
+            fd = os.open(self.path, os.O_WRONLY | os.O_NONBLOCK)
+            self._fd = fd
+            self._send = lambda data: os.write(fd, data)
+        elif stat.S_ISSOCK(mode):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(self.path.as_posix())
+            except OSError:
+                sock.close()
+                raise
+            sock.setblocking(False)  # noqa: FBT003
+            self._fd = sock.fileno()
+            self._socket = sock
+            self._send = sock.send
+        else:
+            msg = f"Not a unix socket or a named pipe: {self.path.as_posix()}"
+            raise ValueError(msg)
+
+    def close(self) -> None:
+        if self._send is None:
+            return
+        try:
+            self._drain()
+        except OSError as e:
+            warnings.warn(f"Failed to flush unix stream: {e!r}", stacklevel=1)
+        finally:
+            if self._socket is not None:
+                self._socket.close()
+            elif self._fd is not None:
+                os.close(self._fd)
+            self._socket = None
+            self._fd = None
+            self._send = None
+        if self.dropped_events:
+            warnings.warn(
+                f"Unix stream buffer was full, {self.dropped_events} events were "
+                f"dropped: {self.path.as_posix()}",
+                stacklevel=1,
+            )
+
+    def write_result(self, result: SessionResult) -> None:
+        # We don't write results to unix streams
+        pass
+
+    def write_event(self, event: SessionEvent) -> None:
+        self.write_encoded_event(EncodedPayload(event))
+
+    def write_encoded_event(self, payload: EncodedPayload[SessionEvent]) -> None:
+        if self._send is None:
+            self._open()
+        frame = make_frame(payload.encode(self.codec))
+        if len(self._buffer) + len(frame) > self.buffer_size:
+            self._flush()
+            if len(self._buffer) + len(frame) > self.buffer_size:
+                # Reported once when the stream is closed
+                self.dropped_events += 1
+                return
+        self._buffer += frame
+        self._flush()
+
+    def summary(self) -> str | None:
+        return f"Stream events to unix stream: {self.path.as_posix()}"
+
+    def _flush(self) -> None:
+        """Write as much of the buffer as possible without blocking."""
+        assert self._send, "stream expected to be opened"
+        while self._buffer:
+            try:
+                with memoryview(self._buffer) as view:
+                    written = self._send(view)
+            except BlockingIOError:
+                return
+            del self._buffer[:written]
+
+    def _drain(self) -> None:
+        """Wait until the whole buffer is written or until timeout is reached."""
+        assert self._fd is not None, "stream expected to be opened"
+        deadline = time.monotonic() + self.timeout
+        self._flush()
+        while self._buffer:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                msg = (
+                    f"Timeout while writing to unix stream: {self.path.as_posix()}, "
+                    f"{len(self._buffer)} bytes were not written"
+                )
+                raise TimeoutError(msg)
+            select.select([], [self._fd], [], remaining)
+            self._flush()
+
+
+if TYPE_CHECKING:
+    # Make sure the class implements the Destination interface
+    UnixStream("fake.sock")
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import functools
+import os
 import re
 from dataclasses import dataclass, field
-from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 from _pytest._code.code import (
@@ -15,6 +16,18 @@ from _pytest.outcomes import Skipped
 if TYPE_CHECKING:
     import pytest
 
+
+def _normalize_path(path: str | os.PathLike[str]) -> str:
+    """Normalize separators, and case on case-insensitive filesystems."""
+    return os.path.normcase(os.path.normpath(path))
+
+
+_HIDDEN_PREFIXES = (
+    os.path.join(_normalize_path(_PLUGGY_DIR), ""),  # noqa: PTH118
+    os.path.join(_normalize_path(_PYTEST_DIR), ""),  # noqa: PTH118
+)
+"""Normalized directories of pluggy and pytest, with a trailing separator."""
+
 __NODE_ID__ = re.compile(
     r"(?P<module>.+)\.py(?:::(?P<class>[^:]+)(?:::.+)?)?::(?P<function>[^\[]+)(?:\[(?P<params>.*)\])?"
 )
@@ -46,6 +59,13 @@ class TracebackLine:
     message: str
 
 
+def truncate_text(text: str, max_length: int | None) -> str:
+    """Truncate a text to at most max_length characters followed by a notice."""
+    if max_length is None or len(text) <= max_length:
+        return text
+    return f"{text[:max_length]}... [truncated {len(text) - max_length} characters]"
+
+
 def parse_node_id(node_id: str) -> tuple[str, str, str, str]:
     match = re.search(__NODE_ID__, node_id)
     if match:
@@ -83,6 +103,7 @@ def format_mark(mark: pytest.Mark) -> str:
     return mark.name
 
 
+@functools.lru_cache(maxsize=1024)
 def filter_traceback(raw_filename: str) -> bool:
     """Return True if a TracebackEntry instance should be included in tracebacks.
 
@@ -90,17 +111,14 @@ def filter_traceback(raw_filename: str) -> bool:
 
     * dynamically generated code (no code to show up for it);
     * internal traceback from pytest or its internal libraries, py and pluggy.
+
+    Decisions are cached per filename, since deep tracebacks most often repeat
+    the same few files.
     """
     is_generated = "<" in raw_filename and ">" in raw_filename
     if is_generated:
         return False
-
-    p = Path(raw_filename)
-
-    parents = p.parents
-    if _PLUGGY_DIR in parents:
-        return False
-    return _PYTEST_DIR not in parents
+    return not _normalize_path(raw_filename).startswith(_HIDDEN_PREFIXES)
 
 
 def make_traceback_line(loc: ReprFileLocation) -> TracebackLine:
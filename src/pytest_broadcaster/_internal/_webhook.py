@@ -7,9 +7,10 @@ from urllib.parse import urlparse
 
 from pytest_broadcaster.interfaces import Destination
 
-from ._json_files import encode
+from ._codecs import EncodedPayload, JSONCodec
 
 if TYPE_CHECKING:
+    from pytest_broadcaster.interfaces import Codec
     from pytest_broadcaster.models.session_event import SessionEvent
     from pytest_broadcaster.models.session_result import SessionResult
 
@@ -22,6 +23,7 @@ class HTTPWebhook(Destination):
         emit_events: bool = False,
         emit_result: bool = True,
         headers: dict[str, str] | None = None,
+        codec: Codec | None = None,
     ) -> None:
         parsed_url = urlparse(url)
         host = parsed_url.hostname
@@ -35,25 +37,34 @@ class HTTPWebhook(Destination):
         self.host = host
         self.emit_events = emit_events
         self.emit_result = emit_result
+        self.codec = codec or JSONCodec()
         self.uses_https = self.parsed_url.scheme == "https"
         if self.uses_https:
             self.headers.setdefault("Host", self.host)
 
     def write_event(self, event: SessionEvent) -> None:
         """Write an event to the destination."""
-        if self.emit_events:
-            self._post(encode(event))
+        self.write_encoded_event(EncodedPayload(event))
 
     def write_result(self, result: SessionResult) -> None:
         """Write the session result to the destination."""
+        self.write_encoded_result(EncodedPayload(result))
+
+    def write_encoded_event(self, payload: EncodedPayload[SessionEvent]) -> None:
+        """Write an event shared with other destinations."""
+        if self.emit_events:
+            self._post(payload.encode(self.codec))
+
+    def write_encoded_result(self, payload: EncodedPayload[SessionResult]) -> None:
+        """Write the session result shared with other destinations."""
         if self.emit_result:
-            self._post(encode(result))
+            self._post(payload.encode(self.codec))
 
     def summary(self) -> str | None:
         """Return a summary of the destination."""
         return f"Send report to HTTP webhook: {self.url}"
 
-    def _post(self, data: str) -> None:
+    def _post(self, data: bytes) -> None:
         if self.parsed_url.query:
             path_with_params = f"{self.parsed_url.path}?{self.parsed_url.query}"
         else:
@@ -68,7 +79,7 @@ class HTTPWebhook(Destination):
             url=path_with_params,
             body=data,
             headers={
-                "Content-Type": "application/json",
+                "Content-Type": self.codec.content_type,
                 "Content-Length": str(len(data)),
                 **self.headers,
             },
@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import os
+import socket
+import ssl
+import struct
+import uuid
+import zlib
+from collections import deque
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
+
+from pytest_broadcaster.interfaces import Destination
+
+from ._codecs import EncodedPayload, JSONCodec
+
+if TYPE_CHECKING:
+    from pytest_broadcaster.interfaces import Codec
+    from pytest_broadcaster.models.session_event import SessionEvent
+    from pytest_broadcaster.models.session_result import SessionResult
+
+
+_WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+_OPCODE_TEXT = 0x1
+_OPCODE_BINARY = 0x2
+_OPCODE_CLOSE = 0x8
+_FIN = 0x80
+_RSV1 = 0x40
+_MASK = 0x80
+_DEFLATE_TAIL = b"\x00\x00\xff\xff"
+_NORMAL_CLOSURE = 1000
+
+STREAM_HEADER = "Pytest-Broadcaster-Stream"
+"""Request header holding the unique ID of the event stream."""
+SEQUENCE_HEADER = "Pytest-Broadcaster-Sequence"
+"""Request header holding the sequence number of the next frame to be sent."""
+RESUME_HEADER = "Pytest-Broadcaster-Resume-From"
+"""Response header holding the sequence number the server expects next."""
+
+
+def mask_payload(payload: bytes, mask: bytes) -> bytes:
+    """Apply a websocket masking key to a payload."""
+    size = len(payload)
+    if not size:
+        return payload
+    key = (mask * (size // 4 + 1))[:size]
+    return (int.from_bytes(payload, "big") ^ int.from_bytes(key, "big")).to_bytes(
+        size, "big"
+    )
+
+
+def make_accept_key(key: str) -> str:
+    """Return the value of the `Sec-WebSocket-Accept` header for a given key."""
+    digest = hashlib.sha1((key + _WEBSOCKET_GUID).encode()).digest()  # noqa: S324
+    return base64.b64encode(digest).decode()
+
+
+class WebSocketStream(Destination):
+    def __init__(  # noqa: PLR0913
+        self,
+        url: str,
+        *,
+        permessage_deflate: bool = False,
+        headers: dict[str, str] | None = None,
+        timeout: float = 10,
+        max_retries: int = 3,
+        replay_buffer_size: int = 1024,
+        codec: Codec | None = None,
+    ) -> None:
+        parsed_url = urlparse(url)
+        host = parsed_url.hostname
+        if parsed_url.scheme not in ("ws", "wss") or not host:
+            msg = f"Invalid websocket URL: {url}"
+            raise ValueError(msg)
+        self.url = url
+        self.host = host
+        self.uses_tls = parsed_url.scheme == "wss"
+        self.port = parsed_url.port or (443 if self.uses_tls else 80)
+        self.path = parsed_url.path or "/"
+        if parsed_url.query:
+            self.path = f"{self.path}?{parsed_url.query}"
+        self.headers = headers or {}
+        self.headers.setdefault("User-Agent", "pytest-broadcaster")
+        self.permessage_deflate = permessage_deflate
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.codec = codec or JSONCodec()
+        self.stream_id = str(uuid.uuid4())
+        self._opcode = _OPCODE_BINARY if self.codec.binary else _OPCODE_TEXT
+        self._sequence = 0
+        self._replay: deque[tuple[int, bytes]] = deque(maxlen=replay_buffer_size)
+        self._socket: socket.socket | None = None
+        self._compressor: zlib._Compress | None = None
+        self._reset_compressor = False
+
+    def write_event(self, event: SessionEvent) -> None:
+        """Write an event to the destination."""
+        self.write_encoded_event(EncodedPayload(event))
+
+    def write_encoded_event(self, payload: EncodedPayload[SessionEvent]) -> None:
+        """Write an event shared with other destinations."""
+        data = payload.encode(self.codec)
+        sequence = self._sequence
+        self._sequence += 1
+        self._replay.append((sequence, data))
+        if self._socket is None:
+            self._connect_and_replay(sequence)
+            return
+        try:
+            self._socket.sendall(self._make_frame(self._opcode, data))
+        except OSError:
+            self._disconnect()
+            self._connect_and_replay(sequence)
+
+    def write_result(self, result: SessionResult) -> None:
+        # We don't write results to websocket streams
+        pass
+
+    def summary(self) -> str | None:
+        """Return a summary of the destination."""
+        return f"Stream events to websocket: {self.url}"
+
+    def close(self) -> None:
+        if self._socket is None:
+            return
+        for _ in range(self.max_retries + 1):
+            if self._close_handshake():
+                break
+            # The server did not acknowledge the close frame, which means that
+            # the connection was lost and that previous frames may have been lost
+            # as well. Reconnect to let the server tell us where to resume from.
+            self._disconnect()
+            try:
+                self._connect_and_replay(self._sequence)
+            except RuntimeError:
+                break
+        self._disconnect()
+
+    def _connect_and_replay(self, sequence: int) -> None:
+        """Connect to the server and send all frames not received yet."""
+        error: OSError | None = None
+        for _ in range(self.max_retries + 1):
+            try:
+                resume_from = self._connect(sequence)
+                self._replay_from(sequence if resume_from is None else resume_from)
+            except OSError as e:  # noqa: PERF203
+                self._disconnect()
+                error = e
+            else:
+                return
+        msg = f"Failed to send event to websocket {self.url}: {error!r}"
+        raise RuntimeError(msg)
+
+    def _replay_from(self, sequence: int) -> None:
+        assert self._socket, "socket expected to be opened"
+        if self._replay and sequence < self._replay[0][0]:
+            msg = (
+                f"Cannot resume websocket stream from sequence {sequence}: "
+                f"oldest buffered frame is {self._replay[0][0]}"
+            )
+            raise RuntimeError(msg)
+        for frame_sequence, payload in self._replay:
+            if frame_sequence >= sequence:
+                self._socket.sendall(self._make_frame(self._opcode, payload))
+
+    def _connect(self, sequence: int) -> int | None:
+        """Open the connection and return the sequence to resume from (if any)."""
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        # Send small frames right away instead of waiting for pending acknowledgements
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if self.uses_tls:
+            context = ssl.create_default_context()
+            sock = context.wrap_socket(sock, server_hostname=self.host)
+        self._socket = sock
+        key = base64.b64encode(os.urandom(16)).decode()
+        lines = [
+            f"GET {self.path} HTTP/1.1",
+            f"Host: {self.host}:{self.port}",
+            "Upgrade: websocket",
+            "Connection: Upgrade",
+            f"Sec-WebSocket-Key: {key}",
+            "Sec-WebSocket-Version: 13",
+            f"{STREAM_HEADER}: {self.stream_id}",
+            f"{SEQUENCE_HEADER}: {sequence}",
+        ]
+        if self.permessage_deflate:
+            lines.append("Sec-WebSocket-Extensions: permessage-deflate")
+        lines.extend(f"{name}: {value}" for name, value in self.headers.items())
+        sock.sendall(("\r\n".join(lines) + "\r\n\r\n").encode())
+        status, headers = self._read_handshake_response()
+        if status != "101":
+            msg = f"Unexpected websocket handshake status from {self.url}: {status}"
+            raise ConnectionError(msg)
+        if headers.get("sec-websocket-accept") != make_accept_key(key):
+            msg = f"Invalid websocket accept key received from {self.url}"
+            raise ConnectionError(msg)
+        extensions = headers.get("sec-websocket-extensions", "")
+        if self.permessage_deflate and "permessage-deflate" in extensions:
+            self._compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+            self._reset_compressor = "client_no_context_takeover" in extensions
+        else:
+            self._compressor = None
+        if resume_from := headers.get(RESUME_HEADER.lower()):
+            return int(resume_from)
+        return None
+
+    def _read_handshake_response(self) -> tuple[str, dict[str, str]]:
+        assert self._socket, "socket expected to be opened"
+        data = b""
+        while b"\r\n\r\n" not in data:
+            chunk = self._socket.recv(4096)
+            if not chunk:
+                msg = f"Connection closed during websocket handshake: {self.url}"
+                raise ConnectionError(msg)
+            data += chunk
+        status_line, *header_lines = (
+            data.split(b"\r\n\r\n", 1)[0].decode("latin-1").split("\r\n")
+        )
+        headers: dict[str, str] = {}
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        parts = status_line.split(" ", 2)
+        return parts[1] if len(parts) > 1 else "", headers
+
+    def _close_handshake(self) -> bool:
+        """Send a close frame and wait for the server to acknowledge it."""
+        assert self._socket, "socket expected to be opened"
+        try:
+            self._socket.sendall(
+                self._make_frame(_OPCODE_CLOSE, struct.pack("!H", _NORMAL_CLOSURE))
+            )
+            while True:
+                opcode = self._read_frame()
+                if opcode is None:
+                    return False
+                if opcode == _OPCODE_CLOSE:
+                    return True
+        except OSError:
+            return False
+
+    def _read_frame(self) -> int | None:
+        """Read a single frame sent by the server and return its opcode."""
+        header = self._recv_exactly(2)
+        if header is None:
+            return None
+        size = header[1] & 0x7F
+        if size == 126:  # noqa: PLR2004
+            extended = self._recv_exactly(2)
+            size = struct.unpack("!H", extended)[0] if extended else 0
+        elif size == 127:  # noqa: PLR2004
+            extended = self._recv_exactly(8)
+            size = struct.unpack("!Q", extended)[0] if extended else 0
+        if size and self._recv_exactly(size) is None:
+            return None
+        return header[0] & 0x0F
+
+    def _recv_exactly(self, size: int) -> bytes | None:
+        assert self._socket, "socket expected to be opened"
+        data = b""
+        while len(data) < size:
+            chunk = self._socket.recv(size - len(data))
+            if not chunk:
+                return None
+            data += chunk
+        return data
+
+    def _disconnect(self) -> None:
+        if self._socket is None:
+            return
+        try:
+            self._socket.close()
+        finally:
+            self._socket = None
+
+    def _make_frame(self, opcode: int, payload: bytes) -> bytes:
+        first_byte = _FIN | opcode
+        if self._compressor is not None and opcode != _OPCODE_CLOSE:
+            if self._reset_compressor:
+                self._compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+            payload = self._compressor.compress(payload) + self._compressor.flush(
+                zlib.Z_SYNC_FLUSH
+            )
+            payload = payload.removesuffix(_DEFLATE_TAIL)
+            first_byte |= _RSV1
+        size = len(payload)
+        if size < 126:  # noqa: PLR2004
+            header = struct.pack("!BB", first_byte, _MASK | size)
+        elif size < 1 << 16:
+            header = struct.pack("!BBH", first_byte, _MASK | 126, size)
+        else:
+            header = struct.pack("!BBQ", first_byte, _MASK | 127, size)
+        mask = os.urandom(4)
+        return header + mask + mask_payload(payload, mask)
+
+
+if TYPE_CHECKING:
+    # Make sure the class implements the Destination interface
+    WebSocketStream("ws://example.com")
@@ -28,6 +28,10 @@ def pytest_broadcaster_add_destination(add: Callable[[Destination], None], /) ->
     ```bash
     pytest
     ```
+
+    When the `--collect-log-fast` option is used, destinations receive test case
+    events as [WireEvent][pytest_broadcaster.WireEvent] dictionaries instead of
+    models.
     """
 
 
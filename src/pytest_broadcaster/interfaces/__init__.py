@@ -3,15 +3,17 @@
 from __future__ import annotations
 
 import abc
-from typing import TYPE_CHECKING, Any, Literal
+from typing import TYPE_CHECKING, Any, BinaryIO, Literal
 
 from typing_extensions import Self
 
 if TYPE_CHECKING:
     import warnings
+    from collections.abc import Iterator
 
     import pytest
 
+    from pytest_broadcaster._internal._codecs import EncodedPayload
     from pytest_broadcaster.models.collect_report import CollectReport
     from pytest_broadcaster.models.error_message import ErrorMessage
     from pytest_broadcaster.models.session_end import SessionEnd
@@ -20,6 +22,7 @@ if TYPE_CHECKING:
     from pytest_broadcaster.models.session_start import SessionStart
     from pytest_broadcaster.models.test_case_call import TestCaseCall
     from pytest_broadcaster.models.test_case_end import TestCaseEnd
+    from pytest_broadcaster.models.test_case_report_event import TestCaseReportEvent
     from pytest_broadcaster.models.test_case_setup import TestCaseSetup
     from pytest_broadcaster.models.test_case_teardown import TestCaseTeardown
     from pytest_broadcaster.models.warning_message import WarningMessage
@@ -40,6 +43,22 @@ class Destination(metaclass=abc.ABCMeta):
     def summary(self) -> str | None:
         """Return a summary of the destination."""
 
+    def write_encoded_event(self, payload: EncodedPayload[SessionEvent]) -> None:
+        """Write an event shared with other destinations.
+
+        Destinations should encode the event using `payload.encode(codec)`, so that
+        the event is encoded once per codec no matter how many destinations write
+        it. Writes the event using `write_event` by default.
+        """
+        self.write_event(payload.value)
+
+    def write_encoded_result(self, payload: EncodedPayload[SessionResult]) -> None:
+        """Write the session result shared with other destinations.
+
+        Writes the session result using `write_result` by default.
+        """
+        self.write_result(payload.value)
+
     def open(self) -> None:  # noqa: B027
         """Open the destination. No-op by default."""
 
@@ -56,6 +75,50 @@ class Destination(metaclass=abc.ABCMeta):
         self.close()
 
 
+class Codec(metaclass=abc.ABCMeta):
+    """An interface to encode events and results into payloads, and decode them back."""
+
+    name: str
+    """The name of the codec."""
+
+    content_type: str
+    """The media type of encoded payloads."""
+
+    binary: bool
+    """Whether encoded payloads are binary.
+
+    Text payloads are made of one or more lines, and are written followed by a line
+    break within files. Binary payloads must be self-delimiting instead.
+    """
+
+    stateless: bool = False
+    """Whether payloads are encoded independently of previously encoded payloads.
+
+    Payloads encoded by stateless codecs are shared between codec instances of the
+    same name.
+    """
+
+    @abc.abstractmethod
+    def encode(self, data: object) -> bytes:
+        """Encode an event or a result converted into a dictionary."""
+
+    def iter_encode(self, data: object) -> Iterator[bytes]:
+        """Encode an event or a result converted into a dictionary, in chunks.
+
+        Joined chunks are identical to the payload returned by `encode`. Yields a
+        single chunk by default.
+        """
+        yield self.encode(data)
+
+    @abc.abstractmethod
+    def decode(self, payload: bytes) -> Any:  # noqa: ANN401
+        """Decode a single payload."""
+
+    @abc.abstractmethod
+    def iter_decode(self, stream: BinaryIO) -> Iterator[Any]:
+        """Decode all payloads written one after another into a stream."""
+
+
 class Reporter(metaclass=abc.ABCMeta):
     """An interface to create events and results."""
 
@@ -99,3 +162,19 @@ class Reporter(metaclass=abc.ABCMeta):
     @abc.abstractmethod
     def make_test_case_end(self, node_id: str) -> TestCaseEnd:
         """Return a test case end event."""
+
+
+class CoalescingReporter(Reporter):
+    """An interface to create events and results, including coalesced events.
+
+    Coalesced events can only be enabled when using a reporter implementing this
+    interface.
+    """
+
+    @abc.abstractmethod
+    def make_test_case_report(self, node_id: str) -> TestCaseReportEvent:
+        """Return a test case report event combining all steps of a test case.
+
+        This method is called instead of `make_test_case_end` when coalesced events
+        are enabled.
+        """
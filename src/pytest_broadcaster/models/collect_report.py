@@ -3,9 +3,10 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
+from pytest_broadcaster._internal._slots import dataclass
+
 if TYPE_CHECKING:
     from . import test_case, test_directory, test_module, test_suite
 
@@ -22,9 +23,9 @@ class CollectReport:
     """
     The node id of the node for which items were collected (the top level root directory has an empty node id).
     """
-    timestamp: str
+    timestamp: str | int
     """
-    The date and time when the report was generated in ISO 8601 format.
+    The date and time when the report was generated in ISO 8601 format, or in nanoseconds since epoch when numeric timestamps are enabled.
     """
     items: list[
         test_directory.TestDirectory
@@ -3,10 +3,11 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
 from enum import Enum
 from typing import TYPE_CHECKING
 
+from pytest_broadcaster._internal._slots import dataclass
+
 if TYPE_CHECKING:
     from . import location, traceback
 
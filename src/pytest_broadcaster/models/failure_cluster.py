@@ -0,0 +1,41 @@
+# generated by datamodel-codegen:
+#   filename:  failure_cluster.json
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from pytest_broadcaster._internal._slots import dataclass
+
+if TYPE_CHECKING:
+    from . import location
+
+
+@dataclass
+class FailureCluster:
+    """A group of test case errors sharing the same fingerprint."""
+
+    fingerprint: str
+    """
+    Fingerprint of the errors, computed from the exception type, the crash location and the traceback entries.
+    """
+    exception_type: str
+    """
+    Exception type name.
+    """
+    message: str
+    """
+    Crash message of the first error.
+    """
+    count: int
+    """
+    Number of errors within the cluster.
+    """
+    node_ids: list[str]
+    """
+    Node IDs of the test cases where errors occured.
+    """
+    location: location.Location | None = None
+    """
+    Crash location of the errors.
+    """
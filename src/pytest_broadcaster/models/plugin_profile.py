@@ -0,0 +1,52 @@
+# generated by datamodel-codegen:
+#   filename:  plugin_profile.json
+
+from __future__ import annotations
+
+from pytest_broadcaster._internal._slots import dataclass
+
+
+@dataclass
+class Timing:
+    name: str
+    """
+    The name of the profiled operation.
+    """
+    count: int
+    """
+    The number of times the operation was performed.
+    """
+    total: int
+    """
+    The total time spent in the operation in nanoseconds.
+    """
+    p50: int
+    """
+    The median duration of the operation in nanoseconds.
+    """
+    p99: int
+    """
+    The 99th percentile duration of the operation in nanoseconds.
+    """
+    max: int
+    """
+    The maximum duration of the operation in nanoseconds.
+    """
+
+
+@dataclass
+class PluginProfile:
+    """Event emitted when profiling is enabled, holding the time spent by the plugin itself."""
+
+    session_id: str
+    """
+    The unique if of this test session used to aggregate events together.
+    """
+    timings: list[Timing]
+    """
+    Time spent in each profiled operation (reporter methods, encoders and destinations).
+    """
+    event: str = "plugin_profile"
+    """
+    The event type. Always set to 'plugin_profile'.
+    """
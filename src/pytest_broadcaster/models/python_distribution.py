@@ -3,9 +3,10 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
 from enum import Enum
 
+from pytest_broadcaster._internal._slots import dataclass
+
 
 class Releaselevel(Enum):
     """The release level of the python interpreter."""
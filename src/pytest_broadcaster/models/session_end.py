@@ -3,7 +3,7 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from pytest_broadcaster._internal._slots import dataclass
 
 
 @dataclass
@@ -14,9 +14,9 @@ class SessionEnd:
     """
     The unique if of this test session used to aggregate events together.
     """
-    timestamp: str
+    timestamp: str | int
     """
-    The time when the session finished in ISO 8601 format.
+    The time when the session finished in ISO 8601 format, or in nanoseconds since epoch when numeric timestamps are enabled.
     """
     exit_status: int
     """
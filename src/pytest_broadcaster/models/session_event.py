@@ -8,10 +8,12 @@ from typing import Union
 from . import (
     collect_report,
     error_message,
+    plugin_profile,
     session_end,
     session_start,
     test_case_call,
     test_case_end,
+    test_case_report_event,
     test_case_setup,
     test_case_teardown,
     warning_message,
@@ -20,6 +22,7 @@ from . import (
 SessionEvent = Union[
     collect_report.CollectReport,
     test_case_end.TestCaseEnd,
+    test_case_report_event.TestCaseReportEvent,
     test_case_setup.TestCaseSetup,
     test_case_teardown.TestCaseTeardown,
     test_case_call.TestCaseCall,
@@ -27,4 +30,5 @@ SessionEvent = Union[
     warning_message.WarningMessage,
     session_start.SessionStart,
     session_end.SessionEnd,
+    plugin_profile.PluginProfile,
 ]
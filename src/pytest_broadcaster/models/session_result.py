@@ -3,13 +3,15 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
+from pytest_broadcaster._internal._slots import dataclass
+
 if TYPE_CHECKING:
     from . import (
         collect_report,
         error_message,
+        failure_cluster,
         project,
         python_distribution,
         test_case_report,
@@ -25,13 +27,13 @@ class SessionResult:
     """
     The unique if of this test session.
     """
-    start_timestamp: str
+    start_timestamp: str | int
     """
-    The start time of the pytest session in ISO 8601 format.
+    The start time of the pytest session in ISO 8601 format, or in nanoseconds since epoch when numeric timestamps are enabled.
     """
-    stop_timestamp: str
+    stop_timestamp: str | int
     """
-    The stop time of the pytest session in ISO 8601 format.
+    The stop time of the pytest session in ISO 8601 format, or in nanoseconds since epoch when numeric timestamps are enabled.
     """
     python: python_distribution.PythonDistribution
     """
@@ -65,6 +67,10 @@ class SessionResult:
     """
     Test reports generated during the session.
     """
+    failure_clusters: list[failure_cluster.FailureCluster] | None = None
+    """
+    Test case errors grouped by fingerprint. Only set when errors are deduplicated.
+    """
     project: project.Project | None = None
     """
     The project that is being tested.
@@ -3,9 +3,10 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
+from pytest_broadcaster._internal._slots import dataclass
+
 if TYPE_CHECKING:
     from . import project, python_distribution
 
@@ -18,9 +19,9 @@ class SessionStart:
     """
     The unique if of this test session used to aggregate events together.
     """
-    timestamp: str
+    timestamp: str | int
     """
-    The date and time when the test session was started in ISO 8601 format.
+    The date and time when the test session was started in ISO 8601 format, or in nanoseconds since epoch when numeric timestamps are enabled.
     """
     python: python_distribution.PythonDistribution
     """
@@ -3,9 +3,10 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
+from pytest_broadcaster._internal._slots import dataclass
+
 if TYPE_CHECKING:
     from . import traceback
 
@@ -22,3 +23,11 @@ class TestCaseError:
     """
     Error traceback.
     """
+    fingerprint: str | None = None
+    """
+    Fingerprint of the error, computed from the exception type, the crash location and the traceback entries. Only set when errors are deduplicated.
+    """
+    duplicate: bool | None = False
+    """
+    True when an error with the same fingerprint was already emitted. Message is then the crash message only, and traceback is omitted.
+    """
@@ -0,0 +1,59 @@
+# generated by datamodel-codegen:
+#   filename:  test_case_report_event.json
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from pytest_broadcaster._internal._slots import dataclass
+
+if TYPE_CHECKING:
+    from . import (
+        outcome,
+        test_case_call,
+        test_case_end,
+        test_case_setup,
+        test_case_teardown,
+    )
+
+
+@dataclass
+class TestCaseReportEvent:
+    """Event emitted when a test case is finished, combining all steps of the test case. Only emitted instead of step events when coalesced events are enabled."""
+
+    session_id: str
+    """
+    The unique if of this test session used to aggregate events together.
+    """
+    node_id: str
+    """
+    The node ID of the test case.
+    """
+    outcome: outcome.Outcome
+    """
+    Outcome of the test case.
+    """
+    duration: float
+    """
+    Duration of the test case in seconds (including setup and teardown).
+    """
+    setup: test_case_setup.TestCaseSetup
+    """
+    Setup step of the test case.
+    """
+    teardown: test_case_teardown.TestCaseTeardown
+    """
+    Teardown step of the test case.
+    """
+    finished: test_case_end.TestCaseEnd
+    """
+    View of the test case after it has finished.
+    """
+    event: str = "case_report"
+    """
+    The event type. Always set to 'case_report'.
+    """
+    call: test_case_call.TestCaseCall | None = None
+    """
+    Call step of the test case (optional).
+    """
@@ -3,9 +3,10 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
+from pytest_broadcaster._internal._slots import dataclass
+
 if TYPE_CHECKING:
     from . import outcome, test_case_error
 
@@ -22,13 +23,13 @@ class TestCaseTeardown:
     """
     The node ID of the test case.
     """
-    start_timestamp: str
+    start_timestamp: str | int
     """
-    Start time of the teardown step in ISO 8601 format.
+    Start time of the teardown step in ISO 8601 format, or in nanoseconds since epoch when numeric timestamps are enabled.
     """
-    stop_timestamp: str
+    stop_timestamp: str | int
     """
-    Stop time of the teardown step in ISO 8601 format.
+    Stop time of the teardown step in ISO 8601 format, or in nanoseconds since epoch when numeric timestamps are enabled.
     """
     duration: float
     """
@@ -3,7 +3,7 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from pytest_broadcaster._internal._slots import dataclass
 
 
 @dataclass
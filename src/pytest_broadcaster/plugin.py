@@ -4,23 +4,45 @@ from __future__ import annotations
 
 import warnings
 from contextlib import ExitStack
-from typing import TYPE_CHECKING, Any, Literal
+from typing import TYPE_CHECKING, Any, Literal, cast
 
 import pytest
 
 from pytest_broadcaster import hooks
-from pytest_broadcaster._internal._json_files import JSONFile, JSONLinesFile
-from pytest_broadcaster._internal._reporter import DefaultReporter
-from pytest_broadcaster._internal._webhook import HTTPWebhook
+from pytest_broadcaster._internal._constants import COMPRESSIONS, FORMATS, QUEUE_SIZE
 
 if TYPE_CHECKING:
     from _pytest.terminal import TerminalReporter
 
-    from pytest_broadcaster.interfaces import Destination, Reporter
+    from pytest_broadcaster._internal._profiling import Profiler
+    from pytest_broadcaster._internal._telemetry import Instrumentation
+    from pytest_broadcaster.interfaces import (
+        CoalescingReporter,
+        Destination,
+        Reporter,
+    )
+    from pytest_broadcaster.models.failure_cluster import FailureCluster
     from pytest_broadcaster.models.session_event import SessionEvent
     from pytest_broadcaster.models.session_result import SessionResult
 
 __PLUGIN_ATTR__ = "_broadcaster_plugin"
+MAX_FAILURE_CLUSTERS = 10
+
+# Options requesting at least one destination, or output of the plugin itself
+_ENABLING_OPTIONS = (
+    "collect_report",
+    "collect_log",
+    "collect_url",
+    "collect_log_url",
+    "collect_ws_url",
+    "collect_log_socket",
+    "collect_otlp",
+    "collect_metrics_port",
+    "collect_metrics_file",
+    "broadcaster_profile",
+    "broadcaster_trace",
+    "broadcaster_validate",
+)
 
 
 def pytest_addoption(parser: pytest.Parser) -> None:
@@ -35,6 +57,37 @@ def pytest_addoption(parser: pytest.Parser) -> None:
     - Add the `--collect-log` option to the group.
     - Add the `--collect-url` option to the group.
     - Add the `--collect-log-url` option to the group.
+    - Add the `--collect-ws-url` option to the group.
+    - Add the `--collect-ws-deflate` option to the group.
+    - Add the `--collect-log-socket` option to the group.
+    - Add the `--collect-log-socket-buffer` option to the group.
+    - Add the `--collect-report-checkpoint` option to the group.
+    - Add the `--collect-report-spool` option to the group.
+    - Add the `--collect-log-rotate-bytes` option to the group.
+    - Add the `--collect-log-rotate-events` option to the group.
+    - Add the `--collect-log-compress` option to the group.
+    - Add the `--collect-report-format` option to the group.
+    - Add the `--collect-log-format` option to the group.
+    - Add the `--collect-timestamps` option to the group.
+    - Add the `--collect-traceback-depth` option to the group.
+    - Add the `--collect-message-length` option to the group.
+    - Add the `--collect-dedup-errors` option to the group.
+    - Add the `--collect-log-coalesce` option to the group.
+    - Add the `--collect-log-fast` option to the group.
+    - Add the `--collect-log-events` option to the group.
+    - Add the `--collect-log-outcomes` option to the group.
+    - Add the `--collect-log-nodes` option to the group.
+    - Add the `--collect-log-sample` option to the group.
+    - Add the `--collect-parallel` option to the group.
+    - Add the `--collect-parallel-queue` option to the group.
+    - Add the `--collect-parallel-drop` option to the group.
+    - Add the `--collect-otlp` option to the group.
+    - Add the `--collect-otlp-protobuf` option to the group.
+    - Add the `--collect-metrics-port` option to the group.
+    - Add the `--collect-metrics-file` option to the group.
+    - Add the `--broadcaster-profile` option to the group.
+    - Add the `--broadcaster-trace` option to the group.
+    - Add the `--broadcaster-validate` option to the group.
 
     See [pytest.hookspec.pytest_addoption][_pytest.hookspec.pytest_addoption].
     """
@@ -70,6 +123,222 @@ def pytest_addoption(parser: pytest.Parser) -> None:
         default=None,
         help="URL to send events to.",
     )
+    group.addoption(
+        "--collect-ws-url",
+        action="store",
+        metavar="url",
+        default=None,
+        help="Websocket URL to stream events to.",
+    )
+    group.addoption(
+        "--collect-ws-deflate",
+        action="store_true",
+        default=False,
+        help="Compress events streamed to websocket using permessage-deflate.",
+    )
+    group.addoption(
+        "--collect-log-socket",
+        action="store",
+        metavar="path",
+        default=None,
+        help="Path to unix socket or named pipe where length-prefixed events are written to.",
+    )
+    group.addoption(
+        "--collect-log-socket-buffer",
+        action="store",
+        metavar="bytes",
+        type=int,
+        default=1024 * 1024,
+        help="Maximum number of bytes buffered when unix socket or named pipe is not writable.",
+    )
+    group.addoption(
+        "--collect-report-checkpoint",
+        action="store",
+        metavar="seconds",
+        type=float,
+        default=None,
+        help="Write partial session result to JSON output file at most once per interval.",
+    )
+    group.addoption(
+        "--collect-report-spool",
+        action="store_true",
+        default=False,
+        help="Spool encoded items to disk during the session, and copy them to JSON output file at the end.",
+    )
+    group.addoption(
+        "--collect-log-rotate-bytes",
+        action="store",
+        metavar="bytes",
+        type=int,
+        default=None,
+        help="Start a new JSON Lines segment when the current one would exceed this size.",
+    )
+    group.addoption(
+        "--collect-log-rotate-events",
+        action="store",
+        metavar="count",
+        type=int,
+        default=None,
+        help="Start a new JSON Lines segment when the current one holds this many events.",
+    )
+    group.addoption(
+        "--collect-log-compress",
+        action="store",
+        choices=list(COMPRESSIONS),
+        default=None,
+        help="Compress JSON Lines segments within a background thread.",
+    )
+    group.addoption(
+        "--collect-report-format",
+        action="store",
+        choices=FORMATS,
+        default="json",
+        help="Format used to encode session result (default to json).",
+    )
+    group.addoption(
+        "--collect-log-format",
+        action="store",
+        choices=FORMATS,
+        default="json",
+        help="Format used to encode session events (default to json).",
+    )
+    group.addoption(
+        "--collect-timestamps",
+        action="store",
+        choices=["iso", "ns"],
+        default="iso",
+        help="Format of timestamps: ISO 8601 strings or integer nanoseconds since epoch (default to iso).",
+    )
+    group.addoption(
+        "--collect-traceback-depth",
+        action="store",
+        metavar="entries",
+        type=int,
+        default=None,
+        help="Maximum number of traceback entries kept for each error, innermost entries are kept.",
+    )
+    group.addoption(
+        "--collect-message-length",
+        action="store",
+        metavar="characters",
+        type=int,
+        default=None,
+        help="Maximum number of characters kept for each error message.",
+    )
+    group.addoption(
+        "--collect-dedup-errors",
+        action="store_true",
+        default=False,
+        help="Emit errors sharing the same fingerprint only once, and report failure clusters.",
+    )
+    group.addoption(
+        "--collect-log-coalesce",
+        action="store_true",
+        default=False,
+        help="Emit a single case_report event per test case instead of one event per step.",
+    )
+    group.addoption(
+        "--collect-log-fast",
+        action="store_true",
+        default=False,
+        help="Build test case events as plain dictionaries, when only event streams are used. Destinations added by hooks receive dictionaries instead of models.",
+    )
+    group.addoption(
+        "--collect-log-events",
+        action="store",
+        metavar="types",
+        default=None,
+        help="Comma-separated list of event types written to event streams (default to all).",
+    )
+    group.addoption(
+        "--collect-log-outcomes",
+        action="store",
+        metavar="outcomes",
+        default=None,
+        help="Comma-separated list of outcomes of test case steps written to event streams (default to all).",
+    )
+    group.addoption(
+        "--collect-log-nodes",
+        action="append",
+        metavar="glob",
+        default=None,
+        help="Glob pattern matching node IDs of events written to event streams. Can be repeated.",
+    )
+    group.addoption(
+        "--collect-log-sample",
+        action="store",
+        metavar="rate",
+        type=float,
+        default=1.0,
+        help="Fraction of passing tests whose events are written to event streams (default to 1).",
+    )
+    group.addoption(
+        "--collect-parallel",
+        action="store_true",
+        default=False,
+        help="Write to each destination within a dedicated thread.",
+    )
+    group.addoption(
+        "--collect-parallel-queue",
+        action="store",
+        metavar="size",
+        type=int,
+        default=QUEUE_SIZE,
+        help=f"Maximum number of events waiting to be written to each destination (default to {QUEUE_SIZE}).",
+    )
+    group.addoption(
+        "--collect-parallel-drop",
+        action="store_true",
+        default=False,
+        help="Drop events instead of waiting when the queue of a destination is full.",
+    )
+    group.addoption(
+        "--collect-otlp",
+        action="store",
+        metavar="endpoint",
+        default=None,
+        help="Export test cases as OpenTelemetry spans, to an OTLP/HTTP traces endpoint URL or to an OTLP JSON file.",
+    )
+    group.addoption(
+        "--collect-otlp-protobuf",
+        action="store_true",
+        default=False,
+        help="Encode spans using protobuf instead of JSON when exporting to an OTLP/HTTP endpoint.",
+    )
+    group.addoption(
+        "--collect-metrics-port",
+        action="store",
+        type=int,
+        metavar="port",
+        default=None,
+        help="Serve live Prometheus metrics on http://127.0.0.1:<port>/metrics during the session.",
+    )
+    group.addoption(
+        "--collect-metrics-file",
+        action="store",
+        metavar="path",
+        default=None,
+        help="Write live Prometheus metrics to a file, for the node exporter textfile collector.",
+    )
+    group.addoption(
+        "--broadcaster-profile",
+        action="store_true",
+        default=False,
+        help="Measure the time spent by the plugin itself, and report it once session is done.",
+    )
+    group.addoption(
+        "--broadcaster-trace",
+        action="store",
+        metavar="path",
+        default=None,
+        help="Record spans and metrics of the plugin itself, and export them to an OTLP JSON file.",
+    )
+    group.addoption(
+        "--broadcaster-validate",
+        action="store_true",
+        default=False,
+        help="Check that events and the session result match the JSON schemas.",
+    )
 
 
 def pytest_configure(config: pytest.Config) -> None:
@@ -80,13 +349,22 @@ def pytest_configure(config: pytest.Config) -> None:
     Perform the following actions:
 
     - Skip if workerinput is present, which means we are in a worker process.
+    - Let the user add their own destinations if they want to.
+    - Skip if no destination is added by the user nor requested using command line
+      options, without importing destinations nor registering the plugin.
     - Create a JSONFile destination if the JSON output file path is present.
-    - Create a JSONLinesFile destination if the JSON Lines output file path is present.
+    - Create a JSONLinesFile destination if the JSON Lines output file path is present,
+      or a RotatingJSONLinesFile destination if rotation or compression is requested.
     - Create an HTTPWebhook destination if the URL is present.
     - Create an HTTPWebhook destination if the URL for the JSON Lines output file is present.
-    - Let the user add their own destinations if they want to.
-    - Create the default reporter.
+    - Create a WebSocketStream destination if the websocket URL is present.
+    - Create a UnixStream destination if the unix socket or named pipe path is present.
+    - Check events against the JSON schemas if requested.
+    - Create the default reporter, or the fast reporter if requested.
     - Let the user set the reporter if they want to.
+    - Wrap the reporter and the destinations with profiling if enabled.
+    - Filter the events written to destinations created from command line options if requested.
+    - Write to each destination within a dedicated thread if requested.
     - Create, open and register the plugin instance.
     - Store the plugin instance in the config object.
 
@@ -96,45 +374,24 @@ def pytest_configure(config: pytest.Config) -> None:
     if hasattr(config, "workerinput"):
         return
 
-    # Create publishers
-    destinations: list[Destination] = []
-
-    if json_path := config.option.collect_report:
-        destinations.append(JSONFile(json_path))
-
-    if json_lines_path := config.option.collect_log:
-        destinations.append(JSONLinesFile(json_lines_path))
-
-    if json_url := config.option.collect_url:
-        destinations.append(HTTPWebhook(json_url, emit_events=False, emit_result=True))
-
-    if json_lines_url := config.option.collect_log_url:
-        destinations.append(
-            HTTPWebhook(json_lines_url, emit_events=True, emit_result=False)
-        )
-
-    def add_destination(destination: Destination) -> None:
-        destinations.append(destination)
+    user_destinations: list[Destination] = []
 
     # Let the user add their own destinations if they want to
-    config.hook.pytest_broadcaster_add_destination(add=add_destination)
-
-    # Create default reporter
-    reporter_to_use: Reporter = DefaultReporter()
-
-    def set_reporter(reporter: Reporter) -> None:
-        nonlocal reporter_to_use
-        reporter_to_use = reporter
+    config.hook.pytest_broadcaster_add_destination(add=user_destinations.append)
+
+    # Skip without importing destinations nor registering the plugin when unused
+    # Compare by identity, since valued options such as port 0 are falsy
+    if not user_destinations and all(
+        getattr(config.option, option) is None
+        or getattr(config.option, option) is False
+        for option in _ENABLING_OPTIONS
+    ):
+        return
 
-    # Let the user set the reporter if they want to
-    config.hook.pytest_broadcaster_set_reporter(set=set_reporter)
+    # Destinations, models and the reporter are only imported once they are used
+    from pytest_broadcaster._internal._configure import make_plugin
 
-    # Create plugin instance.
-    plugin = PytestBroadcasterPlugin(
-        config=config,
-        reporter=reporter_to_use,
-        publishers=destinations,
-    )
+    plugin = make_plugin(config, user_destinations)
     # Open the plugin
     plugin.open()
     # Register the plugin with the plugin manager.
@@ -182,16 +439,32 @@ def pytest_unconfigure(config: pytest.Config) -> None:
 class PytestBroadcasterPlugin:
     """A pytest plugin to log collection to a line-based JSON file."""
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         config: pytest.Config,
         reporter: Reporter,
         publishers: list[Destination],
+        profiler: Profiler | None = None,
+        *,
+        coalesce: bool = False,
+        instrumentation: Instrumentation | None = None,
     ) -> None:
         """Create a new pytest broadcaster plugin."""
         self.config = config
         self.publishers = publishers
         self.reporter = reporter
+        self.profiler = profiler
+        if coalesce:
+            from pytest_broadcaster.interfaces import CoalescingReporter
+
+            if not isinstance(reporter, CoalescingReporter):
+                msg = f"Coalesced events are not supported by {type(reporter).__name__}"
+                raise TypeError(msg)
+        self.coalesce = coalesce
+        self.instrumentation = instrumentation
+        if instrumentation:
+            instrumentation.watch_queues(publishers)
+        self.session_id: str | None = None
         self.stack = ExitStack()
 
     def open(self) -> None:
@@ -219,10 +492,17 @@ class PytestBroadcasterPlugin:
 
         - Close the JSON Lines output file (if any).
         - Write the results to the JSON output file (if any)
+        - Write the plugin profile event and print the timings (if profiling is enabled)
+        - Export the spans and metrics of the plugin (if tracing is enabled)
         """
         if result := self.reporter.make_session_result():
             self._write_result(result)
+        if self.profiler and self.session_id:
+            self._write_event(self.profiler.make_plugin_profile(self.session_id))
+            self._write_profile(self.profiler)
         self.stack.close()
+        if self.instrumentation:
+            self.instrumentation.close(self.session_id)
 
     def pytest_sessionstart(self) -> None:
         """Write a session start event.
@@ -232,7 +512,9 @@ class PytestBroadcasterPlugin:
 
         See [pytest.hookspec.pytest_sessionstart][_pytest.hookspec.pytest_sessionstart].
         """
-        self._write_event(self.reporter.make_session_start())
+        event = self.reporter.make_session_start()
+        self.session_id = event.session_id
+        self._write_event(event)
 
     def pytest_sessionfinish(self, exitstatus: int) -> None:
         """Write a session end event.
@@ -291,18 +573,30 @@ class PytestBroadcasterPlugin:
     def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
         """Process the [TestReport][pytest.TestReport] produced for each of the setup, call and teardown runtest steps of a test case.
 
+        Steps are not written when coalesced events are enabled, they are written
+        within the test case report event instead.
+
         See [pytest.hookspec.pytest_runtest_logreport][_pytest.hookspec.pytest_runtest_logreport].
         """
-        self._write_event(self.reporter.make_test_case_step(report))
+        step = self.reporter.make_test_case_step(report)
+        if not self.coalesce:
+            self._write_event(step)
 
     def pytest_runtest_logfinish(
         self, nodeid: str, location: tuple[str, int | None, str]
     ) -> None:
         """Pytest calls this function after running the runtest protocol for a single item.
 
+        A single test case report event is written instead of a test case end event
+        when coalesced events are enabled.
+
         See [pytest.hookspec.pytest_runtest_logfinish][_pytest.hookspec.pytest_runtest_logfinish].
         """
-        self._write_event(self.reporter.make_test_case_end(nodeid))
+        if self.coalesce:
+            reporter = cast("CoalescingReporter", self.reporter)
+            self._write_event(reporter.make_test_case_report(nodeid))
+        else:
+            self._write_event(self.reporter.make_test_case_end(nodeid))
 
     def pytest_terminal_summary(self, terminalreporter: TerminalReporter) -> None:
         """Add a section to terminal summary reporting.
@@ -312,12 +606,53 @@ class PytestBroadcasterPlugin:
         for publisher in self.publishers:
             if summary := publisher.summary():
                 terminalreporter.write_sep("-", f"generated report log file: {summary}")
+        result = self.reporter.make_session_result()
+        if result and result.failure_clusters:
+            self._write_failure_clusters(terminalreporter, result.failure_clusters)
+
+    def _write_failure_clusters(
+        self, terminalreporter: TerminalReporter, clusters: list[FailureCluster]
+    ) -> None:
+        """Write failure clusters with more than one error to the terminal."""
+        clusters = sorted(
+            (cluster for cluster in clusters if cluster.count > 1),
+            key=lambda cluster: cluster.count,
+            reverse=True,
+        )
+        if not clusters:
+            return
+        terminalreporter.write_sep("=", "failure clusters")
+        for cluster in clusters[:MAX_FAILURE_CLUSTERS]:
+            location = ""
+            if cluster.location:
+                location = f" at {cluster.location.filename}:{cluster.location.lineno}"
+            terminalreporter.write_line(
+                f"{cluster.count} errors [{cluster.fingerprint}]: {cluster.message}{location}"
+            )
+        if len(clusters) > MAX_FAILURE_CLUSTERS:
+            terminalreporter.write_line(
+                f"... and {len(clusters) - MAX_FAILURE_CLUSTERS} more clusters"
+            )
+
+    def _write_profile(self, profiler: Profiler) -> None:
+        """Write the time spent by the plugin to the terminal."""
+        terminalreporter: TerminalReporter | None = (
+            self.config.pluginmanager.get_plugin("terminalreporter")
+        )
+        if terminalreporter is None:
+            return
+        terminalreporter.write_sep("=", "pytest-broadcaster profile")
+        for line in profiler.summary_lines():
+            terminalreporter.write_line(line)
 
     def _write_event(self, event: SessionEvent) -> None:
-        """Write a session event to the destinations."""
+        """Write a session event to the destinations, encoded once per codec."""
+        from pytest_broadcaster._internal._codecs import EncodedPayload
+
+        payload = EncodedPayload(event)
         for publisher in self.publishers:
             try:
-                publisher.write_event(event)
+                publisher.write_encoded_event(payload)
             except Exception as e:  # noqa: PERF203, BLE001
                 warnings.warn(
                     f"Failed to write event to destination: {publisher} - {e!r}",
@@ -325,10 +660,13 @@ class PytestBroadcasterPlugin:
                 )
 
     def _write_result(self, result: SessionResult) -> None:
-        """Write the session result to the destinations."""
+        """Write the session result to the destinations, encoded once per codec."""
+        from pytest_broadcaster._internal._codecs import EncodedPayload
+
+        payload = EncodedPayload(result)
         for publisher in self.publishers:
             try:
-                publisher.write_result(result)
+                publisher.write_encoded_result(payload)
             except Exception as e:  # noqa: PERF203, BLE001
                 warnings.warn(
                     f"Failed to write result to destination: {publisher} - {e!r}",
@@ -0,0 +1,5 @@
+"""Read JSON Lines logs written by the plugin without loading them in memory."""
+
+from pytest_broadcaster._internal._reader import LogIndex, LogReader, main, summarize
+
+__all__ = ["LogIndex", "LogReader", "main", "summarize"]
@@ -0,0 +1,7 @@
+"""Summarize or query a JSON Lines log: python -m pytest_broadcaster.reader."""
+
+import sys
+
+from pytest_broadcaster.reader import main
+
+sys.exit(main())
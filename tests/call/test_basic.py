@@ -85,6 +85,7 @@ class TestBasic(CommonTestSetup):
             "exit_status": 0,
             "errors": [],
             "warnings": [],
+            "failure_clusters": None,
             "test_reports": [
                 {
                     "node_id": "test_basic.py::test_ok",
@@ -55,6 +55,7 @@ class TestBasicFailure(CommonTestSetup):
             "exit_status": 1,
             "errors": [],
             "warnings": [],
+            "failure_clusters": None,
             "test_reports": [
                 {
                     "node_id": "test_basic_failure.py::test_failure",
@@ -79,6 +80,8 @@ class TestBasicFailure(CommonTestSetup):
                         "start_timestamp": "omitted",
                         "stop_timestamp": "omitted",
                         "error": {
+                            "fingerprint": None,
+                            "duplicate": False,
                             "message": "def test_failure():\n        '''This is a test docstring.'''\n>       raise ValueError(\"BOOM\")\nE       ValueError: BOOM\n\ntest_basic_failure.py:5: ValueError",  # noqa: E501
                             "traceback": {
                                 "entries": [
@@ -271,6 +274,8 @@ class TestBasicFailure(CommonTestSetup):
                 "start_timestamp": "omitted",
                 "stop_timestamp": "omitted",
                 "error": {
+                    "fingerprint": None,
+                    "duplicate": False,
                     "message": "def test_failure():\n        '''This is a test docstring.'''\n>       raise ValueError(\"BOOM\")\nE       ValueError: BOOM\n\ntest_basic_failure.py:5: ValueError",  # noqa: E501
                     "traceback": {
                         "entries": [
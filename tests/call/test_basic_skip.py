@@ -57,6 +57,7 @@ class TestBasicSkip(CommonTestSetup):
             "exit_status": 0,
             "errors": [],
             "warnings": [],
+            "failure_clusters": None,
             "test_reports": [
                 {
                     "node_id": "test_basic_skipped.py::test_skipped",
@@ -67,6 +67,7 @@ class TestBasicxFail(CommonTestSetup):
             "exit_status": 0,
             "errors": [],
             "warnings": [],
+            "failure_clusters": None,
             "test_reports": [
                 {
                     "node_id": "test_basic.py::test_ok",
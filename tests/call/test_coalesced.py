@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from _testing.setup import CommonTestSetup
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class TestCoalescedEvents(CommonTestSetup):
+    def make_test_directory(self) -> Path:
+        return self.make_testfile(
+            "test_basic.py",
+            """
+            import pytest
+
+            def test_ok():
+                pass
+
+            def test_fail():
+                assert False
+
+            @pytest.mark.skip(reason="skipped")
+            def test_skip():
+                pass
+            """,
+        ).parent
+
+    def test_coalesced_events(self):
+        """Test a single case_report event is emitted per test case."""
+        self.make_test_directory()
+        result = self.test_dir.runpytest(
+            "--collect-log",
+            self.json_lines_file.as_posix(),
+            "--collect-report",
+            self.json_file.as_posix(),
+            "--collect-log-coalesce",
+        )
+        assert result.ret == 1
+        events = self.read_json_lines_file()
+        assert [event["event"] for event in events] == [
+            "session_start",
+            "collect_report",
+            "collect_report",
+            "collect_report",
+            "case_report",
+            "case_report",
+            "case_report",
+            "session_end",
+        ]
+        reports = [event for event in events if event["event"] == "case_report"]
+        assert [(report["node_id"], report["outcome"]) for report in reports] == [
+            ("test_basic.py::test_ok", "passed"),
+            ("test_basic.py::test_fail", "failed"),
+            ("test_basic.py::test_skip", "skipped"),
+        ]
+        assert reports[0]["call"]["event"] == "case_call"
+        assert reports[2]["call"] is None
+        # Case reports hold the same data as test reports found in session result
+        assert [
+            {
+                key: value
+                for key, value in report.items()
+                if key not in ("event", "session_id")
+            }
+            for report in reports
+        ] == self.read_json_file()["test_reports"]
+
+    def test_reporter_without_coalescing(self):
+        """Test coalesced events are rejected when not supported by the reporter."""
+        self.test_dir.makeconftest("""
+        from pytest_broadcaster import DefaultReporter, Reporter
+
+        class StepReporter(Reporter):
+            def __init__(self):
+                self.reporter = DefaultReporter()
+
+            def make_session_result(self):
+                return self.reporter.make_session_result()
+
+            def make_session_start(self):
+                return self.reporter.make_session_start()
+
+            def make_session_end(self, exit_status):
+                return self.reporter.make_session_end(exit_status)
+
+            def make_warning_message(self, warning_message, when, nodeid):
+                return self.reporter.make_warning_message(warning_message, when, nodeid)
+
+            def make_error_message(self, report, call):
+                return self.reporter.make_error_message(report, call)
+
+            def make_collect_report(self, report):
+                return self.reporter.make_collect_report(report)
+
+            def make_test_case_step(self, report):
+                return self.reporter.make_test_case_step(report)
+
+            def make_test_case_end(self, node_id):
+                return self.reporter.make_test_case_end(node_id)
+
+        def pytest_broadcaster_set_reporter(set):
+            set(StepReporter())
+        """)
+        self.make_test_directory()
+        result = self.test_dir.runpytest(
+            "--collect-log", self.json_lines_file.as_posix(), "--collect-log-coalesce"
+        )
+        assert result.ret == pytest.ExitCode.USAGE_ERROR
+        result.stderr.fnmatch_lines(
+            ["*--collect-log-coalesce requires a reporter implementing*StepReporter"]
+        )
+        # Step events are written without coalesced events
+        result = self.test_dir.runpytest(
+            "--collect-log", self.json_lines_file.as_posix()
+        )
+        assert result.ret == 1
+        assert "case_end" in [event["event"] for event in self.read_json_lines_file()]
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+from enum import Enum
+from typing import TYPE_CHECKING
+
+import pytest
+
+from _testing.setup import CommonTestSetup
+from pytest_broadcaster import DefaultReporter
+from pytest_broadcaster._internal import _fields, _utils
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from _pytest._code.code import ReprFileLocation
+
+    from pytest_broadcaster._internal._utils import TracebackLine
+    from pytest_broadcaster.models.test_case_error import TestCaseError
+
+
+def fail_call(reporter: DefaultReporter, node_id: str) -> TestCaseError:
+    """Report a passed setup followed by a failed call and return the error."""
+    msg = "BOOM"
+    try:
+        raise ValueError(msg)  # noqa: TRY301
+    except ValueError:
+        longrepr = pytest.ExceptionInfo.from_current().getrepr()
+    for when, outcome in (("setup", "passed"), ("call", "failed")):
+        step = reporter.make_test_case_step(
+            pytest.TestReport(
+                nodeid=node_id,
+                location=("test_file.py", 0, node_id),
+                keywords={},
+                outcome=outcome,  # type: ignore[arg-type]
+                longrepr=longrepr if outcome == "failed" else None,
+                when=when,  # type: ignore[arg-type]
+            )
+        )
+    assert step.error
+    return step.error
+
+
+def test_error_text_is_a_string():
+    """Test error text is a string which can be serialized by any consumer."""
+    error = fail_call(DefaultReporter(), "test_file.py::test_fail")
+    assert type(error.message) is str
+    assert "ValueError: BOOM" in error.message
+
+    def default(obj: object) -> object:
+        assert isinstance(obj, Enum)
+        return obj.value
+
+    decoded = json.loads(json.dumps(dataclasses.asdict(error), default=default))
+    assert decoded["message"] == error.message
+
+
+def test_error_text_is_rendered_on_serialization(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test error text is rendered once, when the error is serialized."""
+    rendered: list[str] = []
+
+    def render(report: pytest.TestReport) -> str:
+        rendered.append(report.nodeid)
+        return str(report.longrepr)
+
+    monkeypatch.setattr(pytest.TestReport, "longreprtext", property(render))
+    error = fail_call(DefaultReporter(), "test_file.py::test_fail")
+    assert rendered == []
+    data = dataclasses.asdict(error)
+    assert type(data["message"]) is str
+    assert "ValueError: BOOM" in data["message"]
+    assert dataclasses.asdict(error) == data
+    assert rendered == ["test_file.py::test_fail"]
+
+
+def test_identical_errors_are_stored_once():
+    """Test identical error texts and tracebacks are shared."""
+    reporter = DefaultReporter()
+    first = fail_call(reporter, "test_file.py::test_fail[1]")
+    second = fail_call(reporter, "test_file.py::test_fail[2]")
+    assert first.traceback is second.traceback
+    assert first.message is second.message
+
+
+class TestErrorLimits(CommonTestSetup):
+    def make_test_directory(self) -> Path:
+        return self.make_testfile(
+            "test_deep_failure.py",
+            """
+            def recurse(depth):
+                if depth == 0:
+                    raise ValueError("BOOM")
+                recurse(depth - 1)
+
+            def test_failure():
+                recurse(5)
+            """,
+        ).parent
+
+    def run_and_get_error(self, *args: str) -> dict[str, object]:
+        self.make_test_directory()
+        result = self.test_dir.runpytest(
+            "--collect-log", self.json_lines_file.as_posix(), *args
+        )
+        assert result.ret == 1
+        (event,) = [
+            event
+            for event in self.read_json_lines_file()
+            if event["event"] == "case_call"
+        ]
+        return event["error"]
+
+    def test_no_limits(self):
+        """Test full traceback and message are kept by default."""
+        error = self.run_and_get_error()
+        assert len(error["traceback"]["entries"]) == 7  # type: ignore[index]
+        assert "[truncated" not in error["message"]  # type: ignore[operator]
+
+    def test_traceback_depth(self):
+        """Test only innermost traceback entries are kept."""
+        error = self.run_and_get_error("--collect-traceback-depth", "2")
+        entries = error["traceback"]["entries"]  # type: ignore[index]
+        assert len(entries) == 2
+        assert entries[-1]["message"] == "ValueError"
+
+    def test_traceback_depth_skips_outer_entries(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test traceback lines dropped by the depth limit are never built."""
+        built: list[TracebackLine] = []
+
+        def make_traceback_line(loc: ReprFileLocation) -> TracebackLine:
+            line = _utils.make_traceback_line(loc)
+            built.append(line)
+            return line
+
+        monkeypatch.setattr(_fields, "make_traceback_line", make_traceback_line)
+        error = self.run_and_get_error("--collect-traceback-depth", "2")
+        assert len(built) == 2
+        assert len(error["traceback"]["entries"]) == 2  # type: ignore[index]
+
+    def test_message_length(self):
+        """Test error messages are truncated."""
+        error = self.run_and_get_error("--collect-message-length", "20")
+        message = error["message"]
+        assert isinstance(message, str)
+        assert message.startswith("def test_failure():")
+        assert message.endswith("characters]")
+        assert len(message.split("... [truncated ")[0]) == 20
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from _testing.setup import CommonTestSetup
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+
+
+class TestFailureClusters(CommonTestSetup):
+    """Scenario: A broken fixture makes many test cases fail."""
+
+    def make_test_directory(self) -> Path:
+        return self.make_testfile(
+            "test_broken_fixture.py",
+            """
+            import pytest
+
+            @pytest.fixture
+            def broken():
+                raise RuntimeError("fixture is broken")
+
+            @pytest.mark.parametrize("value", range(5))
+            def test_broken(broken, value):
+                pass
+
+            def test_failure():
+                assert 1 == 2
+            """,
+        ).parent
+
+    def run_pytest(self, *args: str) -> pytest.RunResult:
+        self.make_test_directory()
+        result = self.test_dir.runpytest(
+            "--collect-log",
+            self.json_lines_file.as_posix(),
+            "--collect-report",
+            self.json_file.as_posix(),
+            *args,
+        )
+        assert result.ret == 1
+        return result
+
+    def read_errors(self) -> list[dict[str, Any]]:
+        return [
+            event["error"]
+            for event in self.read_json_lines_file()
+            if event["event"] in ("case_setup", "case_call") and event["error"]
+        ]
+
+    def test_errors_are_not_deduplicated_by_default(self):
+        """Test all errors are emitted in full by default."""
+        self.run_pytest()
+        errors = self.read_errors()
+        assert len(errors) == 6
+        assert all(error["fingerprint"] is None for error in errors)
+        assert all(error["traceback"] for error in errors)
+        assert self.read_json_file()["failure_clusters"] is None
+
+    def test_errors_are_deduplicated(self):
+        """Test errors sharing a fingerprint are emitted in full only once."""
+        result = self.run_pytest("--collect-dedup-errors")
+        first, *duplicates, assertion = self.read_errors()
+        assert not first["duplicate"]
+        assert first["traceback"]["entries"]
+        assert "fixture is broken" in first["message"]
+        assert len(duplicates) == 4
+        for duplicate in duplicates:
+            assert duplicate == {
+                "message": "RuntimeError: fixture is broken",
+                "traceback": None,
+                "fingerprint": first["fingerprint"],
+                "duplicate": True,
+            }
+        assert not assertion["duplicate"]
+        assert assertion["fingerprint"] != first["fingerprint"]
+        clusters = self.read_json_file()["failure_clusters"]
+        assert [
+            (cluster["exception_type"], cluster["count"], len(cluster["node_ids"]))
+            for cluster in clusters
+        ] == [("RuntimeError", 5, 5), ("AssertionError", 1, 1)]
+        assert clusters[0]["fingerprint"] == first["fingerprint"]
+        assert clusters[0]["location"]["lineno"] == 5
+        fingerprint = first["fingerprint"]
+        result.stdout.fnmatch_lines(
+            [
+                "*= failure clusters =*",
+                f"5 errors [[]{fingerprint}[]]: RuntimeError: fixture is broken at *:5",
+            ]
+        )
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import json
+import warnings
+from typing import TYPE_CHECKING
+
+import pytest
+
+from _testing.setup import CommonTestSetup
+from pytest_broadcaster import FastReporter, WireEvent
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_wire_event_attributes() -> None:
+    """Test fields of wire events can be read as attributes."""
+    event = WireEvent(node_id="test_basic.py::test_ok", outcome="passed")
+    assert event.node_id == "test_basic.py::test_ok"
+    assert event.outcome == "passed"
+    assert getattr(event, "error", None) is None
+
+
+def test_session_state_is_not_accumulated(recwarn: pytest.WarningsRecorder) -> None:
+    """Test events are not accumulated into a session result."""
+    reporter = FastReporter()
+    warnings.warn("accumulated", stacklevel=1)
+    reporter.make_warning_message(recwarn.pop(), "runtest", "test_basic.py::test_ok")
+    reporter.make_session_end(0)
+    assert reporter.make_session_result() is None
+    assert reporter._result.warnings == []
+
+
+class TestFastReporter(CommonTestSetup):
+    def make_test_directory(self) -> Path:
+        return self.make_testfile(
+            "test_basic.py",
+            """
+            import warnings
+
+            import pytest
+
+            @pytest.fixture
+            def broken():
+                raise ValueError("BOOM")
+
+            def test_ok():
+                pass
+
+            def test_fail():
+                assert False
+
+            def test_error(broken):
+                pass
+
+            @pytest.mark.skip(reason="skipped")
+            def test_skip():
+                pass
+
+            @pytest.mark.xfail(reason="expected")
+            def test_xfail():
+                assert False
+
+            def test_warn():
+                warnings.warn("HEY")
+            """,
+        ).parent
+
+    def read_events(self, *args: str) -> list[str]:
+        """Run pytest and return sanitized events, encoded to compare key order."""
+        # Node IDs are relative to the root directory, which must be the same
+        result = self.test_dir.runpytest(
+            "--rootdir",
+            self.test_dir.path.as_posix(),
+            "--collect-log",
+            self.json_lines_file.as_posix(),
+            *args,
+        )
+        assert result.ret == 1
+        return [
+            json.dumps(self.sanitize(event)) for event in self.read_json_lines_file()
+        ]
+
+    @pytest.mark.parametrize("coalesce", [False, True])
+    def test_same_events(self, *, coalesce: bool) -> None:
+        """Test the fast reporter writes the same events as the default reporter."""
+        self.make_test_directory()
+        args = ["--collect-log-coalesce"] if coalesce else []
+        expected = self.read_events(*args)
+        assert self.read_events("--collect-log-fast", *args) == expected
+
+    def test_filtered_events(self) -> None:
+        """Test events built by the fast reporter are filtered by outcome."""
+        self.make_test_directory()
+        expected = self.read_events("--collect-log-outcomes", "failed")
+        assert (
+            self.read_events("--collect-log-fast", "--collect-log-outcomes", "failed")
+            == expected
+        )
+
+    def test_requires_event_streams(self) -> None:
+        """Test the fast reporter is rejected along with a session result."""
+        result = self.test_dir.runpytest(
+            "--collect-report", self.json_file.as_posix(), "--collect-log-fast"
+        )
+        assert result.ret == pytest.ExitCode.USAGE_ERROR
+        result.stderr.fnmatch_lines(
+            ["*--collect-log-fast cannot be used with --collect-report*"]
+        )
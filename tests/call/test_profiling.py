@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from _testing.setup import CommonTestSetup
+from pytest_broadcaster import DefaultReporter, EncodedPayload, JSONLinesFile
+from pytest_broadcaster._internal._profiling import (
+    Histogram,
+    ProfiledDestination,
+    Profiler,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest_broadcaster.models.session_event import SessionEvent
+
+
+@pytest.mark.parametrize("duration", [0, 7, 8, 100, 12345, 10**9 + 7])
+def test_histogram_percentile_error(duration: int) -> None:
+    """Test percentiles are reported within 12.5% of recorded durations."""
+    histogram = Histogram()
+    for _ in range(10):
+        histogram.record(duration)
+    histogram.record(duration * 100)
+    assert duration <= histogram.percentile(50) <= duration * 1.125
+    assert histogram.percentile(99) == histogram.max == duration * 100
+    assert histogram.total == duration * 110
+
+
+def test_profiled_destination_is_not_modified(tmp_path: Path) -> None:
+    """Test encoding is profiled without replacing the codec of the destination."""
+    destination = JSONLinesFile((tmp_path / "events.jsonl").as_posix())
+    codec = destination.codec
+    profiler = Profiler()
+    with ProfiledDestination(destination, profiler, "events") as profiled:
+        event: SessionEvent = DefaultReporter().make_session_start()
+        payload = EncodedPayload(event)
+        profiled.write_encoded_event(payload)
+        profiled.write_encoded_event(payload)
+    assert destination.codec is codec
+    assert payload.encoded(codec) is not None
+    timings = {timing.name: timing for timing in profiler.make_timings()}
+    assert timings["events.write_event"].count == 2
+    # Shared payloads are only encoded once
+    assert timings["events.encode"].count == 1
+
+
+class TestProfiling(CommonTestSetup):
+    def make_test_directory(self) -> Path:
+        return self.make_testfile(
+            "test_basic.py",
+            """
+            def test_ok():
+                pass
+
+            def test_fail():
+                assert False
+            """,
+        ).parent
+
+    def test_profile(self):
+        """Test plugin profile is emitted as last event and printed in terminal."""
+        self.make_test_directory()
+        result = self.test_dir.runpytest(
+            "--collect-log",
+            self.json_lines_file.as_posix(),
+            "--collect-report",
+            self.json_file.as_posix(),
+            "--broadcaster-profile",
+        )
+        assert result.ret == 1
+        events = self.read_json_lines_file()
+        assert [event["event"] for event in events[-2:]] == [
+            "session_end",
+            "plugin_profile",
+        ]
+        profile = events[-1]
+        assert profile["session_id"] == events[0]["session_id"]
+        timings = {timing["name"]: timing for timing in profile["timings"]}
+        assert timings["reporter.make_test_case_step"]["count"] == 6
+        assert timings["reporter.make_test_case_end"]["count"] == 2
+        assert timings["JSONLinesFile#1.write_event"]["count"] == len(events) - 1
+        assert timings["JSONLinesFile#1.encode"]["count"] == len(events) - 1
+        assert timings["JSONFile#0.write_result"]["count"] == 1
+        for timing in timings.values():
+            assert 0 <= timing["p50"] <= timing["p99"] <= timing["max"]
+            assert timing["max"] <= timing["total"]
+        result.stdout.fnmatch_lines(
+            [
+                "*pytest-broadcaster profile*",
+                "operation*count*p50*p99*total",
+                "reporter.make_test_case_step*6*",
+            ]
+        )
+        assert "plugin_profile" not in self.read_json_file()
+
+    def test_no_profile(self):
+        """Test plugin profile is not emitted by default."""
+        self.make_test_directory()
+        self.test_dir.runpytest("--collect-log", self.json_lines_file.as_posix())
+        assert self.read_json_lines_file()[-1]["event"] == "session_end"
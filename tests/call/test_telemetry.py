@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any
+
+from _testing.setup import CommonTestSetup
+from pytest_broadcaster._internal._otlp import OTLPFileExporter
+from pytest_broadcaster._internal._profiling import Histogram
+from pytest_broadcaster._internal._telemetry import Instrumentation
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_histogram_explicit_buckets() -> None:
+    """Test histogram buckets are converted into explicit bucket bounds."""
+    histogram = Histogram()
+    for duration in (1, 1, 100, 12345):
+        histogram.record(duration)
+    bounds, counts = histogram.explicit_buckets()
+    assert bounds == sorted(bounds)
+    assert counts == [2, 1, 1, 0]
+    assert bounds[0] == 1
+    assert 100 <= bounds[1] < 12345 <= bounds[2]
+
+
+def test_spans_exported_in_batches(tmp_path: Path) -> None:
+    """Test spans are exported each time a batch is full, and when closing."""
+    path = tmp_path.joinpath("otlp.jsonl")
+    instrumentation = Instrumentation(OTLPFileExporter(path.as_posix()), batch_size=2)
+    for _ in range(3):
+        instrumentation.call("operation", lambda: None)
+    assert len(path.read_text().splitlines()) == 1
+    instrumentation.close()
+    requests = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [next(iter(request)) for request in requests] == [
+        "resourceSpans",
+        "resourceSpans",
+        "resourceMetrics",
+    ]
+    spans = [
+        [span["name"] for span in request["resourceSpans"][0]["scopeSpans"][0]["spans"]]
+        for request in requests[:2]
+    ]
+    assert spans == [
+        ["operation", "operation"],
+        ["operation", "pytest_broadcaster.session"],
+    ]
+
+
+class TestTelemetry(CommonTestSetup):
+    def make_test_directory(self) -> Path:
+        return self.make_testfile(
+            "test_basic.py",
+            """
+            def test_ok():
+                pass
+
+            def test_fail():
+                assert False
+            """,
+        ).parent
+
+    def read_requests(self) -> list[dict[str, Any]]:
+        return [
+            json.loads(line)
+            for line in self.tmp_path.joinpath("otlp.jsonl").read_text().splitlines()
+        ]
+
+    def read_spans(self, requests: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        return [
+            span
+            for request in requests
+            for resource in request.get("resourceSpans", [])
+            for scope in resource["scopeSpans"]
+            for span in scope["spans"]
+        ]
+
+    def read_metrics(self, requests: list[dict[str, Any]]) -> dict[str, Any]:
+        return {
+            metric["name"]: metric
+            for request in requests
+            for resource in request.get("resourceMetrics", [])
+            for scope in resource["scopeMetrics"]
+            for metric in scope["metrics"]
+        }
+
+    def test_trace(self):
+        """Test spans and metrics of the plugin are exported to an OTLP JSON file."""
+        self.make_test_directory()
+        result = self.test_dir.runpytest(
+            "--collect-log",
+            self.json_lines_file.as_posix(),
+            "--broadcaster-trace",
+            self.tmp_path.joinpath("otlp.jsonl").as_posix(),
+        )
+        assert result.ret == 1
+        assert "pytest-broadcaster profile" not in result.stdout.str()
+        events = self.read_json_lines_file()
+        assert events[-1]["event"] == "session_end"
+        requests = self.read_requests()
+        spans = self.read_spans(requests)
+        root = spans[-1]
+        assert root["name"] == "pytest_broadcaster.session"
+        assert "parentSpanId" not in root
+        assert root["attributes"] == [
+            {"key": "session_id", "value": {"stringValue": events[0]["session_id"]}}
+        ]
+        for span in spans[:-1]:
+            assert span["traceId"] == root["traceId"]
+            assert span["parentSpanId"] == root["spanId"]
+            assert (
+                int(root["startTimeUnixNano"])
+                <= int(span["startTimeUnixNano"])
+                <= int(span["endTimeUnixNano"])
+                <= int(root["endTimeUnixNano"])
+            )
+        names = [span["name"] for span in spans]
+        assert names.count("reporter.make_test_case_step") == 6
+        assert names.count("JSONLinesFile#0.write_event") == len(events)
+        assert names.count("JSONLinesFile#0.encode") == len(events)
+
+        metrics = self.read_metrics(requests)
+        destination = [
+            {"key": "destination", "value": {"stringValue": "JSONLinesFile#0"}}
+        ]
+        [count] = metrics["pytest_broadcaster.events"]["sum"]["dataPoints"]
+        assert count["attributes"] == destination
+        assert count["asInt"] == str(len(events))
+        [size] = metrics["pytest_broadcaster.bytes"]["sum"]["dataPoints"]
+        # Each event is written on its own line
+        assert int(size["asInt"]) + len(events) == self.json_lines_file.stat().st_size
+        [rate] = metrics["pytest_broadcaster.events.rate"]["gauge"]["dataPoints"]
+        assert rate["asDouble"] > 0
+        durations = {
+            point["attributes"][0]["value"]["stringValue"]: point
+            for point in metrics["pytest_broadcaster.operation.duration"]["histogram"][
+                "dataPoints"
+            ]
+        }
+        write = durations["JSONLinesFile#0.write_event"]
+        assert write["count"] == str(len(events))
+        assert sum(int(count) for count in write["bucketCounts"]) == len(events)
+        assert len(write["bucketCounts"]) == len(write["explicitBounds"]) + 1
+
+    def test_trace_parallel(self):
+        """Test queue depth of parallel destinations is sampled when exporting spans."""
+        self.make_test_directory()
+        result = self.test_dir.runpytest(
+            "--collect-log",
+            self.json_lines_file.as_posix(),
+            "--collect-parallel",
+            "--broadcaster-trace",
+            self.tmp_path.joinpath("otlp.jsonl").as_posix(),
+            "--broadcaster-profile",
+        )
+        assert result.ret == 1
+        result.stdout.fnmatch_lines(["*pytest-broadcaster profile*"])
+        metrics = self.read_metrics(self.read_requests())
+        [depth] = metrics["pytest_broadcaster.queue.depth"]["gauge"]["dataPoints"]
+        assert depth["attributes"] == [
+            {"key": "destination", "value": {"stringValue": "JSONLinesFile#0"}}
+        ]
+        assert depth["asInt"] == "0"
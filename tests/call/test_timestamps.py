@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import datetime
+from typing import TYPE_CHECKING
+
+import pytest
+
+from _testing.setup import CommonTestSetup
+from pytest_broadcaster._internal._fields import make_timestamp
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+TIMESTAMP_KEYS = ("timestamp", "start_timestamp", "stop_timestamp")
+
+
+@pytest.mark.parametrize(
+    "epoch",
+    [
+        0.0,
+        1700000000.0,
+        1700000000.5,
+        1700000000.0000005,
+        1700000000.9999996,
+        1712345678.123456,
+        -1.5,
+    ],
+)
+def test_make_timestamp(epoch: float) -> None:
+    """Test cached ISO formatter is identical to datetime.isoformat()."""
+    expected = datetime.datetime.fromtimestamp(
+        epoch, tz=datetime.timezone.utc
+    ).isoformat()
+    assert make_timestamp(epoch) == expected
+
+
+class TestTimestamps(CommonTestSetup):
+    def make_test_directory(self) -> Path:
+        return self.make_testfile(
+            "test_basic.py",
+            """
+            def test_ok():
+                pass
+            """,
+        ).parent
+
+    def read_timestamps(self, *args: str) -> list[object]:
+        self.make_test_directory()
+        result = self.test_dir.runpytest(
+            "--collect-log", self.json_lines_file.as_posix(), *args
+        )
+        assert result.ret == 0
+        return [
+            event[key]
+            for event in self.read_json_lines_file()
+            for key in TIMESTAMP_KEYS
+            if key in event
+        ]
+
+    def test_iso_timestamps(self):
+        """Test timestamps are ISO 8601 strings by default."""
+        timestamps = self.read_timestamps()
+        assert timestamps
+        for timestamp in timestamps:
+            assert isinstance(timestamp, str)
+            assert datetime.datetime.fromisoformat(timestamp).tzinfo is not None
+
+    def test_numeric_timestamps(self):
+        """Test timestamps are integer nanoseconds when requested."""
+        timestamps = self.read_timestamps("--collect-timestamps", "ns")
+        assert timestamps
+        now = datetime.datetime.now(tz=datetime.timezone.utc).timestamp() * 1e9
+        for timestamp in timestamps:
+            assert isinstance(timestamp, int)
+            assert now - 60e9 < timestamp <= now
@@ -57,6 +57,7 @@ class TestxFailWithinTest(CommonTestSetup):
             "exit_status": 0,
             "errors": [],
             "warnings": [],
+            "failure_clusters": None,
             "test_reports": [
                 {
                     "node_id": "test_xfail_within_test.py::test_xfail",
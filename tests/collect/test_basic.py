@@ -57,6 +57,7 @@ class TestBasic(CommonTestSetup):
             "exit_status": 0,
             "errors": [],
             "warnings": [],
+            "failure_clusters": None,
             "test_reports": [],
             "collect_reports": [
                 {
@@ -58,6 +58,7 @@ class TestBasicParametrization(CommonTestSetup):
             "exit_status": 0,
             "errors": [],
             "warnings": [],
+            "failure_clusters": None,
             "test_reports": [],
             "collect_reports": [
                 {
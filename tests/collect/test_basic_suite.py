@@ -62,6 +62,7 @@ class TestBasicSuite(CommonTestSetup):
             "exit_status": 0,
             "errors": [],
             "warnings": [],
+            "failure_clusters": None,
             "test_reports": [],
             "collect_reports": [
                 {
@@ -95,6 +95,7 @@ class TestErrors(CommonTestSetup):
                     "exception_value": "BOOM",
                 }
             ],
+            "failure_clusters": None,
             "test_reports": [],
             "collect_reports": [
                 {
@@ -77,6 +77,7 @@ class TestErrorsThirdParty(CommonTestSetup):
                     "exception_value": "BOOM",
                 }
             ],
+            "failure_clusters": None,
             "test_reports": [],
             "collect_reports": [
                 {
@@ -59,6 +59,7 @@ class TestMultiCases(CommonTestSetup):
             "exit_status": 0,
             "errors": [],
             "warnings": [],
+            "failure_clusters": None,
             "test_reports": [],
             "collect_reports": [
                 {
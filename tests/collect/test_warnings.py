@@ -144,6 +144,7 @@ class TestWarnings(CommonTestSetup):
                     ],
                 },
             ],
+            "failure_clusters": None,
             "test_reports": [],
         }
 
@@ -138,6 +138,7 @@ class TestWarningsThirdParty(CommonTestSetup):
                     ],
                 },
             ],
+            "failure_clusters": None,
             "test_reports": [],
         }
 
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import json
+import sys
+from typing import TYPE_CHECKING
+
+import pytest
+
+from _testing.http_server import EmbeddedTestServer, Spy
+from _testing.setup import CommonTestSetup
+from pytest_broadcaster import EncodedPayload, get_codec, read_events
+from pytest_broadcaster._internal import _codecs, _constants
+from pytest_broadcaster.models import test_case_end
+from pytest_broadcaster.models.outcome import Outcome
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+
+def test_format_choices() -> None:
+    """Test formats offered by command line options match the available codecs."""
+    assert tuple(_codecs.CODECS) == _constants.CODEC_NAMES
+    for name in _constants.FORMATS:
+        assert get_codec(name).name == name
+
+
+class TestCodecs(CommonTestSetup):
+    def make_test_directory(self) -> Path:
+        return self.make_testfile(
+            "test_basic.py",
+            """
+            import pytest
+
+            @pytest.mark.parametrize("value", [1, 2])
+            def test_ok(value):
+                pass
+
+            def test_failure():
+                raise ValueError("BOOM")
+            """,
+        ).parent
+
+    def run_with_format(self, log_format: str) -> list[dict[str, object]]:
+        self.make_test_directory()
+        result = self.test_dir.runpytest(
+            "--collect-log",
+            self.json_lines_file.as_posix(),
+            "--collect-log-format",
+            log_format,
+        )
+        assert result.ret == 1
+        return list(read_events(self.json_lines_file, log_format))
+
+    def test_json(self):
+        """Test reading events written using the default codec."""
+        events = self.run_with_format("json")
+        assert events == self.read_json_lines_file()
+
+    @pytest.mark.parametrize(
+        "log_format", ["compact", "msgpack", "dict-json", "dict-msgpack"]
+    )
+    def test_codec_roundtrip(self, log_format: str) -> None:
+        """Test events decoded from alternative codecs are identical to JSON ones."""
+        if log_format.endswith("msgpack"):
+            pytest.importorskip("msgpack")
+        self.test_dir.makeconftest(f"""
+        from pytest_broadcaster import JSONLinesFile, get_codec
+
+        def pytest_broadcaster_add_destination(add):
+            add(JSONLinesFile("events.jsonl"))
+            add(JSONLinesFile("events.{log_format}", codec=get_codec("{log_format}")))
+        """)
+        self.make_test_directory()
+        result = self.test_dir.runpytest()
+        assert result.ret == 1
+        json_file = self.test_dir.path.joinpath("events.jsonl")
+        other_file = self.test_dir.path.joinpath(f"events.{log_format}")
+        assert list(read_events(other_file, log_format)) == list(read_events(json_file))
+        assert other_file.stat().st_size < json_file.stat().st_size
+
+    def test_json_iter_encode(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test JSON payloads encoded in chunks are identical to whole ones."""
+        monkeypatch.setattr(_codecs, "ENCODE_CHUNK_SIZE", 16)
+        codec = get_codec("json")
+        data = {"name": "result", "items": [{"value": index} for index in range(10)]}
+        chunks = list(codec.iter_encode(data))
+        assert len(chunks) > 1
+        assert b"".join(chunks) == codec.encode(data)
+        assert list(codec.iter_encode([1, 2])) == [codec.encode([1, 2])]
+
+    def test_compact_codec_interns_keys(self):
+        """Test compact codec sends object keys only once per shape."""
+        encoder = get_codec("compact")
+        decoder = get_codec("compact")
+        first = encoder.encode({"node_id": "a", "outcome": "passed"})
+        second = encoder.encode({"node_id": "b", "outcome": "failed"})
+        assert b"node_id" in first
+        assert b"node_id" not in second
+        assert decoder.decode(first) == {"node_id": "a", "outcome": "passed"}
+        assert decoder.decode(second) == {"node_id": "b", "outcome": "failed"}
+
+    def test_dictionary_codec_defines_values_once(self):
+        """Test dictionary codec sends each node ID only once."""
+        encoder = get_codec("dict-json")
+        decoder = get_codec("dict-json")
+        events = [
+            {"event": "case_call", "node_id": "test.py::test_ok", "outcome": "passed"},
+            {"event": "case_end", "node_id": "test.py::test_ok", "outcome": "passed"},
+        ]
+        first, second = (encoder.encode(event) for event in events)
+        assert first.count(b"test.py::test_ok") == 1
+        assert b"test.py::test_ok" not in second
+        assert [decoder.decode(first), decoder.decode(second)] == events
+
+    def test_encoded_payload_is_shared(self):
+        """Test payloads are encoded once per codec name, or per stateful codec."""
+        payload = EncodedPayload(
+            test_case_end.TestCaseEnd(
+                session_id="session",
+                node_id="test.py::test_ok",
+                start_timestamp=0,
+                stop_timestamp=0,
+                total_duration=0,
+                outcome=Outcome.passed,
+            )
+        )
+        first = payload.encode(get_codec("json"))
+        assert payload.encode(get_codec("json")) is first
+        compact = get_codec("compact")
+        assert payload.encode(compact) is payload.encode(compact)
+        # Stateful codecs only intern keys of the payloads they encoded themselves
+        other = get_codec("compact")
+        assert payload.encode(other) is not payload.encode(compact)
+        assert get_codec("compact").decode(payload.encode(other)) == json.loads(first)
+
+    def test_destinations_share_encoded_events(self):
+        """Test events are encoded once for destinations using the same codec."""
+        self.test_dir.makeconftest("""
+        from pytest_broadcaster import JSONLinesFile
+
+        def pytest_broadcaster_add_destination(add):
+            add(JSONLinesFile("events.jsonl"))
+        """)
+        self.make_test_directory()
+        result = self.test_dir.runpytest(
+            "--collect-log", self.json_lines_file.as_posix(), "--broadcaster-profile"
+        )
+        assert result.ret == 1
+        events = self.read_json_lines_file()
+        other_file = self.test_dir.path.joinpath("events.jsonl")
+        assert list(read_events(other_file)) == events
+        timings = {timing["name"]: timing["count"] for timing in events[-1]["timings"]}
+        assert timings["JSONLinesFile#0.write_event"] == len(events) - 1
+        assert timings["JSONLinesFile#0.encode"] == len(events) - 1
+        assert timings["JSONLinesFile#1.write_event"] == len(events) - 1
+        assert "JSONLinesFile#1.encode" not in timings
+
+    def test_result_encoded_once(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test the result is encoded once for a report file and a webhook."""
+        encoded_results: list[str] = []
+
+        def count(
+            name: str, encode: Callable[[_codecs.JSONCodec, object], object]
+        ) -> Callable[[_codecs.JSONCodec, object], object]:
+            def wrapper(self: _codecs.JSONCodec, data: object) -> object:
+                if isinstance(data, dict) and "test_reports" in data:
+                    encoded_results.append(name)
+                return encode(self, data)
+
+            return wrapper
+
+        for name in ("encode", "iter_encode"):
+            monkeypatch.setattr(
+                _codecs.JSONCodec, name, count(name, getattr(_codecs.JSONCodec, name))
+            )
+        self.make_test_directory()
+        spy = Spy()
+        with EmbeddedTestServer(spy, path="/webhooks/TestWebhook", port=8000):
+            result = self.test_dir.runpytest(
+                "--collect-report",
+                self.json_file.as_posix(),
+                "--collect-url",
+                "http://localhost:8000/webhooks/TestWebhook",
+            )
+        assert result.ret == 1
+        assert json.loads(spy.expect_request().data()) == self.read_json_file()
+        assert encoded_results == ["encode"]
+
+    def test_unknown_codec(self):
+        """Test an error is raised for unknown codecs."""
+        with pytest.raises(ValueError, match="Unknown codec: yaml"):
+            get_codec("yaml")
+
+    @pytest.mark.parametrize(
+        "option", ["--collect-log-format", "--collect-report-format"]
+    )
+    def test_missing_msgpack(
+        self, monkeypatch: pytest.MonkeyPatch, option: str
+    ) -> None:
+        """Test a usage error is reported when msgpack is not installed."""
+        monkeypatch.setitem(sys.modules, "msgpack", None)
+        self.make_test_directory()
+        result = self.test_dir.runpytest(
+            "--collect-log",
+            self.json_lines_file.as_posix(),
+            "--collect-report",
+            self.json_file.as_posix(),
+            option,
+            "msgpack",
+        )
+        assert result.ret == pytest.ExitCode.USAGE_ERROR
+        result.stderr.fnmatch_lines(["*msgpack package is required*"])
+
+    def test_webhook_content_type(self):
+        """Test webhook uses codec content type."""
+        pytest.importorskip("msgpack")
+        self.make_test_directory()
+        spy = Spy()
+        with EmbeddedTestServer(spy, path="/webhooks/TestWebhook", port=8000):
+            result = self.test_dir.runpytest(
+                "--collect-only",
+                "--collect-url",
+                "http://localhost:8000/webhooks/TestWebhook",
+                "--collect-report-format",
+                "msgpack",
+            )
+        assert result.ret == 0
+        request = spy.expect_request()
+        assert request.content_type() == "application/msgpack"
+        result_data = get_codec("msgpack").decode(request.data())
+        assert result_data["exit_status"] == 0
+        assert len(result_data["collect_reports"]) == 3
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from _testing.setup import CommonTestSetup
+from pytest_broadcaster._internal._filters import EventFilter
+from pytest_broadcaster.models import test_case_end
+from pytest_broadcaster.models.outcome import Outcome
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def make_case_end(node_id: str) -> test_case_end.TestCaseEnd:
+    return test_case_end.TestCaseEnd(
+        session_id="session",
+        node_id=node_id,
+        start_timestamp=0,
+        stop_timestamp=0,
+        total_duration=0,
+        outcome=Outcome.passed,
+    )
+
+
+def test_sampling_is_deterministic() -> None:
+    """Test sampling keeps the same node IDs across filters, close to sample rate."""
+    events = [make_case_end(f"test_module.py::test_{index}") for index in range(10000)]
+    first = [
+        event.node_id for event in events if EventFilter(sample_rate=0.1).accept(event)
+    ]
+    second = [
+        event.node_id for event in events if EventFilter(sample_rate=0.1).accept(event)
+    ]
+    assert first == second
+    assert 900 < len(first) < 1100
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "message"),
+    [
+        ({"events": ["case_start"]}, "Unknown event types: case_start"),
+        ({"outcomes": ["broken"]}, "Unknown outcomes: broken"),
+        ({"sample_rate": 2}, "Sample rate must be between 0 and 1"),
+    ],
+)
+def test_invalid_filter(kwargs: dict[str, object], message: str) -> None:
+    """Test invalid filters are rejected."""
+    with pytest.raises(ValueError, match=message):
+        EventFilter(**kwargs)  # type: ignore[arg-type]
+
+
+class TestEventFilters(CommonTestSetup):
+    def make_test_directory(self) -> Path:
+        return self.make_testfile(
+            "test_basic.py",
+            """
+            def test_ok():
+                pass
+
+            def test_fail():
+                assert False
+
+            def test_other_fail():
+                assert False
+            """,
+        ).parent
+
+    def read_events(self, *args: str) -> list[tuple[str, str | None]]:
+        self.make_test_directory()
+        result = self.test_dir.runpytest(
+            "--collect-log", self.json_lines_file.as_posix(), *args
+        )
+        assert result.ret == 1
+        return [
+            (event["event"], event.get("node_id"))
+            for event in self.read_json_lines_file()
+        ]
+
+    def test_filter_events(self):
+        """Test only requested event types are written."""
+        events = self.read_events("--collect-log-events", "session_start,case_end")
+        assert events == [
+            ("session_start", None),
+            ("case_end", "test_basic.py::test_ok"),
+            ("case_end", "test_basic.py::test_fail"),
+            ("case_end", "test_basic.py::test_other_fail"),
+        ]
+
+    def test_filter_outcomes(self):
+        """Test only failed steps are written, while test case end events are kept."""
+        events = self.read_events(
+            "--collect-log-events",
+            "case_setup,case_call,case_teardown,case_end",
+            "--collect-log-outcomes",
+            "failed",
+        )
+        assert events == [
+            ("case_end", "test_basic.py::test_ok"),
+            ("case_call", "test_basic.py::test_fail"),
+            ("case_end", "test_basic.py::test_fail"),
+            ("case_call", "test_basic.py::test_other_fail"),
+            ("case_end", "test_basic.py::test_other_fail"),
+        ]
+
+    def test_filter_node_ids(self):
+        """Test only events of matching node IDs are written."""
+        events = self.read_events(
+            "--collect-log-nodes", "*::test_ok", "--collect-log-nodes", "*other*"
+        )
+        assert {node_id for _, node_id in events} == {
+            None,
+            "test_basic.py::test_ok",
+            "test_basic.py::test_other_fail",
+        }
+
+    def test_sample_passing_tests(self):
+        """Test passing tests are dropped when sample rate is 0, but not failures."""
+        events = self.read_events("--collect-log-sample", "0")
+        assert "test_basic.py::test_ok" not in {node_id for _, node_id in events}
+        # All events of failed tests are kept, including passed steps
+        assert [
+            event for event, node_id in events if node_id == "test_basic.py::test_fail"
+        ] == ["case_setup", "case_call", "case_teardown", "case_end"]
+        assert events[0] == ("session_start", None)
+        assert events[-1] == ("session_end", None)
+
+    def test_result_is_not_filtered(self):
+        """Test session result is written in full when events are filtered."""
+        self.make_test_directory()
+        self.test_dir.runpytest(
+            "--collect-report",
+            self.json_file.as_posix(),
+            "--collect-log-events",
+            "session_end",
+        )
+        assert len(self.read_json_file()["test_reports"]) == 3
+
+    def test_invalid_filter(self):
+        """Test invalid filters are reported as usage errors."""
+        self.make_test_directory()
+        result = self.test_dir.runpytest(
+            "--collect-log",
+            self.json_lines_file.as_posix(),
+            "--collect-log-events",
+            "unknown",
+        )
+        assert result.ret == pytest.ExitCode.USAGE_ERROR
+        result.stderr.fnmatch_lines(["*Unknown event types: unknown*"])
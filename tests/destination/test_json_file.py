@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import json
+import os
+import stat
+import sys
+from typing import TYPE_CHECKING
+
+import pytest
+
+from _testing.setup import CommonTestSetup
+from pytest_broadcaster._internal import _json_files
+from pytest_broadcaster._internal._files import atomic_writer, copy_range
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.mark.parametrize(
+    "unavailable",
+    [(), ("copy_file_range",), ("copy_file_range", "sendfile")],
+    ids=["copy_file_range", "sendfile", "read"],
+)
+def test_copy_range(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, unavailable: tuple[str, ...]
+) -> None:
+    """Test bytes are copied at offset, within the kernel or not."""
+    for name in unavailable:
+        monkeypatch.delattr(os, name, raising=False)
+    source = tmp_path.joinpath("source")
+    source.write_bytes(b"0123456789" * 1000)
+    destination = tmp_path.joinpath("destination")
+    with source.open("rb") as src, destination.open("wb", buffering=0) as dst:
+        dst.write(b"head:")
+        copy_range(src.fileno(), dst.fileno(), 5, 9000)
+        dst.write(b":tail")
+    assert destination.read_bytes() == b"head:" + source.read_bytes()[5:9005] + b":tail"
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX permissions")
+def test_atomic_writer_permissions(tmp_path: Path) -> None:
+    """Test files follow the umask when created, and keep their permissions."""
+    target = tmp_path.joinpath("report.json")
+    umask = os.umask(0o027)
+    try:
+        with atomic_writer(target) as file:
+            file.write(b"{}")
+    finally:
+        os.umask(umask)
+    assert stat.S_IMODE(target.stat().st_mode) == 0o640
+    target.chmod(0o600)
+    with atomic_writer(target) as file:
+        file.write(b"[]")
+    assert stat.S_IMODE(target.stat().st_mode) == 0o600
+    assert target.read_bytes() == b"[]"
+    assert [path.name for path in tmp_path.iterdir()] == ["report.json"]
+
+
+class TestJSONFileCheckpoints(CommonTestSetup):
+    def make_test_directory(self) -> Path:
+        return self.make_testfile(
+            "test_basic.py",
+            """
+            import os
+            import warnings
+
+            import pytest
+
+            @pytest.mark.parametrize("value", range(5))
+            def test_ok(value):
+                warnings.warn(f"warning {value}")
+
+            def test_fail():
+                assert False
+
+            def test_crash():
+                os._exit(1)
+
+            def test_never_run():
+                pass
+            """,
+        ).parent
+
+    def test_checkpoint_on_crash(self):
+        """Test partial result is left behind when process dies."""
+        self.make_test_directory()
+        result = self.test_dir.runpytest_subprocess(
+            "--collect-report",
+            self.json_file.as_posix(),
+            "--collect-report-checkpoint",
+            "0",
+        )
+        assert result.ret == 1
+        report = self.read_json_file()
+        assert report["exit_status"] == pytest.ExitCode.INTERRUPTED
+        assert [
+            (test_report["node_id"], test_report["outcome"])
+            for test_report in report["test_reports"]
+        ] == [
+            *((f"test_basic.py::test_ok[{value}]", "passed") for value in range(5)),
+            ("test_basic.py::test_fail", "failed"),
+        ]
+        assert report["test_reports"][0]["call"]["event"] == "case_call"
+        assert report["test_reports"][0]["finished"]["event"] == "case_end"
+        assert len(report["warnings"]) == 5
+        assert "test_basic.py" in [
+            collect_report["node_id"] for collect_report in report["collect_reports"]
+        ]
+        assert report["errors"] == []
+        assert (
+            report["stop_timestamp"]
+            == report["test_reports"][-1]["finished"]["stop_timestamp"]
+        )
+        # No temporary file is left behind
+        assert [path.name for path in self.tmp_path.iterdir()] == ["collect.json"]
+
+    @pytest.mark.parametrize("coalesce", [False, True], ids=["steps", "coalesced"])
+    def test_checkpoint_matches_result(self, coalesce: bool) -> None:  # noqa: FBT001
+        """Test test reports of the last checkpoint are identical to the final ones."""
+        self.make_testfile(
+            "test_basic.py",
+            """
+            def test_ok():
+                pass
+
+            def test_fail():
+                assert False
+            """,
+        )
+        args = ["--collect-report", self.json_file.as_posix()]
+        if coalesce:
+            args.append("--collect-log-coalesce")
+        self.test_dir.runpytest_subprocess(*args)
+        expected = self.read_json_file()
+        # Existing paths given as option values are considered to find rootdir
+        self.json_file.unlink()
+        # A checkpoint is written after each event, the last one is replaced by result
+        self.test_dir.runpytest_subprocess(*args, "--collect-report-checkpoint", "0")
+        report = self.read_json_file()
+        assert report["exit_status"] == 1
+        assert self.sanitize(report["test_reports"]) == self.sanitize(
+            expected["test_reports"]
+        )
+
+    def test_spooled_result(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test spooled result is identical to the encoded one."""
+        copies: list[int] = []
+
+        def spy(source: int, destination: int, offset: int, count: int) -> None:
+            copies.append(count)
+            copy_range(source, destination, offset, count)
+
+        monkeypatch.setattr(_json_files, "copy_range", spy)
+        self.make_testfile(
+            "test_basic.py",
+            """
+            import warnings
+
+            import pytest
+
+            @pytest.mark.parametrize("value", range(3))
+            def test_ok(value):
+                warnings.warn(f"warning {value}")
+
+            def test_fail():
+                assert False
+            """,
+        )
+        self.test_dir.runpytest("--collect-report", self.json_file.as_posix())
+        assert copies == []
+        expected = self.read_json_file()
+        # Existing paths given as option values are considered to find rootdir
+        self.json_file.unlink()
+        self.test_dir.runpytest(
+            "--collect-report", self.json_file.as_posix(), "--collect-report-spool"
+        )
+        # Collect reports, test reports and warnings are copied from spool files
+        assert len(copies) == 3
+        report = self.read_json_file()
+        assert list(report) == list(expected)
+        assert self.sanitize(report) == self.sanitize(expected)
+        assert [path.name for path in self.tmp_path.iterdir()] == ["collect.json"]
+
+    def test_checkpoint_requires_json(self):
+        """Test checkpoints are rejected with binary formats."""
+        self.make_test_directory()
+        result = self.test_dir.runpytest(
+            "--collect-report",
+            self.json_file.as_posix(),
+            "--collect-report-checkpoint",
+            "1",
+            "--collect-report-format",
+            "compact",
+        )
+        assert result.ret == pytest.ExitCode.USAGE_ERROR
+
+
+def test_checkpoint_is_valid_json_after_each_event(tmp_path: Path) -> None:
+    """Test each checkpoint is a valid document holding all items received so far."""
+    from pytest_broadcaster._internal._json_files import JSONFile
+    from pytest_broadcaster._internal._reporter import DefaultReporter
+
+    reporter = DefaultReporter()
+    destination = JSONFile((tmp_path / "report.json").as_posix(), checkpoint_interval=0)
+    destination.write_event(reporter.make_session_start())
+    for index in range(3):
+        destination._add_item("test_reports", {"index": index})
+        destination.checkpoint()
+        report = json.loads(destination.filepath.read_text())
+        assert report["test_reports"] == [{"index": i} for i in range(index + 1)]
+    assert destination.checkpoints == 3
+
+
+def test_result_is_streamed_unless_already_encoded(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test the result is encoded in chunks, unless encoded by another destination."""
+    from pytest_broadcaster._internal import _codecs
+    from pytest_broadcaster._internal._codecs import EncodedPayload
+    from pytest_broadcaster._internal._json_files import JSONFile
+    from pytest_broadcaster._internal._reporter import DefaultReporter
+
+    monkeypatch.setattr(_codecs, "ENCODE_CHUNK_SIZE", 16)
+    reporter = DefaultReporter()
+    reporter.make_session_start()
+    reporter.make_session_end(0)
+    result = reporter.make_session_result()
+    assert result
+    destination = JSONFile((tmp_path / "report.json").as_posix())
+    payload = EncodedPayload(result)
+    destination.write_encoded_result(payload)
+    assert payload.encoded(destination.codec) is None
+    encoded = payload.encode(destination.codec)
+    assert destination.filepath.read_bytes() == encoded
+    # Encoded payloads are written as is
+    monkeypatch.setattr(destination.codec, "iter_encode", None)
+    destination.filepath.unlink()
+    destination.write_encoded_result(payload)
+    assert destination.filepath.read_bytes() == encoded
@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import json
+import struct
+import threading
+import uuid
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from _testing.http_server import EmbeddedTestServer, Spy
+from _testing.setup import CommonTestSetup
+from pytest_broadcaster._internal._otlp import (
+    encode_traces_request,
+    make_span,
+    make_traces_request,
+)
+from pytest_broadcaster._internal._otlp_traces import BatchSpanProcessor
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+def decode_message(data: bytes) -> dict[int, list[Any]]:
+    """Decode a protobuf message into values of each field number, without schema."""
+    fields: dict[int, list[Any]] = {}
+    position = 0
+
+    def read_varint() -> int:
+        nonlocal position
+        value = shift = 0
+        while True:
+            byte = data[position]
+            position += 1
+            value |= (byte & 0x7F) << shift
+            shift += 7
+            if not byte & 0x80:
+                return value
+
+    while position < len(data):
+        key = read_varint()
+        number, wire_type = key >> 3, key & 7
+        value: Any
+        if wire_type == 0:
+            value = read_varint()
+        elif wire_type == 1:
+            value = data[position : position + 8]
+            position += 8
+        else:
+            size = read_varint()
+            value = data[position : position + size]
+            position += size
+        fields.setdefault(number, []).append(value)
+    return fields
+
+
+def test_encode_traces_request() -> None:
+    """Test spans are encoded using the OTLP protobuf schema."""
+    span = make_span(
+        "0af7651916cd43dd8448eb211c80319c",
+        "b7ad6b7169203331",
+        "00f067aa0ba902b7",
+        "call",
+        1,
+        2**40,
+        {"text": "value", "count": -1, "ok": True, "ratio": 0.5},
+        2,
+        "BOOM",
+    )
+    request = decode_message(encode_traces_request(make_traces_request([span])))
+    [resource_spans] = request[1]
+    [scope_spans] = decode_message(resource_spans)[2]
+    [scope, encoded] = [decode_message(scope_spans)[number][0] for number in (1, 2)]
+    assert decode_message(scope)[1] == [b"pytest_broadcaster"]
+    fields = decode_message(encoded)
+    assert fields[1] == [bytes.fromhex("0af7651916cd43dd8448eb211c80319c")]
+    assert fields[2] == [bytes.fromhex("b7ad6b7169203331")]
+    assert fields[4] == [bytes.fromhex("00f067aa0ba902b7")]
+    assert fields[5] == [b"call"]
+    assert fields[6] == [1]
+    assert [struct.unpack("<Q", value)[0] for value in fields[7] + fields[8]] == [
+        1,
+        2**40,
+    ]
+    attributes = [decode_message(attribute) for attribute in fields[9]]
+    assert [attribute[1] for attribute in attributes] == [
+        [b"text"],
+        [b"count"],
+        [b"ok"],
+        [b"ratio"],
+    ]
+    values = [decode_message(attribute[2][0]) for attribute in attributes]
+    assert values[0] == {1: [b"value"]}
+    assert values[1] == {3: [2**64 - 1]}
+    assert values[2] == {2: [1]}
+    assert struct.unpack("<d", values[3][4][0]) == (0.5,)
+    assert decode_message(fields[15][0]) == {2: [b"BOOM"], 3: [2]}
+
+
+class BlockingExporter:
+    """An exporter waiting to be released before exporting each request."""
+
+    def __init__(self) -> None:
+        self.received = threading.Event()
+        self.released = threading.Event()
+        self.spans: list[str] = []
+
+    def export(self, request: dict[str, Any]) -> None:
+        self.received.set()
+        self.released.wait()
+        for span in request["resourceSpans"][0]["scopeSpans"][0]["spans"]:
+            self.spans.append(span["name"])
+
+    def close(self) -> None:
+        pass
+
+
+def test_drop_spans_when_queue_is_full() -> None:
+    """Test spans are dropped instead of waiting when queue is full."""
+    exporter = BlockingExporter()
+    processor = BatchSpanProcessor(
+        exporter,  # type: ignore[arg-type]
+        batch_size=1,
+        queue_size=1,
+    )
+    processor.start()
+    processor.add(make_span("0" * 32, "0" * 16, None, "first", 0, 0))
+    # Wait until the thread is blocked exporting the first span
+    assert exporter.received.wait(timeout=10)
+    for name in ("second", "third", "fourth"):
+        processor.add(make_span("0" * 32, "0" * 16, None, name, 0, 0))
+    exporter.released.set()
+    with pytest.warns(UserWarning, match="Dropped 2 spans"):
+        processor.shutdown()
+    assert exporter.spans == ["first", "second"]
+
+
+def read_spans(requests: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return [
+        span
+        for request in requests
+        for resource in request["resourceSpans"]
+        for scope in resource["scopeSpans"]
+        for span in scope["spans"]
+    ]
+
+
+class TestOTLPTraces(CommonTestSetup):
+    def make_test_directory(self) -> Path:
+        self.make_testfile(
+            "test_other.py",
+            """
+            def test_other():
+                pass
+            """,
+        )
+        return self.make_testfile(
+            "test_basic.py",
+            """
+            import pytest
+
+            @pytest.fixture
+            def broken():
+                raise ValueError("BOOM")
+
+            def test_ok():
+                pass
+
+            def test_fail():
+                assert False
+
+            def test_error(broken):
+                pass
+            """,
+        ).parent
+
+    def test_span_tree(self):
+        """Test test cases are exported as a tree of spans to a local file."""
+        self.make_test_directory()
+        traces = self.tmp_path.joinpath("traces.jsonl")
+        result = self.test_dir.runpytest(
+            "--collect-log",
+            self.json_lines_file.as_posix(),
+            "--collect-otlp",
+            traces.as_posix(),
+            "--collect-timestamps",
+            "ns",
+        )
+        assert result.ret == 1
+        events = self.read_json_lines_file()
+        requests = [json.loads(line) for line in traces.read_text().splitlines()]
+        spans = read_spans(requests)
+        by_id = {span["spanId"]: span for span in spans}
+        [session] = [span for span in spans if "parentSpanId" not in span]
+        assert session["name"] == "pytest session"
+        assert session["traceId"] == uuid.UUID(events[0]["session_id"]).hex
+        assert session["status"] == {"code": 2}
+        assert {span["traceId"] for span in spans} == {session["traceId"]}
+
+        def children(span: dict[str, Any]) -> Iterator[dict[str, Any]]:
+            for child in spans:
+                if child.get("parentSpanId") == span["spanId"]:
+                    yield child
+
+        modules = {module["name"]: module for module in children(session)}
+        assert set(modules) == {"test_basic.py", "test_other.py"}
+        tests = {test["name"]: test for test in children(modules["test_basic.py"])}
+        assert set(tests) == {"test_ok", "test_fail", "test_error"}
+        assert "status" not in tests["test_ok"]
+        assert tests["test_fail"]["status"] == {"code": 2}
+        steps = {step["name"]: step for step in children(tests["test_fail"])}
+        assert set(steps) == {"setup", "call", "teardown"}
+        assert steps["call"]["status"]["code"] == 2
+        assert "assert False" in steps["call"]["status"]["message"]
+        assert [step["name"] for step in children(tests["test_error"])] == [
+            "setup",
+            "teardown",
+        ]
+        # Spans are nested within their parent span
+        for span in spans:
+            parent = by_id.get(span.get("parentSpanId", ""))
+            if parent is not None:
+                assert int(parent["startTimeUnixNano"]) <= int(
+                    span["startTimeUnixNano"]
+                )
+                assert int(span["endTimeUnixNano"]) <= int(parent["endTimeUnixNano"])
+        case_end = next(
+            event
+            for event in events
+            if event["event"] == "case_end" and event["node_id"].endswith("test_ok")
+        )
+        assert tests["test_ok"]["startTimeUnixNano"] == str(case_end["start_timestamp"])
+        assert tests["test_ok"]["endTimeUnixNano"] == str(case_end["stop_timestamp"])
+
+    def test_protobuf_over_http(self):
+        """Test spans are sent to an OTLP/HTTP endpoint encoded using protobuf."""
+        self.make_test_directory()
+        spy = Spy()
+        with EmbeddedTestServer(spy, path="/v1/traces", host="127.0.0.1", port=8000):
+            result = self.test_dir.runpytest(
+                "--collect-otlp",
+                "http://localhost:8000/v1/traces",
+                "--collect-otlp-protobuf",
+            )
+        assert result.ret == 1
+        request = spy.expect_request()
+        assert request.content_type() == "application/x-protobuf"
+        [resource_spans] = decode_message(request.data())[1]
+        [scope_spans] = decode_message(resource_spans)[2]
+        names = [
+            decode_message(span)[5][0].decode()
+            for span in decode_message(scope_spans)[2]
+        ]
+        # 4 tests with 3 steps except one, 2 modules and the session
+        assert len(names) == 4 + 11 + 2 + 1
+        assert names[-1] == "pytest session"
+
+    def test_protobuf_requires_http(self):
+        """Test protobuf encoding is rejected for local files."""
+        result = self.test_dir.runpytest(
+            "--collect-otlp",
+            self.tmp_path.joinpath("traces.jsonl").as_posix(),
+            "--collect-otlp-protobuf",
+        )
+        assert result.ret == pytest.ExitCode.USAGE_ERROR
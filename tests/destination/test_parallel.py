@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+
+import pytest
+
+from _testing.setup import CommonTestSetup
+from pytest_broadcaster import Destination, ThreadedDestination
+from pytest_broadcaster.models import test_case_end
+from pytest_broadcaster.models.outcome import Outcome
+
+if TYPE_CHECKING:
+    from pytest_broadcaster.models.session_event import SessionEvent
+    from pytest_broadcaster.models.session_result import SessionResult
+
+
+def make_case_end(node_id: str) -> test_case_end.TestCaseEnd:
+    return test_case_end.TestCaseEnd(
+        session_id="session",
+        node_id=node_id,
+        start_timestamp=0,
+        stop_timestamp=0,
+        total_duration=0,
+        outcome=Outcome.passed,
+    )
+
+
+class BlockingDestination(Destination):
+    """A destination waiting to be released before writing each event."""
+
+    def __init__(self) -> None:
+        self.received = threading.Event()
+        self.released = threading.Event()
+        self.events: list[str] = []
+
+    def write_event(self, event: SessionEvent) -> None:
+        self.received.set()
+        self.released.wait()
+        if event.node_id == "fail":  # type: ignore[union-attr]
+            msg = "BOOM"
+            raise RuntimeError(msg)
+        self.events.append(event.node_id)  # type: ignore[union-attr]
+
+    def write_result(self, result: SessionResult) -> None:
+        pass
+
+    def summary(self) -> str | None:
+        return None
+
+
+def test_drop_events_when_queue_is_full() -> None:
+    """Test events are dropped instead of waiting when queue is full."""
+    destination = BlockingDestination()
+    threaded = ThreadedDestination(destination, queue_size=1, drop=True)
+    threaded.open()
+    threaded.write_event(make_case_end("first"))
+    # Wait until the worker is blocked writing the first event
+    assert destination.received.wait(timeout=10)
+    for node_id in ("second", "third", "fourth"):
+        threaded.write_event(make_case_end(node_id))
+    destination.released.set()
+    threaded.close()
+    assert destination.events == ["first", "second"]
+    assert threaded.dropped_events == 2
+
+
+def test_failures_are_isolated() -> None:
+    """Test a failed write does not prevent next writes, and is reported on close."""
+    destination = BlockingDestination()
+    destination.released.set()
+    threaded = ThreadedDestination(destination)
+    threaded.open()
+    for node_id in ("first", "fail", "fail", "last"):
+        threaded.write_event(make_case_end(node_id))
+    with pytest.warns(UserWarning, match=r"Failed to write 2 events .*BOOM"):
+        threaded.close()
+    assert destination.events == ["first", "last"]
+
+
+class TestParallelDestinations(CommonTestSetup):
+    def test_parallel(self):
+        """Test each destination is written within its own thread, in order."""
+        self.make_testfile(
+            "test_basic.py",
+            """
+            def test_ok():
+                pass
+
+            def test_fail():
+                assert False
+            """,
+        )
+        self.test_dir.runpytest("--collect-log", self.json_lines_file.as_posix())
+        expected = self.read_json_lines_file()
+        self.json_lines_file.unlink()
+        self.test_dir.makeconftest("""
+        import threading
+
+        from pytest_broadcaster import JSONLinesFile
+
+        class ThreadRecorder(JSONLinesFile):
+            def write_event(self, event):
+                assert threading.current_thread().name == (
+                    "pytest-broadcaster-ThreadRecorder"
+                )
+                super().write_event(event)
+
+        def pytest_broadcaster_add_destination(add):
+            add(ThreadRecorder("events.jsonl"))
+        """)
+        result = self.test_dir.runpytest(
+            "--collect-log",
+            self.json_lines_file.as_posix(),
+            "--collect-report",
+            self.json_file.as_posix(),
+            "--collect-parallel",
+            "-W",
+            "error::UserWarning",
+        )
+        assert result.ret == 1
+        events = self.read_json_lines_file()
+        assert self.sanitize(events) == self.sanitize(expected)
+        recorded = self.test_dir.path.joinpath("events.jsonl").read_text().splitlines()
+        assert len(recorded) == len(events)
+        assert len(self.read_json_file()["test_reports"]) == 2
+
+    def test_invalid_queue_size(self):
+        """Test invalid queue sizes are rejected."""
+        result = self.test_dir.runpytest(
+            "--collect-log",
+            self.json_lines_file.as_posix(),
+            "--collect-parallel",
+            "--collect-parallel-queue",
+            "0",
+        )
+        assert result.ret == pytest.ExitCode.USAGE_ERROR
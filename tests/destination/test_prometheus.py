@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import urllib.request
+
+import pytest
+
+from _testing.setup import CommonTestSetup
+from pytest_broadcaster import JSONLinesFile, PrometheusMetrics, ThreadedDestination
+from pytest_broadcaster.models import test_case_call, test_case_end
+from pytest_broadcaster.models.outcome import Outcome
+
+
+def parse_metrics(text: str) -> dict[str, float]:
+    return {
+        name: float(value)
+        for line in text.splitlines()
+        if not line.startswith("#")
+        for name, value in [line.rsplit(" ", 1)]
+    }
+
+
+def test_serve_metrics() -> None:
+    """Test metrics are served over HTTP while the session is running."""
+    metrics = PrometheusMetrics(port=0)
+    metrics.open()
+    try:
+        metrics.write_event(
+            test_case_call.TestCaseCall(
+                session_id="session",
+                node_id="test_basic.py::test_ok",
+                start_timestamp=0,
+                stop_timestamp=0,
+                duration=0.2,
+                outcome=Outcome.passed,
+            )
+        )
+        metrics.write_event(
+            test_case_end.TestCaseEnd(
+                session_id="session",
+                node_id="test_basic.py::test_ok",
+                start_timestamp=0,
+                stop_timestamp=0,
+                total_duration=0.2,
+                outcome=Outcome.passed,
+            )
+        )
+        assert metrics.url
+        with urllib.request.urlopen(metrics.url) as response:  # noqa: S310
+            assert response.headers["Content-Type"].startswith("text/plain")
+            samples = parse_metrics(response.read().decode())
+    finally:
+        metrics.close()
+    assert samples['pytest_broadcaster_tests_total{outcome="passed"}'] == 1
+    assert samples['pytest_broadcaster_events_total{event="case_call"}'] == 1
+    step = 'pytest_broadcaster_step_duration_seconds_bucket{step="call",le="%s"}'
+    assert samples[step % "0.1"] == 0
+    assert samples[step % "0.25"] == 1
+    assert samples[step % "+Inf"] == 1
+    assert samples['pytest_broadcaster_step_duration_seconds_sum{step="call"}'] == 0.2
+
+
+def test_dropped_events() -> None:
+    """Test events dropped by watched destinations are reported."""
+    threaded = ThreadedDestination(JSONLinesFile("events.jsonl"), drop=True)
+    threaded.dropped_events = 3
+    metrics = PrometheusMetrics(textfile="metrics.prom")
+    metrics.watch_destinations([threaded, metrics])
+    samples = parse_metrics(metrics.render())
+    assert samples == {
+        "pytest_broadcaster_warnings_total": 0,
+        "pytest_broadcaster_errors_total": 0,
+        f'pytest_broadcaster_events_dropped_total{{destination="{threaded!r}"}}': 3,
+    }
+
+
+def test_port_or_textfile_required() -> None:
+    """Test metrics must be exposed somewhere."""
+    with pytest.raises(ValueError, match="Either a port or a textfile is required"):
+        PrometheusMetrics()
+
+
+class TestPrometheusMetrics(CommonTestSetup):
+    def test_textfile(self):
+        """Test metrics are written to a file once session is done."""
+        self.make_testfile(
+            "test_basic.py",
+            """
+            import warnings
+
+            import pytest
+
+            @pytest.mark.parametrize("value", range(3))
+            def test_ok(value):
+                pass
+
+            def test_fail():
+                assert False
+
+            def test_warn():
+                warnings.warn("HEY")
+            """,
+        )
+        textfile = self.tmp_path.joinpath("metrics.prom")
+        result = self.test_dir.runpytest(
+            "--collect-metrics-file",
+            textfile.as_posix(),
+            "--collect-log-events",
+            "session_start,session_end",
+        )
+        assert result.ret == 1
+        samples = parse_metrics(textfile.read_text())
+        assert samples['pytest_broadcaster_tests_total{outcome="passed"}'] == 4
+        assert samples['pytest_broadcaster_tests_total{outcome="failed"}'] == 1
+        assert samples["pytest_broadcaster_warnings_total"] == 1
+        assert samples["pytest_broadcaster_errors_total"] == 0
+        for step in ("setup", "call", "teardown"):
+            count = f'pytest_broadcaster_step_duration_seconds_count{{step="{step}"}}'
+            assert samples[count] == 5
+        assert not list(self.tmp_path.glob(".metrics.prom.*"))
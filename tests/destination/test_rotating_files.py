@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import gzip
+import json
+from typing import TYPE_CHECKING, Any, Callable
+
+import pytest
+
+from _testing.setup import CommonTestSetup
+from pytest_broadcaster import RotatingJSONLinesFile, get_codec
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "message"),
+    [
+        ({"max_bytes": 0}, "Maximum segment size must be positive"),
+        ({"max_events": -1}, "Maximum segment events must be positive"),
+        ({"compression": "lzma"}, "Unknown compression: lzma"),
+        ({"codec": get_codec("compact")}, "cannot be written using the compact"),
+        ({"codec": get_codec("dict-json")}, "cannot be written using the dict-json"),
+    ],
+)
+def test_invalid_rotation(kwargs: dict[str, Any], message: str) -> None:
+    """Test invalid rotation settings are rejected."""
+    with pytest.raises(ValueError, match=message):
+        RotatingJSONLinesFile("events.jsonl", **kwargs)
+
+
+class TestRotatingJSONLinesFile(CommonTestSetup):
+    def make_test_directory(self) -> Path:
+        return self.make_testfile(
+            "test_basic.py",
+            """
+            import pytest
+
+            @pytest.mark.parametrize("value", range(10))
+            def test_ok(value):
+                pass
+
+            def test_fail():
+                assert False
+            """,
+        ).parent
+
+    def read_manifest(self) -> dict[str, Any]:
+        return json.loads(self.tmp_path.joinpath("events.manifest.json").read_text())
+
+    def read_segments(
+        self, manifest: dict[str, Any], read: Callable[[Path], bytes]
+    ) -> list[list[dict[str, Any]]]:
+        return [
+            [
+                json.loads(line)
+                for line in read(self.tmp_path.joinpath(segment["path"])).splitlines()
+            ]
+            for segment in manifest["segments"]
+        ]
+
+    def run(self, *args: str) -> list[dict[str, Any]]:
+        """Run tests and return the events written without rotation."""
+        self.make_test_directory()
+        self.test_dir.runpytest("--collect-log", self.json_lines_file.as_posix())
+        expected = self.read_json_lines_file()
+        result = self.test_dir.runpytest(
+            "--collect-log", self.tmp_path.joinpath("events.jsonl").as_posix(), *args
+        )
+        assert result.ret == 1
+        return expected
+
+    def test_rotate_by_events(self):
+        """Test segments hold at most the given number of events."""
+        expected = self.run("--collect-log-rotate-events", "10")
+        manifest = self.read_manifest()
+        assert manifest["complete"] is True
+        assert manifest["compression"] is None
+        counts = [
+            min(10, len(expected) - start) for start in range(0, len(expected), 10)
+        ]
+        assert [segment["path"] for segment in manifest["segments"]] == [
+            f"events.{index:04d}.jsonl" for index in range(1, len(counts) + 1)
+        ]
+        assert [segment["events"] for segment in manifest["segments"]] == counts
+        segments = self.read_segments(manifest, lambda path: path.read_bytes())
+        assert [len(segment) for segment in segments] == counts
+        events = [event for segment in segments for event in segment]
+        assert self.sanitize(events) == self.sanitize(expected)
+
+    def test_rotate_by_size_with_gzip(self):
+        """Test compressed segments do not exceed the given size when decompressed."""
+        expected = self.run(
+            "--collect-log-rotate-bytes", "4096", "--collect-log-compress", "gzip"
+        )
+        manifest = self.read_manifest()
+        assert manifest["complete"] is True
+        assert manifest["compression"] == "gzip"
+        assert len(manifest["segments"]) > 1
+        for segment in manifest["segments"]:
+            assert segment["path"].endswith(".jsonl.gz")
+            data = gzip.decompress(self.tmp_path.joinpath(segment["path"]).read_bytes())
+            assert len(data) == segment["size"]
+            assert segment["size"] <= 4096 or segment["events"] == 1
+        segments = self.read_segments(
+            manifest, lambda path: gzip.decompress(path.read_bytes())
+        )
+        events = [event for segment in segments for event in segment]
+        assert self.sanitize(events) == self.sanitize(expected)
+
+    def test_zstd(self):
+        """Test segments compressed with zstd."""
+        zstandard = pytest.importorskip("zstandard")
+        expected = self.run("--collect-log-compress", "zstd")
+        manifest = self.read_manifest()
+        assert [segment["path"] for segment in manifest["segments"]] == [
+            "events.0001.jsonl.zst"
+        ]
+        segments = self.read_segments(
+            manifest,
+            lambda path: zstandard.ZstdDecompressor()
+            .stream_reader(path.read_bytes())
+            .read(),
+        )
+        assert self.sanitize(segments[0]) == self.sanitize(expected)
+
+    def test_invalid_option(self):
+        """Test invalid rotation options are rejected."""
+        self.make_test_directory()
+        result = self.test_dir.runpytest(
+            "--collect-log",
+            self.json_lines_file.as_posix(),
+            "--collect-log-rotate-events",
+            "0",
+        )
+        assert result.ret == pytest.ExitCode.USAGE_ERROR
+
+    def test_stateful_format(self):
+        """Test stateful formats are rejected, since segments must be decoded alone."""
+        self.make_test_directory()
+        result = self.test_dir.runpytest(
+            "--collect-log",
+            self.json_lines_file.as_posix(),
+            "--collect-log-format",
+            "compact",
+            "--collect-log-compress",
+            "gzip",
+        )
+        assert result.ret == pytest.ExitCode.USAGE_ERROR
+        result.stderr.fnmatch_lines(["*cannot be written using the compact format*"])
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+
+from _testing.setup import CommonTestSetup
+from pytest_broadcaster import SchemaChecker, SchemaValidator
+from pytest_broadcaster._internal._codecs import EncodedPayload
+from pytest_broadcaster.models import test_case_end
+from pytest_broadcaster.models.outcome import Outcome
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def make_case_end(**kwargs: object) -> dict[str, object]:
+    return {
+        "event": "case_end",
+        "session_id": "session",
+        "node_id": "test_basic.py::test_ok",
+        "start_timestamp": "2024-03-01T12:00:00.000001+00:00",
+        "stop_timestamp": 1709294400000001000,
+        "total_duration": 0.2,
+        "outcome": "passed",
+        **kwargs,
+    }
+
+
+@pytest.mark.parametrize(
+    ("changes", "error"),
+    [
+        ({"node_id": None}, r"\$\.node_id: expected string, got NoneType"),
+        ({"outcome": "broken"}, r"\$\.outcome: expected one of"),
+        ({"total_duration": True}, r"\$\.total_duration: expected number, got bool"),
+        ({"start_timestamp": "today"}, r"\$\.start_timestamp: expected date-time"),
+        ({"stop_timestamp": 1.5}, r"\$\.stop_timestamp: unexpected type float"),
+        ({"event": "case_done"}, r"\$: unexpected value of 'event': 'case_done'"),
+    ],
+)
+def test_reject_invalid_events(changes: dict[str, object], error: str) -> None:
+    """Test invalid events are rejected with the path of the invalid value."""
+    validator = SchemaValidator()
+    validator.validate_event(make_case_end())
+    with pytest.raises(ValueError, match=error):
+        validator.validate_event(make_case_end(**changes))
+
+
+def test_missing_property() -> None:
+    """Test events missing a required property are rejected."""
+    event = make_case_end()
+    del event["outcome"]
+    with pytest.raises(ValueError, match="missing required property 'outcome'"):
+        SchemaValidator().validate(event, "test_case_end.json")
+
+
+def test_unsupported_keyword(tmp_path: Path) -> None:
+    """Test schemas using unsupported keywords are rejected when compiled."""
+    tmp_path.joinpath("event.json").write_text(
+        json.dumps({"type": "string", "pattern": "^[a-z]+$"})
+    )
+    with pytest.raises(ValueError, match="Unsupported keyword: pattern"):
+        SchemaValidator(tmp_path)
+
+
+def test_check_models() -> None:
+    """Test events are checked as converted from models, before they are encoded."""
+    checker = SchemaChecker()
+    checker.write_encoded_event(
+        EncodedPayload(
+            test_case_end.TestCaseEnd(
+                session_id="session",
+                node_id="test_basic.py::test_ok",
+                start_timestamp=0,
+                stop_timestamp=0,
+                total_duration=0.2,
+                outcome=Outcome.passed,
+            )
+        )
+    )
+    assert (checker.checked, checker.invalid) == (1, 0)
+
+
+class TestSchemaChecker(CommonTestSetup):
+    def make_test_directory(self) -> None:
+        self.make_testfile(
+            "test_basic.py",
+            """
+            import warnings
+
+            import pytest
+
+            def test_ok():
+                pass
+
+            def test_fail():
+                assert False
+
+            @pytest.mark.xfail(reason="expected")
+            def test_xfail():
+                assert False
+
+            def test_warn():
+                warnings.warn("HEY")
+            """,
+        )
+
+    @pytest.mark.parametrize("fast", [False, True])
+    def test_valid_events(self, *, fast: bool) -> None:
+        """Test events written by both reporters match the schemas."""
+        self.make_test_directory()
+        result = self.test_dir.runpytest(
+            "--collect-log",
+            self.json_lines_file.as_posix(),
+            "--broadcaster-validate",
+            *(["--collect-log-fast"] if fast else []),
+        )
+        assert result.ret == 1
+        result.stdout.no_fnmatch_line("*Failed to write*")
+        result.stdout.no_fnmatch_line("*not matching the JSON schemas*")
+
+    def test_invalid_events(self):
+        """Test events not matching the schemas are reported."""
+        self.make_test_directory()
+        self.test_dir.makeconftest(
+            """
+            from pytest_broadcaster import DefaultReporter
+
+            class BrokenReporter(DefaultReporter):
+                def make_test_case_end(self, node_id):
+                    event = super().make_test_case_end(node_id)
+                    event.total_duration = str(event.total_duration)
+                    return event
+
+            def pytest_broadcaster_set_reporter(set):
+                set(BrokenReporter())
+            """
+        )
+        # The session result is written once the session is done
+        with pytest.warns(UserWarning, match="Failed to write result"):
+            result = self.test_dir.runpytest(
+                "--collect-log",
+                self.json_lines_file.as_posix(),
+                "--broadcaster-validate",
+            )
+        assert result.ret == 1
+        result.stdout.fnmatch_lines(
+            [
+                "*Failed to write event to destination*"
+                "$.total_duration: expected number, got str*",
+                "*found 4 events not matching the JSON schemas*",
+            ]
+        )
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import tempfile
+import warnings
+from pathlib import Path
+
+import pytest
+
+from _testing.setup import CommonTestSetup
+from _testing.unix_stream import EmbeddedUnixStreamReader
+from pytest_broadcaster import DefaultReporter, UnixStream
+
+
+class TestUnixStreamDestination(CommonTestSetup):
+    @pytest.fixture
+    def socket_path(self):
+        # Unix socket paths are limited to around 100 characters,
+        # so avoid using deeply nested pytest temporary directories.
+        with tempfile.TemporaryDirectory() as directory:
+            yield Path(directory).joinpath("events.sock")
+
+    def make_test_directory(self) -> Path:
+        return self.make_testfile(
+            "test_basic.py",
+            """
+            def test_ok():
+                pass
+            """,
+        ).parent
+
+    def expected_events(self) -> list[str]:
+        return [
+            "session_start",
+            "collect_report",
+            "collect_report",
+            "collect_report",
+            "case_setup",
+            "case_call",
+            "case_teardown",
+            "case_end",
+            "session_end",
+        ]
+
+    @pytest.mark.parametrize("fifo", [False, True], ids=["socket", "fifo"])
+    def test_unix_stream(self, socket_path: Path, fifo: bool) -> None:  # noqa: FBT001
+        """Test length-prefixed events are written to unix socket or named pipe."""
+        self.make_test_directory()
+        with EmbeddedUnixStreamReader(socket_path, fifo=fifo) as reader:
+            result = self.test_dir.runpytest(
+                "--collect-log-socket", socket_path.as_posix()
+            )
+        assert result.ret == 0
+        assert [msg["event"] for msg in reader.messages] == self.expected_events()
+
+    def test_unix_stream_invalid_path(self) -> None:
+        """Test a warning is emitted when path is not a socket nor a named pipe."""
+        self.make_test_directory()
+        path = self.tmp_path.joinpath("events.txt")
+        path.write_text("")
+        result = self.test_dir.runpytest_subprocess(
+            "--collect-log-socket", path.as_posix()
+        )
+        assert result.ret == 0
+        result.stderr.fnmatch_lines(["*Not a unix socket or a named pipe*"])
+
+
+def test_dropped_events_are_reported_once() -> None:
+    """Test events dropped when the buffer is full are reported by a single warning."""
+    reporter = DefaultReporter()
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory).joinpath("events.sock")
+        with EmbeddedUnixStreamReader(path) as reader:
+            destination = UnixStream(path.as_posix(), buffer_size=1)
+            with warnings.catch_warnings():
+                warnings.simplefilter("error")
+                for _ in range(3):
+                    destination.write_event(reporter.make_session_start())
+            assert destination.dropped_events == 3
+            with pytest.warns(UserWarning, match="3 events were dropped") as record:
+                destination.close()
+    assert len(record) == 1
+    assert reader.messages == []
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import socket
+from typing import TYPE_CHECKING
+
+import pytest
+
+from _testing.setup import CommonTestSetup
+from _testing.websocket_server import EmbeddedWebSocketServer, WebSocketSpy
+from pytest_broadcaster import DefaultReporter, WebSocketStream
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class TestWebSocketDestination(CommonTestSetup):
+    def make_test_directory(self) -> Path:
+        return self.make_testfile(
+            "test_basic.py",
+            """
+            '''This is a module docstring.'''
+
+            def test_ok():
+                '''This is a test docstring.'''
+                pass
+
+            def test_ok_again():
+                '''This is another test docstring.'''
+                pass
+            """,
+        ).parent
+
+    def expected_events(self) -> list[str]:
+        return [
+            "session_start",
+            "collect_report",
+            "collect_report",
+            "collect_report",
+            "case_setup",
+            "case_call",
+            "case_teardown",
+            "case_end",
+            "case_setup",
+            "case_call",
+            "case_teardown",
+            "case_end",
+            "session_end",
+        ]
+
+    def test_websocket(self):
+        """Test websocket destination streams all events in order."""
+        self.make_test_directory()
+        spy = WebSocketSpy()
+        with EmbeddedWebSocketServer(spy) as server:
+            result = self.test_dir.runpytest("--collect-ws-url", server.url)
+        assert result.ret == 0
+        assert spy.connections == 1
+        assert spy.compressed_frames == 0
+        assert [msg["event"] for msg in spy.messages()] == self.expected_events()
+
+    @pytest.mark.parametrize("server_deflate", [True, False])
+    def test_websocket_permessage_deflate(self, server_deflate: bool) -> None:  # noqa: FBT001
+        """Test websocket destination compresses frames when server accepts it."""
+        self.make_test_directory()
+        spy = WebSocketSpy()
+        with EmbeddedWebSocketServer(spy, permessage_deflate=server_deflate) as server:
+            result = self.test_dir.runpytest(
+                "--collect-ws-url", server.url, "--collect-ws-deflate"
+            )
+        assert result.ret == 0
+        assert [msg["event"] for msg in spy.messages()] == self.expected_events()
+        if server_deflate:
+            assert spy.compressed_frames == len(self.expected_events())
+        else:
+            assert spy.compressed_frames == 0
+
+    def test_websocket_resume(self):
+        """Test websocket destination resumes stream after connection is lost."""
+        self.make_test_directory()
+        spy = WebSocketSpy(drop_after=3)
+        with EmbeddedWebSocketServer(spy) as server:
+            result = self.test_dir.runpytest("--collect-ws-url", server.url)
+        assert result.ret == 0
+        assert spy.connections == 2
+        assert [msg["event"] for msg in spy.messages()] == self.expected_events()
+
+
+def test_websocket_disables_nagle() -> None:
+    """Test frames are sent without waiting for pending acknowledgements."""
+    spy = WebSocketSpy()
+    with EmbeddedWebSocketServer(spy) as server:
+        destination = WebSocketStream(server.url)
+        destination.write_event(DefaultReporter().make_session_start())
+        assert destination._socket
+        assert destination._socket.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+        destination.close()
+    assert [msg["event"] for msg in spy.messages()] == ["session_start"]
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from _testing.setup import CommonTestSetup
+
+
+class TestDisabledPlugin(CommonTestSetup):
+    def make_test_directory(self) -> None:
+        self.make_testfile(
+            "test_basic.py",
+            """
+            import sys
+
+            def test_modules(pytestconfig):
+                assert not any(
+                    type(plugin).__name__ == "PytestBroadcasterPlugin"
+                    for plugin in pytestconfig.pluginmanager.get_plugins()
+                )
+                for module in (
+                    "pytest_broadcaster._internal._codecs",
+                    "pytest_broadcaster._internal._reporter",
+                    "pytest_broadcaster._internal._json_files",
+                    "pytest_broadcaster._internal._webhook",
+                    "pytest_broadcaster.models.session_start",
+                    "http.client",
+                    "gzip",
+                    "queue",
+                ):
+                    assert module not in sys.modules, module
+            """,
+        )
+
+    def test_nothing_imported_when_unused(self):
+        """Test destinations are neither imported nor registered without options."""
+        self.make_test_directory()
+        result = self.test_dir.runpytest_subprocess()
+        assert result.ret == 0
+        result.stdout.no_fnmatch_line("*generated report*")
+
+    def test_enabled_by_option(self):
+        """Test the plugin is registered once a destination is requested."""
+        self.make_test_directory()
+        result = self.test_dir.runpytest_subprocess(
+            "--collect-log", self.json_lines_file.as_posix()
+        )
+        assert result.ret == 1
+        result.stdout.fnmatch_lines(["*generated report log file*"])
+        assert [event["event"] for event in self.read_json_lines_file()][-1] == (
+            "session_end"
+        )
+
+    def test_enabled_by_validation(self):
+        """Test the plugin is registered when only validation is requested."""
+        self.make_test_directory()
+        result = self.test_dir.runpytest_subprocess("--broadcaster-validate")
+        assert result.ret == 1
+        result.stdout.fnmatch_lines(["FAILED test_basic.py::test_modules*"])
+
+    def test_enabled_by_metrics_port_zero(self):
+        """Test the plugin is registered when metrics are served on a random port."""
+        self.make_test_directory()
+        result = self.test_dir.runpytest_subprocess("--collect-metrics-port", "0")
+        assert result.ret == 1
+        result.stdout.fnmatch_lines(["*served metrics on: http://127.0.0.1:*/metrics*"])
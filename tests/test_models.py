@@ -0,0 +1,56 @@
+import dataclasses
+import importlib
+import pkgutil
+
+import pytest
+
+from pytest_broadcaster import models
+from pytest_broadcaster._internal._slots import add_slots
+from pytest_broadcaster.models.location import Location
+
+
+def iter_model_classes() -> list[type]:
+    modules = [
+        importlib.import_module(f"{models.__name__}.{info.name}")
+        for info in pkgutil.iter_modules(models.__path__)
+    ]
+    return [
+        obj
+        for module in modules
+        for obj in vars(module).values()
+        if isinstance(obj, type)
+        and dataclasses.is_dataclass(obj)
+        and obj.__module__ == module.__name__
+    ]
+
+
+@pytest.mark.parametrize("model", iter_model_classes(), ids=lambda cls: cls.__name__)
+def test_models_are_slotted(model: type) -> None:
+    """Test generated models do not hold a __dict__."""
+    assert "__slots__" in vars(model)
+    assert "__dict__" not in vars(model)
+
+
+def test_add_slots_backport():
+    """Test slots backport used on python 3.9."""
+
+    @dataclasses.dataclass
+    class Point:
+        x: int
+        y: int = 0
+
+    slotted = add_slots(Point)
+    assert slotted.__slots__ == ("x", "y")  # type: ignore[attr-defined]
+    point = slotted(1)
+    assert not hasattr(point, "__dict__")
+    assert dataclasses.asdict(point) == {"x": 1, "y": 0}
+    assert dataclasses.replace(point, y=2) == slotted(1, 2)
+
+
+def test_models_support_assignment():
+    """Test slotted models can still be updated."""
+    location = Location(filename="test.py", lineno=1)
+    location.lineno = 2
+    assert location.lineno == 2
+    with pytest.raises(AttributeError):
+        location.unknown = 1  # type: ignore[attr-defined]
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from _testing.setup import CommonTestSetup
+from pytest_broadcaster.reader import LogReader, main
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class TestLogReader(CommonTestSetup):
+    def make_log(self, *args: str) -> Path:
+        self.make_testfile(
+            "test_reader.py",
+            """
+            import pytest
+
+            @pytest.mark.parametrize("value", ['quote"', "unicode-é", "slash\\\\"])
+            def test_param(value):
+                pass
+
+            def test_fail():
+                assert False
+            """,
+        )
+        self.test_dir.runpytest("--collect-log", self.json_lines_file.as_posix(), *args)
+        return self.json_lines_file
+
+    @pytest.mark.parametrize("coalesce", [False, True], ids=["steps", "coalesced"])
+    def test_index(self, coalesce: bool) -> None:  # noqa: FBT001
+        """Test index matches event types and node IDs of decoded events."""
+        path = self.make_log(*(["--collect-log-coalesce"] if coalesce else []))
+        expected = self.read_json_lines_file()
+        with LogReader(path) as reader:
+            assert list(reader.events()) == expected
+            assert reader.count() == len(expected)
+            for event_type, count in reader.event_types().items():
+                assert count == sum(event["event"] == event_type for event in expected)
+            assert reader.node_ids() == list(
+                dict.fromkeys(
+                    event["node_id"] for event in expected if "node_id" in event
+                )
+            )
+            assert 'test_reader.py::test_param[quote"]' in reader.node_ids()
+
+    def test_filters(self) -> None:
+        """Test events are filtered by type, node ID and predicate, in order."""
+        path = self.make_log()
+        expected = self.read_json_lines_file()
+        with LogReader(path) as reader:
+            assert list(reader.events(events=["case_call", "case_end"])) == [
+                event
+                for event in expected
+                if event["event"] in ("case_call", "case_end")
+            ]
+            assert list(
+                reader.events(events=["case_end"], node_ids=["*test_param*"])
+            ) == [
+                event
+                for event in expected
+                if event["event"] == "case_end" and "test_param" in event["node_id"]
+            ]
+            failed = list(
+                reader.events(
+                    node_ids=["*"], where=lambda e: e.get("outcome") == "failed"
+                )
+            )
+            assert [event["event"] for event in failed] == ["case_call", "case_end"]
+
+    def test_empty_log(self) -> None:
+        """Test empty logs can be read."""
+        self.json_lines_file.write_bytes(b"")
+        with LogReader(self.json_lines_file) as reader:
+            assert list(reader.events()) == []
+            assert reader.count() == 0
+
+    def test_summary(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test summary command prints outcomes and slowest tests."""
+        path = self.make_log()
+        capsys.readouterr()
+        assert main(["summary", path.as_posix(), "--slowest", "2"]) == 0
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[1:4] == [
+            "tests: 4",
+            "outcomes: failed=1 passed=3",
+            "slowest 2 tests:",
+        ]
+        assert len(lines) == 6
+
+    def test_query(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test query command prints matching events as JSON lines."""
+        path = self.make_log()
+        capsys.readouterr()
+        main(["query", path.as_posix(), "--event", "case_end", "--outcome", "failed"])
+        lines = capsys.readouterr().out.splitlines()
+        assert len(lines) == 1
+        assert '"node_id": "test_reader.py::test_fail"' in lines[0]
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import pytest
+from _pytest._code.code import _PLUGGY_DIR, _PYTEST_DIR
+
+from pytest_broadcaster._internal._utils import filter_traceback
+
+
+@pytest.mark.parametrize(
+    ("filename", "expected"),
+    [
+        ("/home/user/project/tests/test_basic.py", True),
+        ("tests/test_basic.py", True),
+        ("<string>", False),
+        ((_PYTEST_DIR / "runner.py").as_posix(), False),
+        ((_PLUGGY_DIR / "_callers.py").as_posix(), False),
+        (_PYTEST_DIR.as_posix() + "_extra/module.py", True),
+        (_PYTEST_DIR.as_posix() + "//./runner.py", False),
+        ((_PYTEST_DIR / "mark" / ".." / "runner.py").as_posix(), False),
+    ],
+)
+def test_filter_traceback(filename: str, expected: bool) -> None:  # noqa: FBT001
+    """Test pytest, pluggy and generated code entries are hidden."""
+    assert filter_traceback(filename) is expected